@@ -0,0 +1,79 @@
+"""
+Codec benchmark: the binary wire protocol against the former pickle encoding.
+
+Usage (from the repository root):
+
+    python3 benchmarks/codec_benchmark.py [--number 20000]
+
+For each typical message (a move from a client, a move broadcast, a game
+start, a waiting notice and a full board update) the report gives the
+encoded size and the encode / decode rates of pickle and of the protocol,
+with every control codec available here (msgpack only if installed).
+Sizes include the 4-byte frame header.
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from game_blokus.framing import HEADER
+from game_blokus.protocol import CODECS, decode_message, encode_message
+
+MESSAGES = {
+    'move (client)': {'type': 'move', 'piece_id': 18, 'x': 7, 'y': 12, 'rotation': 3, 'flip': True,
+                      'color': 2, 'player_id': '0d9c1a6e-5f7b-4c8e-9a3d-2b1f6e4c7a90'},
+    'move (broadcast)': {'type': 'move', 'piece_id': 18, 'x': 7, 'y': 12, 'rotation': 3, 'flip': True,
+                         'color': 2, 'current_player': 2},
+    'game_start': {'type': 'game_start', 'player_number': 1, 'current_player': 0, 'total_players': 4},
+    'waiting': {'type': 'waiting', 'message': 'Waiting for more players to join... (2/4)'},
+    'board_update': {'type': 'board_update', 'player_id': '0d9c1a6e-5f7b-4c8e-9a3d-2b1f6e4c7a90',
+                     'board': [[(x * 7 + y * 3) % 5 for y in range(20)] for x in range(20)]},
+}
+
+
+def rate(function, number):
+    """Calls per second of function, best of three runs of `number` calls."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return number / best
+
+
+def run(number):
+    """
+    Measure every codec on every message.
+
+    Returns:
+        list: (message, codec, size in bytes, encodes/s, decodes/s) rows.
+    """
+    rows = []
+    for name, message in MESSAGES.items():
+        data = pickle.dumps(message)
+        rows.append((name, 'pickle', HEADER.size + len(data),
+                     rate(lambda: pickle.dumps(message), number), rate(lambda: pickle.loads(data), number)))
+        for codec in CODECS:
+            data = encode_message(message, codec)
+            rows.append((name, f'protocol/{codec}', HEADER.size + len(data),
+                         rate(lambda: encode_message(message, codec), number),
+                         rate(lambda: decode_message(data), number)))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the wire protocol with pickle.")
+    parser.add_argument('--number', type=int, default=20000, help="calls per measurement")
+    args = parser.parse_args(argv)
+
+    print(f"{'message':<18}{'codec':<18}{'bytes':>7}{'encode/s':>12}{'decode/s':>12}")
+    for name, codec, size, encode_rate, decode_rate in run(args.number):
+        print(f"{name:<18}{codec:<18}{size:>7}{encode_rate:>12.0f}{decode_rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
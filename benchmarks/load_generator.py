@@ -0,0 +1,197 @@
+"""
+Load generator for the Blokus server: simulated clients playing real games.
+
+Usage (from the repository root):
+
+    python3 benchmarks/load_generator.py --clients 1000 --players 4 [--spawn] [--duration 10]
+
+Clients are grouped into games of --players each and connect through the
+regular `init` handshake. Each one mirrors its game on a local Board and,
+on its turn, plays a random legal move. The report gives the connections
+held (clients that received `waiting` or `game_start`), the time to connect
+them all and the moves per second acknowledged by the server. With --spawn
+the script starts its own server process; thousands of clients may need a
+higher open-file limit (ulimit -n).
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from game_blokus.board import Board
+from game_blokus.framing import FrameReader, encode_frame
+from game_blokus.piece import ORIENTATIONS, PIECE_DEFINITIONS
+from game_blokus.protocol import CODECS, PROTOCOL_VERSION, decode_message, encode_message
+
+
+class SimulatedClient:
+    """One connection: joins a game, mirrors its moves and plays when its turn comes."""
+
+    def __init__(self, host, port, game_id, num_players, stats, rng):
+        self.host = host
+        self.port = port
+        self.game_id = game_id
+        self.num_players = num_players
+        self.stats = stats
+        self.rng = rng
+        self.player_id = str(uuid.uuid4())
+        self.board = Board(backend="bitboard")
+        self.hands = {color: set(range(len(PIECE_DEFINITIONS))) for color in range(1, num_players + 1)}
+        self.player_number = None
+        self.writer = None
+        self.frames = FrameReader()
+        self.codec = 'json'
+
+    async def run(self, stop):
+        try:
+            reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        except OSError as e:
+            self.stats['failed'] += 1
+            self.stats['last_error'] = str(e)
+            return
+        self.send({'type': 'init', 'player_id': self.player_id, 'game_id': self.game_id,
+                   'num_players': self.num_players, 'protocol': PROTOCOL_VERSION, 'codecs': list(CODECS)})
+        held = False
+        try:
+            while not stop.is_set():
+                data = await reader.read(65536)
+                if not data:
+                    break
+                for message in self.decode(data):
+                    if not held and message.get('type') in ('waiting', 'game_start'):
+                        held = True
+                        self.stats['held'] += 1
+                    self.handle(message)
+        finally:
+            if held:
+                self.stats['held'] -= 1
+            self.writer.close()
+
+    def decode(self, data):
+        """Split the received bytes into messages, keeping an incomplete frame for later."""
+        return [decode_message(payload) for payload in self.frames.feed(data)]
+
+    def send(self, message):
+        self.writer.write(encode_frame(encode_message(message, self.codec)))
+
+    def handle(self, message):
+        kind = message.get('type')
+        if kind == 'welcome':
+            self.codec = message['codec']
+        elif kind == 'game_start':
+            self.player_number = message['player_number']
+            if message['current_player'] == self.player_number:
+                self.play()
+        elif kind == 'move':
+            color = message['color']
+            piece = ORIENTATIONS[message['piece_id']][message['orientation_id']]
+            self.board.place_piece(piece, message['x'], message['y'], color)
+            self.hands[color].discard(message['piece_id'])
+            if color == self.player_number + 1:
+                self.stats['moves'] += 1
+            if message.get('current_player') == self.player_number:
+                self.play()
+        elif kind == 'error':
+            self.stats['errors'] += 1
+
+    def play(self):
+        color = self.player_number + 1
+        moves = self.board.legal_moves(color, self.hands[color])
+        if not moves:
+            return
+        piece_id, orientation_id, x, y = self.rng.choice(moves)
+        self.send({'type': 'move', 'piece_id': piece_id, 'orientation_id': orientation_id,
+                   'x': x, 'y': y, 'color': color})
+
+
+async def run_load(host, port, clients, players, duration, seed=0, connect_rate=0):
+    """
+    Open the simulated clients, let them play for `duration` seconds and report.
+
+    Returns:
+        dict: Connections held, failures, connect time and moves per second.
+    """
+    stats = {'held': 0, 'failed': 0, 'moves': 0, 'errors': 0, 'last_error': None}
+    rng = random.Random(seed)
+    stop = asyncio.Event()
+    tasks = []
+    start = time.perf_counter()
+    game_id = None
+    for index in range(clients):
+        if index % players == 0:
+            game_id = str(uuid.uuid4())
+        client = SimulatedClient(host, port, game_id, players, stats, random.Random(rng.getrandbits(32)))
+        tasks.append(asyncio.ensure_future(client.run(stop)))
+        if connect_rate:
+            await asyncio.sleep(1.0 / connect_rate)
+        elif index % 100 == 99:
+            await asyncio.sleep(0)
+    while stats['held'] + stats['failed'] < clients and time.perf_counter() - start < duration:
+        await asyncio.sleep(0.05)
+    connected = time.perf_counter() - start
+    peak = stats['held']
+
+    moves_before, play_start = stats['moves'], time.perf_counter()
+    await asyncio.sleep(max(0.0, duration - connected))
+    elapsed = time.perf_counter() - play_start
+    moves = stats['moves'] - moves_before
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {
+        'clients': clients,
+        'held': peak,
+        'failed': stats['failed'],
+        'connect_seconds': connected,
+        'moves': moves,
+        'moves_per_second': moves / elapsed if elapsed > 0 else 0.0,
+        'errors': stats['errors'],
+        'last_error': stats['last_error'],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulated clients for the Blokus server.")
+    parser.add_argument('--host', default='127.0.0.1', help="server address")
+    parser.add_argument('--port', type=int, default=6000, help="server port")
+    parser.add_argument('--clients', type=int, default=100, help="number of simulated clients")
+    parser.add_argument('--players', type=int, default=4, choices=[2, 3, 4], help="players per game")
+    parser.add_argument('--duration', type=float, default=10.0, help="length of the run, in seconds")
+    parser.add_argument('--connect-rate', type=float, default=0, help="new connections per second (0: as fast as possible)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the simulated players")
+    parser.add_argument('--spawn', action='store_true', help="start a server process on --port for the run")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        env = dict(os.environ, PYTHONPATH=os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+        server = subprocess.Popen([sys.executable, '-m', 'game_blokus.server', '--host', args.host,
+                                   '--port', str(args.port)], env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        time.sleep(1.0)
+    try:
+        result = asyncio.run(run_load(args.host, args.port, args.clients, args.players,
+                                      args.duration, args.seed, args.connect_rate))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"connections held : {result['held']}/{result['clients']} ({result['failed']} failed)")
+    print(f"connect time     : {result['connect_seconds']:.2f}s")
+    print(f"moves/sec        : {result['moves_per_second']:.1f} ({result['moves']} moves)")
+    if result['errors']:
+        print(f"server errors    : {result['errors']}")
+    if result['last_error']:
+        print(f"last error       : {result['last_error']}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
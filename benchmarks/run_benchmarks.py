@@ -0,0 +1,256 @@
+"""
+Performance benchmarks for move generation, move evaluation and full bot games.
+
+Usage (from the repository root):
+
+    python3 benchmarks/run_benchmarks.py [--quick] [--backends python bitboard numpy] [--json out.json]
+
+Positions are built from fixed-seed bot games, so numbers are comparable
+between runs and releases. Each benchmark reports ops/sec and per-operation
+latency percentiles; --json writes the same data in a machine-readable form.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from game_blokus.board import BACKENDS, Board, np
+from game_blokus.bot_player import BotPlayer
+from game_blokus.game import BlokusGame
+from game_blokus.piece import ORIENTATIONS
+
+# Number of moves played from the empty board to reach each position
+PHASES = {'opening': 4, 'midgame': 24, 'endgame': 44}
+POSITION_SEED = 2024
+
+
+def record_moves(count, seed=POSITION_SEED):
+    """
+    Play a fixed-seed four-player easy-bot game and return its first moves.
+
+    Args:
+        count (int): The number of moves to record.
+        seed (int): The seed of the game.
+
+    Returns:
+        list: The moves as (color, piece_id, orientation_id, x, y).
+    """
+    board = Board(backend="bitboard")
+    rng = random.Random(seed)
+    hands = {color: set(range(21)) for color in range(1, 5)}
+    moves, passes, turn = [], 0, 0
+    while len(moves) < count and passes < 4:
+        color = turn % 4 + 1
+        legal = board.legal_moves(color, hands[color])
+        if legal:
+            piece_id, orientation_id, x, y = rng.choice(legal)
+            board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+            hands[color].remove(piece_id)
+            moves.append((color, piece_id, orientation_id, x, y))
+            passes = 0
+        else:
+            passes += 1
+        turn += 1
+    return moves
+
+
+def build_position(backend, moves):
+    """
+    Replay recorded moves on a fresh board of the given backend.
+
+    Returns:
+        Tuple[Board, Dict[int, set], int]: The board, each color's remaining pieces
+        and the color with the most legal moves, which the benchmarks play.
+    """
+    board = Board(backend=backend)
+    hands = {color: set(range(21)) for color in range(1, 5)}
+    for color, piece_id, orientation_id, x, y in moves:
+        board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+        hands[color].remove(piece_id)
+    color = max(range(1, 5), key=lambda color: len(board.find_all_moves(color, hands[color])))
+    return board, hands, color
+
+
+def measure(function, number, repeat):
+    """
+    Time a function: `repeat` samples of `number` calls each.
+
+    Returns:
+        dict: ops/sec and per-operation latency percentiles, in microseconds.
+    """
+    function()  # Warm up caches and lazy tables
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    samples.sort()
+
+    def percentile(fraction):
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1e6
+
+    return {
+        'ops_per_sec': 1.0 / samples[len(samples) // 2] if samples[len(samples) // 2] else float('inf'),
+        'p50_us': percentile(0.50),
+        'p90_us': percentile(0.90),
+        'p99_us': percentile(0.99),
+        'min_us': samples[0] * 1e6,
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def board_benchmarks(backend, phase, moves, scale):
+    """Benchmarks of one backend on one position."""
+    board, hands, color = build_position(backend, moves)
+    rng = random.Random(POSITION_SEED)
+    candidates = [(orientation, rng.randrange(-1, 20), rng.randrange(-1, 20))
+                  for orientation in (rng.choice(ORIENTATIONS[piece_id]) for piece_id in range(21))
+                  for _ in range(50)]
+    piece = ORIENTATIONS[max(hands[color])][0] if hands[color] else ORIENTATIONS[0][0]
+    legal = board.legal_moves(color, hands[color])
+    bot = BotPlayer("hard", color)
+
+    def is_valid_move():
+        for orientation, x, y in candidates:
+            board.is_valid_move(orientation, x, y, color)
+
+    def find_valid_moves():
+        board._move_cache.clear()
+        board.find_valid_moves(piece, color)
+
+    def find_all_moves():
+        board.find_all_moves(color, hands[color])
+
+    def legal_moves_incremental():
+        # Cached parent position, one placement, derived child entry, undo
+        if not legal:
+            return
+        piece_id, orientation_id, x, y = legal[0]
+        board.legal_moves(color, hands[color])
+        board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+        board.legal_moves(color % 4 + 1, hands[color % 4 + 1])
+        board.undo()
+
+    def evaluate_move():
+        for piece_id, orientation_id, x, y in legal:
+            bot._evaluate_move(board, ORIENTATIONS[piece_id][orientation_id], x, y, 10, 10)
+
+    def evaluate_moves():
+        bot._evaluate_moves(board, legal, 10, 10)
+
+    cases = [
+        ('is_valid_move', is_valid_move, len(candidates)),
+        ('find_valid_moves', find_valid_moves, 1),
+        ('find_all_moves', find_all_moves, 1),
+        ('legal_moves_incremental', legal_moves_incremental, 1),
+        ('evaluate_move', evaluate_move, max(1, len(legal))),
+        ('evaluate_moves_batched', evaluate_moves, max(1, len(legal))),
+    ]
+    results = []
+    for name, function, ops in cases:
+        stats = measure(function, number=1, repeat=max(3, scale))
+        # Report per single operation (one validity test, one evaluated move...)
+        for key in ('p50_us', 'p90_us', 'p99_us', 'min_us'):
+            stats[key] /= ops
+        stats['ops_per_sec'] *= ops
+        stats.update({'benchmark': name, 'backend': backend, 'phase': phase, 'ops_per_call': ops})
+        results.append(stats)
+    return results
+
+
+def game_benchmarks(levels, seeds):
+    """Time full four-player bot games, one sample per seed."""
+    samples = []
+    for seed in seeds:
+        game = BlokusGame(num_players=4, ai_levels=levels, seed=seed)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            passes = 0
+            while passes < 4:
+                bot = game.players[game.current_player]
+                if game.board.has_any_move(bot.color, bot.remaining_pieces):
+                    bot.play(game.board)
+                    passes = 0
+                else:
+                    passes += 1
+                game.current_player = (game.current_player + 1) % 4
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        'benchmark': 'full_game',
+        'backend': 'bitboard',
+        'phase': f"{levels[0]} x{len(levels)}" if len(set(levels)) == 1 else '/'.join(levels),
+        'ops_per_sec': 1.0 / samples[len(samples) // 2],
+        'p50_us': samples[len(samples) // 2] * 1e6,
+        'p90_us': samples[min(len(samples) - 1, int(0.9 * len(samples)))] * 1e6,
+        'p99_us': samples[-1] * 1e6,
+        'min_us': samples[0] * 1e6,
+        'number': 1,
+        'repeat': len(samples),
+        'ops_per_call': 1,
+    }
+
+
+def run(backends, quick=False):
+    """
+    Run every benchmark.
+
+    Args:
+        backends (List[str]): The board backends to compare.
+        quick (bool): Fewer repetitions, for a smoke run.
+
+    Returns:
+        list: One result dict per benchmark, backend and phase.
+    """
+    scale = 3 if quick else 20
+    results = []
+    for phase, count in PHASES.items():
+        moves = record_moves(count)
+        for backend in backends:
+            results.extend(board_benchmarks(backend, phase, moves, scale))
+    game_seeds = range(2 if quick else 10)
+    for levels in (["easy"] * 4, ["medium"] * 4, ["hard"] * 4):
+        results.append(game_benchmarks(levels, game_seeds))
+    return results
+
+
+def print_results(results):
+    """Print results as a table."""
+    print(f"{'benchmark':<25}{'backend':<10}{'phase':<20}{'ops/sec':>12}{'p50 us':>11}{'p90 us':>11}{'p99 us':>11}")
+    for result in results:
+        print(f"{result['benchmark']:<25}{result['backend']:<10}{result['phase']:<20}"
+              f"{result['ops_per_sec']:>12.1f}{result['p50_us']:>11.2f}{result['p90_us']:>11.2f}{result['p99_us']:>11.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Blokus performance benchmarks.")
+    default_backends = [backend for backend in BACKENDS if backend != "numpy" or np is not None]
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=default_backends,
+                        help="board backends to compare (numpy only if installed)")
+    parser.add_argument('--quick', action='store_true', help="fewer repetitions, for a smoke run")
+    parser.add_argument('--json', help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run(args.backends, quick=args.quick)
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,4 +1,4 @@
-from .board import Board
+from .board import Board, BitBoard, NumpyBoard
 from .piece import Piece
 from .player import Player
 from .state import GameState
@@ -0,0 +1,270 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .board import Board, PlacementRecord
+from .piece import ORIENTATIONS
+
+
+class _RegionState(NamedTuple):
+    """Masques d'une position : cases occupées, puis par couleur (dans l'ordre de colors)."""
+    occupied: int
+    own: Tuple[int, ...]
+    forbidden: Tuple[int, ...]
+    diagonal: Tuple[int, ...]
+    reach: Tuple[int, ...]
+
+
+class RegionAnalysis:
+    """
+    Territoire de chaque couleur : les cases vides qu'elle peut encore atteindre.
+
+    Une case est atteignable par une couleur si elle est reliée, par des cases vides
+    ne touchant cette couleur par aucun bord, à l'un de ses coins libres (aux coins
+    libres du plateau avant son premier coup). Les régions sont calculées par
+    remplissage sur des masques de bits, comme BitBoard : la case (x, y) est le bit
+    ``x * (size + 1) + y``, si bien qu'un remplissage avance sur tout le front à la fois.
+
+    L'analyse suit l'historique du plateau : après un placement, seules les couleurs
+    dont la région contenait une case recouverte sont recalculées, à l'intérieur de
+    leur ancienne région, et un placement annulé restaure simplement l'état précédent.
+    La grille n'est relue qu'à la création et quand elle est remplacée.
+
+    Attributs:
+        board (Board): Le plateau analysé, de n'importe quel moteur.
+        colors (Tuple[int, ...]): Les couleurs suivies.
+    """
+    def __init__(self, board: Board, colors: Iterable[int] = (1, 2, 3, 4)):
+        """
+        Initialise l'analyse d'un plateau.
+
+        Args:
+            board (Board): Le plateau à analyser.
+            colors (Iterable[int]): Les couleurs suivies. Par défaut, les quatre couleurs.
+        """
+        self.board = board
+        self.colors = tuple(colors)
+        self._index = {color: index for index, color in enumerate(self.colors)}
+        size = board.size
+        self._stride = size + 1
+        self._full = 0
+        for i in range(size):
+            self._full |= ((1 << size) - 1) << (i * self._stride)
+        self._board_corners = 0
+        for x, y in [(0, 0), (0, size - 1), (size - 1, 0), (size - 1, size - 1)]:
+            self._board_corners |= 1 << (x * self._stride + y)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """
+        Recalcule tous les masques à partir de la grille.
+
+        La base est la grille privée des cases de l'historique, dont les placements sont
+        ensuite appliqués un à un : une recherche qui annule puis rejoue des coups, même
+        au-dessous de la position de départ, retrouve toujours un préfixe commun et ne
+        repart jamais de la grille.
+        """
+        history = self.board.history
+        played = 0
+        base_zobrist = self.board.zobrist
+        for record in history:
+            for x, y in record.cells:
+                played |= 1 << (x * self._stride + y)
+            base_zobrist ^= self.board._cells_key(record.cells, record.color)
+        occupied = 0
+        own = [0] * len(self.colors)
+        for i, row in enumerate(self.board.grid):
+            for j, cell in enumerate(row):
+                bit = 1 << (i * self._stride + j)
+                if cell and not played & bit:
+                    occupied |= bit
+                    if cell in self._index:
+                        own[self._index[cell]] |= bit
+        forbidden = tuple(self._edge_neighbours(mask) for mask in own)
+        diagonal = tuple(self._diagonal_neighbours(mask) for mask in own)
+        state = _RegionState(occupied, tuple(own), forbidden, diagonal, ())
+        reach = tuple(self._flood(state, index) for index in range(len(self.colors)))
+        self._state = state._replace(reach=reach)
+        self._base_zobrist = base_zobrist
+        self._records: List[PlacementRecord] = []
+        self._states: List[_RegionState] = []
+        self._push(history)
+
+    def _push(self, records: Iterable[PlacementRecord]) -> None:
+        """Applique des placements en gardant chaque état précédent sur la pile."""
+        for record in records:
+            self._states.append(self._state)
+            self._records.append(record)
+            self._state = self._apply(self._state, record)
+
+    def sync(self) -> None:
+        """
+        Met l'analyse à jour avec l'historique du plateau : annule les placements
+        retirés depuis le dernier appel puis applique les nouveaux.
+        """
+        history = self.board.history
+        common = min(len(self._records), len(history))
+        while common and self._records[common - 1] is not history[common - 1]:
+            common -= 1
+        while len(self._records) > common:
+            self._records.pop()
+            self._state = self._states.pop()
+        if not common:
+            # Nothing in common: either a search below the base, or a replaced grid (loaded game...)
+            key = self.board.zobrist
+            for record in history:
+                key ^= self.board._cells_key(record.cells, record.color)
+            if key != self._base_zobrist:
+                self._rebuild()
+                return
+        self._push(history[common:])
+
+    def _apply(self, state: _RegionState, record: PlacementRecord) -> _RegionState:
+        """
+        Calcule l'état suivant un placement.
+
+        Args:
+            state (_RegionState): L'état avant le placement.
+            record (PlacementRecord): Le placement.
+
+        Returns:
+            _RegionState: L'état après le placement.
+        """
+        bits = 0
+        for x, y in record.cells:
+            bits |= 1 << (x * self._stride + y)
+        own, forbidden, diagonal = list(state.own), list(state.forbidden), list(state.diagonal)
+        mover = self._index.get(record.color)
+        if mover is not None:
+            own[mover] |= bits
+            forbidden[mover] |= self._edge_neighbours(bits)
+            diagonal[mover] |= self._diagonal_neighbours(bits)
+        new_state = _RegionState(state.occupied | bits, tuple(own), tuple(forbidden), tuple(diagonal), ())
+
+        reach = []
+        for index, region in enumerate(state.reach):
+            if index == mover:
+                # New corners may open cells beyond the old region
+                reach.append(self._flood(new_state, index))
+            elif region & bits:
+                # Everyone else only loses cells: refill inside the old region
+                reach.append(self._flood(new_state, index, region))
+            else:
+                reach.append(region)
+        return new_state._replace(reach=tuple(reach))
+
+    def _flood(self, state: _RegionState, index: int, within: Optional[int] = None) -> int:
+        """
+        Remplit la région atteignable d'une couleur à partir de ses coins libres.
+
+        Args:
+            state (_RegionState): Les masques de la position.
+            index (int): L'indice de la couleur dans colors.
+            within (int, optional): Un masque contenant forcément la région, pour la borner.
+
+        Returns:
+            int: Le masque des cases atteignables.
+        """
+        free = self._full & ~(state.occupied | state.forbidden[index])
+        if within is not None:
+            free &= within
+        if state.own[index]:
+            region = state.diagonal[index] & free
+        else:
+            region = self._board_corners & free
+        s = self._stride
+        while True:
+            grown = (region | (region << 1) | (region >> 1) | (region << s) | (region >> s)) & free
+            if grown == region:
+                return region
+            region = grown
+
+    def _edge_neighbours(self, mask: int) -> int:
+        """Cases partageant un bord avec celles du masque."""
+        s = self._stride
+        return ((mask << 1) | (mask >> 1) | (mask << s) | (mask >> s)) & self._full
+
+    def _diagonal_neighbours(self, mask: int) -> int:
+        """Cases partageant un coin avec celles du masque."""
+        s = self._stride
+        return ((mask << (s + 1)) | (mask << (s - 1)) | (mask >> (s - 1)) | (mask >> (s + 1))) & self._full
+
+    def reachable(self, color: int) -> int:
+        """
+        Retourne le masque des cases vides qu'une couleur peut encore atteindre.
+
+        Args:
+            color (int): La couleur.
+
+        Returns:
+            int: Le masque, bit ``x * (size + 1) + y`` pour la case (x, y).
+        """
+        self.sync()
+        return self._state.reach[self._index[color]]
+
+    def reachable_count(self, color: int) -> int:
+        """
+        Compte les cases vides qu'une couleur peut encore atteindre.
+
+        Args:
+            color (int): La couleur.
+
+        Returns:
+            int: Le nombre de cases atteignables.
+        """
+        return self.reachable(color).bit_count()
+
+    def exclusive_counts(self) -> Dict[int, int]:
+        """
+        Compte, pour chaque couleur suivie, les cases qu'elle est la seule à pouvoir atteindre.
+
+        Returns:
+            Dict[int, int]: Le nombre de cases du territoire propre de chaque couleur.
+        """
+        self.sync()
+        reach = self._state.reach
+        counts = {}
+        for index, color in enumerate(self.colors):
+            others = 0
+            for other, region in enumerate(reach):
+                if other != index:
+                    others |= region
+            counts[color] = (reach[index] & ~others).bit_count()
+        return counts
+
+    def denied_count(self, color: int, move: Tuple[int, int, int, int]) -> int:
+        """
+        Compte les cases d'un coup prises dans le territoire des autres couleurs,
+        sans recalculer les régions.
+
+        Args:
+            color (int): La couleur qui joue le coup.
+            move (Tuple[int, int, int, int]): Le coup (piece_id, orientation_id, x, y).
+
+        Returns:
+            int: Le nombre de cases de la pièce atteignables par au moins une autre couleur.
+        """
+        self.sync()
+        index = self._index.get(color)
+        others = 0
+        for other, region in enumerate(self._state.reach):
+            if other != index:
+                others |= region
+        piece_id, orientation_id, x, y = move
+        return sum(1 for i, j in ORIENTATIONS[piece_id][orientation_id].cells
+                   if others >> ((x + i) * self._stride + y + j) & 1)
+
+    def cells(self, mask: int) -> List[Tuple[int, int]]:
+        """
+        Convertit un masque de l'analyse en liste de cases.
+
+        Args:
+            mask (int): Le masque.
+
+        Returns:
+            List[Tuple[int, int]]: Les cases (x, y) du masque.
+        """
+        cells = []
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            cells.append(divmod(low.bit_length() - 1, self._stride))
+        return cells
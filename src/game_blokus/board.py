@@ -1,5 +1,12 @@
-from typing import List, Tuple
-from .piece import Piece
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from .piece import Piece, ORIENTATIONS, find_orientation
+
+try:
+    import numpy as np
+except ImportError:  # NumPy n'est requis que pour le backend "numpy"
+    np = None
 
 
 COLORS = {
@@ -10,6 +17,100 @@ COLORS = {
     4: "\033[93m"    # Yellow
 }
 
+# Clés de Zobrist, tirées d'un générateur à graine fixe pour rester stables d'une exécution à l'autre
+_ZOBRIST_RNG = random.Random(0xB10C)
+_ZOBRIST_CELLS = {}  # taille du plateau -> [x][y][couleur]
+ZOBRIST_PIECES = {color: [_ZOBRIST_RNG.getrandbits(64) for _ in range(21)] for color in range(1, 5)}
+ZOBRIST_TURN = [_ZOBRIST_RNG.getrandbits(64) for _ in range(4)]
+
+# Nombre maximal de positions gardées dans le cache des coups d'un plateau
+MOVE_CACHE_SIZE = 4096
+
+# Moteurs disponibles pour Board(backend=...)
+BACKENDS = ("python", "bitboard", "numpy")
+
+
+def _zobrist_cells(size: int) -> List[List[List[int]]]:
+    """
+    Retourne la table des clés de Zobrist case x couleur pour une taille de plateau.
+    
+    Args:
+        size (int): La taille du plateau.
+    
+    Returns:
+        List[List[List[int]]]: Les clés indexées par [x][y][couleur], la couleur 0 valant 0.
+    """
+    if size not in _ZOBRIST_CELLS:
+        rng = random.Random(size)
+        _ZOBRIST_CELLS[size] = [[[0] + [rng.getrandbits(64) for _ in range(4)]
+                                 for _ in range(size)] for _ in range(size)]
+    return _ZOBRIST_CELLS[size]
+
+
+def hand_key(color: int, piece_ids: Iterable[int]) -> int:
+    """
+    Calcule la clé de Zobrist de la main d'un joueur.
+    
+    Args:
+        color (int): La couleur du joueur.
+        piece_ids (Iterable[int]): Les identifiants des pièces restantes.
+    
+    Returns:
+        int: Le XOR des clés des pièces restantes.
+    """
+    key = 0
+    keys = ZOBRIST_PIECES[color]
+    for piece_id in piece_ids:
+        key ^= keys[piece_id]
+    return key
+
+@dataclass
+class PlacementRecord:
+    """
+    Trace d'un placement, suffisante pour l'annuler en temps proportionnel à la pièce.
+    
+    Attributs:
+        piece (Piece): La pièce placée.
+        x (int): La coordonnée x de la position de placement.
+        y (int): La coordonnée y de la position de placement.
+        color (int): La couleur du joueur.
+        cells (List[Tuple[int, int]]): Les cases recouvertes.
+        corners_added (Set[Tuple[int, int]]): Les coins gagnés par le joueur.
+        corners_removed (Dict[int, Set[Tuple[int, int]]]): Les coins perdus, par couleur.
+        board_corners_used (Set[Tuple[int, int]]): Les coins du plateau consommés.
+        engine_state (Any): L'état propre au moteur avant le placement.
+    """
+    piece: Piece
+    x: int
+    y: int
+    color: int
+    cells: List[Tuple[int, int]]
+    corners_added: Set[Tuple[int, int]]
+    corners_removed: Dict[int, Set[Tuple[int, int]]]
+    board_corners_used: Set[Tuple[int, int]]
+    engine_state: Any = None
+
+
+class _GridRow(list):
+    """
+    Ligne de la grille qui signale toute écriture externe au plateau.
+    
+    Les lectures restent celles d'une liste classique ; une écriture directe
+    (``board.grid[x][y] = c``) invalide l'état dérivé du plateau (coins, masques,
+    clé de Zobrist, historique), recalculé une seule fois à sa prochaine lecture :
+    remplir une grille case par case ne coûte donc qu'une resynchronisation.
+    """
+    __slots__ = ('_board',)
+
+    def __init__(self, values, board: 'Board'):
+        super().__init__(values)
+        self._board = board
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._board._invalidate()
+
+
 class Board:
     """
     Représente le plateau de jeu de Blokus.
@@ -17,60 +118,227 @@ class Board:
     Attributs:
         size (int): La taille du plateau de jeu.
         grid (List[List[int]]): La grille représentant l'état actuel du plateau.
-        corners (dict): Les coins disponibles pour chaque joueur.
-        board_corners (set): Les coins initiaux du plateau.
+        corners (dict): Les coins libres de chaque joueur : cases vides touchant sa
+            couleur par un coin mais par aucun bord.
+        board_corners (set): Les coins du plateau encore libres.
+        squares_placed (dict): Le nombre de cases posées par chaque joueur.
+        history (List[PlacementRecord]): La pile des placements, pour les annuler.
+        zobrist (int): La clé de Zobrist de la grille, tenue à jour à chaque placement.
         _adjacent_cache (dict): Cache pour les positions adjacentes valides.
+        _move_cache (dict): Coups valides par (zobrist, couleur), rangés par pièce.
+        _blocked (dict): Pour chaque couleur bloquée, la profondeur d'historique
+            où le blocage a été prouvé et les pièces concernées.
+
+    Modifier la grille de l'extérieur (affectation de ``grid`` ou d'une case)
+    vide l'historique : les placements antérieurs ne peuvent plus être annulés.
     """
+    # State recomputed from the grid by _sync_from_grid, dropped by a cell write
+    _DERIVED = ('history', '_blocked', 'squares_placed', 'corners', 'board_corners', 'zobrist')
 
-    def __init__(self, size: int = 20):
+    def __new__(cls, size: int = 20, backend: str = "python"):
+        """
+        Choisit la classe du plateau selon le moteur demandé.
+        
+        Args:
+            size (int): La taille du plateau de jeu. Par défaut, 20.
+            backend (str): "python", "bitboard" ou "numpy". Par défaut, "python".
+        
+        Raises:
+            ValueError: Si le moteur est inconnu.
+            ImportError: Si le moteur "numpy" est demandé sans NumPy installé.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown board backend: {backend}")
+        if backend == "numpy" and np is None:
+            raise ImportError("The numpy board backend requires NumPy")
+        if cls is Board:
+            cls = {"python": Board, "bitboard": BitBoard, "numpy": NumpyBoard}[backend]
+        return super().__new__(cls)
+
+    def __init__(self, size: int = 20, backend: str = "python"):
         """
         Initialise un nouveau plateau de jeu.
         
         Args:
             size (int): La taille du plateau de jeu. Par défaut, 20.
+            backend (str): Le moteur choisi, voir __new__. Par défaut, "python".
         """
         self.size = size
-        self.grid = [[0 for _ in range(size)] for _ in range(size)]
         # Initialize available corners for each player
         self.corners = {1: set(), 2: set(), 3: set(), 4: set()}
         # Initialize board corners as starting points
         self.board_corners = {(0, 0), (0, size-1), (size-1, 0), (size-1, size-1)}
+        self.squares_placed = {1: 0, 2: 0, 3: 0, 4: 0}
+        self.history = []
+        self.zobrist = 0
+        self._zobrist_keys = _zobrist_cells(size)
         # Cache for valid adjacent positions
         self._adjacent_cache = {}
+        self._move_cache = {}
+        self.grid = [[0 for _ in range(size)] for _ in range(size)]
+
+    @property
+    def grid(self) -> List[List[int]]:
+        """Vue de la grille, une liste de lignes de couleurs."""
+        return self._grid
+
+    @grid.setter
+    def grid(self, rows: List[List[int]]) -> None:
+        """Remplace toute la grille en une seule resynchronisation ; l'historique est vidé."""
+        self._grid = [_GridRow(row, self) for row in rows]
+        self._sync_from_grid()
+
+    def _invalidate(self) -> None:
+        """
+        Oublie l'état dérivé de la grille après l'écriture d'une case ; il sera
+        recalculé par __getattr__ à la première lecture de l'un de ses attributs.
+        """
+        if not self.__dict__.get('_stale'):
+            for name in self._DERIVED:
+                self.__dict__.pop(name, None)
+            self._stale = True
+
+    def __getattr__(self, name: str):
+        # Only reached for a missing attribute: derived state dropped by _invalidate
+        if self.__dict__.get('_stale'):
+            self._sync_from_grid()
+            return getattr(self, name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _sync_from_grid(self) -> None:
+        """
+        Recalcule les coins et les compteurs à partir de la grille.
+        
+        Les placements antérieurs ne pouvant plus être annulés, l'historique est vidé.
+        """
+        self._stale = False
+        size = self.size
+        self.history = []
+        self._blocked = {}
+        self.squares_placed = {1: 0, 2: 0, 3: 0, 4: 0}
+        self.corners = {1: set(), 2: set(), 3: set(), 4: set()}
+        self.board_corners = {
+            corner for corner in [(0, 0), (0, size-1), (size-1, 0), (size-1, size-1)]
+            if self._grid[corner[0]][corner[1]] == 0
+        }
+        self.zobrist = 0
+        for i, row in enumerate(self._grid):
+            for j, cell in enumerate(row):
+                if cell:
+                    self.squares_placed[cell] = self.squares_placed.get(cell, 0) + 1
+                    self.zobrist ^= self._zobrist_keys[i][j][cell]
+                    self._add_corners_around(i, j, cell)
 
-    def _update_corners_after_move(self, piece: Piece, x: int, y: int, color: int) -> None:
+    def _cells_key(self, cells: List[Tuple[int, int]], color: int) -> int:
+        """
+        Calcule la clé de Zobrist d'un ensemble de cases d'une couleur.
+        
+        Args:
+            cells (List[Tuple[int, int]]): Les cases.
+            color (int): La couleur du joueur.
+        
+        Returns:
+            int: Le XOR des clés des cases.
+        """
+        keys = self._zobrist_keys
+        key = 0
+        for cell_x, cell_y in cells:
+            key ^= keys[cell_x][cell_y][color]
+        return key
+
+    def _is_live_corner(self, x: int, y: int, color: int) -> bool:
+        """
+        Vérifie qu'une case vide ne touche la couleur par aucun bord.
+        
+        Args:
+            x (int): La coordonnée x de la case.
+            y (int): La coordonnée y de la case.
+            color (int): La couleur du joueur.
+        
+        Returns:
+            bool: True si la case peut servir de coin au joueur.
+        """
+        if self._grid[x][y] != 0:
+            return False
+        for adj_x, adj_y in self._get_valid_adjacent(x, y):
+            if self._grid[adj_x][adj_y] == color:
+                return False
+        return True
+
+    def _add_corners_around(self, x: int, y: int, color: int) -> Set[Tuple[int, int]]:
+        """
+        Ajoute aux coins du joueur les diagonales libres d'une case de sa couleur.
+        
+        Args:
+            x (int): La coordonnée x de la case.
+            y (int): La coordonnée y de la case.
+            color (int): La couleur du joueur.
+        
+        Returns:
+            Set[Tuple[int, int]]: Les coins qui n'étaient pas encore connus.
+        """
+        corners = self.corners.setdefault(color, set())
+        added = set()
+        for dx, dy in [(1, 1), (1, -1), (-1, 1), (-1, -1)]:
+            new_x, new_y = x + dx, y + dy
+            if (0 <= new_x < self.size and
+                0 <= new_y < self.size and
+                (new_x, new_y) not in corners and
+                self._is_live_corner(new_x, new_y, color)):
+                corners.add((new_x, new_y))
+                added.add((new_x, new_y))
+        return added
+
+    def _update_corners_after_move(self, cells: List[Tuple[int, int]], color: int
+                                   ) -> Tuple[Dict[int, Set[Tuple[int, int]]], Set[Tuple[int, int]], Set[Tuple[int, int]]]:
         """
         Met à jour les coins disponibles après le placement d'une pièce.
         
+        Les cases recouvertes sont retirées des coins de tous les joueurs, les
+        cases désormais adjacentes à la pièce sont retirées des coins du joueur,
+        et les diagonales libres de la pièce y sont ajoutées.
+        
         Args:
-            piece (Piece): La pièce placée.
-            x (int): La coordonnée x de la position de placement.
-            y (int): La coordonnée y de la position de placement.
+            cells (List[Tuple[int, int]]): Les cases recouvertes par la pièce.
             color (int): La couleur du joueur.
+        
+        Returns:
+            Tuple: Les coins retirés par couleur, les coins ajoutés au joueur et
+            les coins du plateau consommés.
         """
         # Remove used board corners
-        for i in range(piece.height):
-            for j in range(piece.width):
-                if piece.shape[i][j] == 1:
-                    pos = (x + i, y + j)
-                    if pos in self.board_corners:
-                        self.board_corners.remove(pos)
-        
+        used = self.board_corners.intersection(cells)
+        self.board_corners.difference_update(used)
+
+        # Covered cells are dead corners for every player, cells sharing
+        # an edge with the piece are dead corners for its color
+        removed = {}
+        for corner_color, corners in self.corners.items():
+            gone = corners.intersection(cells)
+            if corner_color == color:
+                for cell_x, cell_y in cells:
+                    gone.update(corners.intersection(self._get_valid_adjacent(cell_x, cell_y)))
+            if gone:
+                corners.difference_update(gone)
+                removed[corner_color] = gone
+
         # Add new corners
-        new_corners = set()
-        for i in range(piece.height):
-            for j in range(piece.width):
-                if piece.shape[i][j] == 1:
-                    # Check diagonal positions
-                    for dx, dy in [(1, 1), (1, -1), (-1, 1), (-1, -1)]:
-                        new_x, new_y = x + i + dx, y + j + dy
-                        if (0 <= new_x < self.size and 
-                            0 <= new_y < self.size and 
-                            self.grid[new_x][new_y] == 0):
-                            new_corners.add((new_x, new_y))
+        added = set()
+        for cell_x, cell_y in cells:
+            added |= self._add_corners_around(cell_x, cell_y, color)
+        return removed, added, used
+
+    def corner_count(self, color: int) -> int:
+        """
+        Retourne le nombre de coins libres d'un joueur, indicateur de sa mobilité.
+        
+        Args:
+            color (int): La couleur du joueur.
         
-        # Update corners for the current player
-        self.corners[color].update(new_corners)
+        Returns:
+            int: Le nombre de coins libres.
+        """
+        return len(self.corners[color])
 
     def _get_valid_adjacent(self, x: int, y: int) -> list:
         """
@@ -164,7 +432,7 @@ class Board:
                             has_valid_corner = True
         
         # Pour le premier coup, vérifier si on touche un coin du plateau
-        if not self.corners[color]:
+        if not self.squares_placed[color]:
             for i in range(piece.height):
                 for j in range(piece.width):
                     if piece.shape[i][j] == 1:
@@ -175,7 +443,7 @@ class Board:
     
     
 
-    def place_piece(self, piece: Piece, x: int, y: int, color: int) -> None:
+    def place_piece(self, piece: Piece, x: int, y: int, color: int) -> PlacementRecord:
         """
         Place une pièce et met à jour les coins disponibles.
         
@@ -184,20 +452,82 @@ class Board:
             x (int): La coordonnée x de la position de placement.
             y (int): La coordonnée y de la position de placement.
             color (int): La couleur du joueur.
+        
+        Returns:
+            PlacementRecord: La trace du placement, à passer à undo().
         """
         # Place the piece
+        cells = []
         for i in range(piece.height):
+            row = self._grid[x + i]
             for j in range(piece.width):
                 if piece.shape[i][j] == 1:
-                    self.grid[x + i][y + j] = color
+                    list.__setitem__(row, y + j, color)
+                    cells.append((x + i, y + j))
+        self.squares_placed[color] += len(cells)
+        self.zobrist ^= self._cells_key(cells, color)
         
         # Update corners
-        self._update_corners_after_move(piece, x, y, color)
+        removed, added, used = self._update_corners_after_move(cells, color)
+        record = PlacementRecord(piece, x, y, color, cells, added, removed, used)
+        self.history.append(record)
+        return record
+
+    def undo(self, record: Optional[PlacementRecord] = None) -> PlacementRecord:
+        """
+        Annule le dernier placement en temps proportionnel à la taille de la pièce.
+        
+        Args:
+            record (PlacementRecord, optional): La trace renvoyée par place_piece.
+                Par défaut, le dernier placement.
+        
+        Returns:
+            PlacementRecord: La trace du placement annulé.
+        
+        Raises:
+            ValueError: Si la trace n'est pas celle du dernier placement.
+        """
+        if not self.history or (record is not None and self.history[-1] is not record):
+            raise ValueError("Only the last placement can be undone")
+        record = self.history.pop()
+        depth = len(self.history)
+        self._blocked = {color: proof for color, proof in self._blocked.items() if proof[0] <= depth}
+
+        for cell_x, cell_y in record.cells:
+            list.__setitem__(self._grid[cell_x], cell_y, 0)
+        self.squares_placed[record.color] -= len(record.cells)
+        self.zobrist ^= self._cells_key(record.cells, record.color)
+
+        self.corners[record.color].difference_update(record.corners_added)
+        for color, corners in record.corners_removed.items():
+            self.corners[color].update(corners)
+        self.board_corners.update(record.board_corners_used)
+        return record
 
     def find_valid_moves(self, piece: Piece, color: int) -> List[Tuple[int, int]]:
         """
         Trouve les positions valides pour placer une pièce.
         
+        Les pièces standard sont lues dans le cache des coups ; les autres
+        formes sont recherchées autour des coins du joueur.
+        
+        Args:
+            piece (Piece): La pièce à placer.
+            color (int): La couleur du joueur.
+        
+        Returns:
+            List[Tuple[int, int]]: Liste des positions valides.
+        """
+        orientation = find_orientation(piece)
+        if orientation is None:
+            return self._scan_valid_moves(piece, color)
+        return [(x, y) for _, orientation_id, x, y in self._moves_by_piece(color)[orientation.piece_id]
+                if orientation_id == orientation.orientation_id]
+
+    def _scan_valid_moves(self, piece: Piece, color: int) -> List[Tuple[int, int]]:
+        """
+        Cherche les positions valides d'une pièce autour des coins du joueur.
+        
         Args:
             piece (Piece): La pièce à placer.
             color (int): La couleur du joueur.
@@ -208,7 +538,7 @@ class Board:
         valid_positions = []
         
         # If first move, only check board corners
-        if not self.corners[color]:
+        if not self.squares_placed[color]:
             for corner_x, corner_y in self.board_corners:
                 for dx in range(-piece.height + 1, 1):
                     for dy in range(-piece.width + 1, 1):
@@ -229,6 +559,283 @@ class Board:
         
         return valid_positions
     
+    def find_all_moves(self, color: int, piece_ids: Iterable[int]) -> List[Tuple[int, int, int, int]]:
+        """
+        Trouve tous les coups valides d'un joueur pour ses pièces restantes.
+        
+        Chaque case « d'ancrage » de chaque orientation distincte est posée sur
+        chaque coin libre du joueur ; seules ces positions sont testées.
+        
+        Args:
+            color (int): La couleur du joueur.
+            piece_ids (Iterable[int]): Les identifiants des pièces restantes.
+        
+        Returns:
+            List[Tuple[int, int, int, int]]: Liste des coups (piece_id, orientation_id, x, y).
+        """
+        corners = self.corners[color] if self.squares_placed[color] else self.board_corners
+        return self._anchored_moves(color, piece_ids, corners)
+
+    def _anchored_moves(self, color: int, piece_ids: Iterable[int],
+                        corners: Iterable[Tuple[int, int]], first: bool = False) -> List[Tuple[int, int, int, int]]:
+        """
+        Teste les placements qui posent une case d'ancrage sur l'un des coins donnés.
+        
+        Args:
+            color (int): La couleur du joueur.
+            piece_ids (Iterable[int]): Les identifiants des pièces à essayer.
+            corners (Iterable[Tuple[int, int]]): Les coins sur lesquels ancrer les pièces.
+            first (bool): Si True, s'arrête au premier coup valide trouvé.
+        
+        Returns:
+            List[Tuple[int, int, int, int]]: Liste des coups valides, sans doublons.
+        """
+        moves = []
+        checked_moves = set()
+        for piece_id in piece_ids:
+            for orientation in ORIENTATIONS[piece_id]:
+                for corner_x, corner_y in corners:
+                    for i, j in orientation.anchor_cells:
+                        move = (piece_id, orientation.orientation_id, corner_x - i, corner_y - j)
+                        if move in checked_moves:
+                            continue
+                        checked_moves.add(move)
+                        if self.is_valid_move(orientation, move[2], move[3], color):
+                            moves.append(move)
+                            if first:
+                                return moves
+        return moves
+
+    def legal_moves(self, color: int, piece_ids: Iterable[int]) -> List[Tuple[int, int, int, int]]:
+        """
+        Retourne les coups valides d'un joueur pour ses pièces restantes, via le cache.
+        
+        Args:
+            color (int): La couleur du joueur.
+            piece_ids (Iterable[int]): Les identifiants des pièces restantes.
+        
+        Returns:
+            List[Tuple[int, int, int, int]]: Liste des coups (piece_id, orientation_id, x, y).
+        """
+        moves_by_piece = self._moves_by_piece(color)
+        return [move for piece_id in piece_ids for move in moves_by_piece[piece_id]]
+
+    def _moves_by_piece(self, color: int) -> Dict[int, List[Tuple[int, int, int, int]]]:
+        """
+        Retourne les coups valides de toutes les pièces d'un joueur dans la position courante.
+        
+        L'entrée est dérivée de celle de la position précédente lorsqu'elle est en
+        cache, sinon elle est générée entièrement.
+        
+        Args:
+            color (int): La couleur du joueur.
+        
+        Returns:
+            Dict[int, List[Tuple[int, int, int, int]]]: Les coups rangés par pièce.
+        """
+        key = (self.zobrist, color)
+        moves_by_piece = self._move_cache.get(key)
+        if moves_by_piece is None:
+            moves_by_piece = self._derive_moves(color)
+            if moves_by_piece is None:
+                moves_by_piece = {piece_id: [] for piece_id in ORIENTATIONS}
+                for move in self.find_all_moves(color, ORIENTATIONS):
+                    moves_by_piece[move[0]].append(move)
+            if len(self._move_cache) >= MOVE_CACHE_SIZE:
+                self._move_cache.clear()
+            self._move_cache[key] = moves_by_piece
+        return moves_by_piece
+
+    def _derive_moves(self, color: int) -> Optional[Dict[int, List[Tuple[int, int, int, int]]]]:
+        """
+        Met à jour les coups en cache de la position précédant le dernier placement.
+        
+        Seuls les coups dont la boîte englobante touche les cases recouvertes (et,
+        pour le joueur qui a posé, leurs voisines) sont revérifiés ; les coups
+        nouveaux sont cherchés autour des coins qui viennent d'apparaître.
+        
+        Args:
+            color (int): La couleur du joueur.
+        
+        Returns:
+            Optional[Dict[int, List[Tuple[int, int, int, int]]]]: Les coups rangés par pièce,
+            ou None si la position précédente n'est pas en cache.
+        """
+        if not self.history:
+            return None
+        record = self.history[-1]
+        # A first move turns the board corners into ordinary corners: start afresh
+        if record.color == color and self.squares_placed[color] == len(record.cells):
+            return None
+        parent = self._move_cache.get((self.zobrist ^ self._cells_key(record.cells, record.color), color))
+        if parent is None:
+            return None
+
+        touched = list(record.cells)
+        if record.color == color:
+            for cell_x, cell_y in record.cells:
+                touched.extend(self._get_valid_adjacent(cell_x, cell_y))
+        min_x = min(cell_x for cell_x, _ in touched)
+        max_x = max(cell_x for cell_x, _ in touched)
+        min_y = min(cell_y for _, cell_y in touched)
+        max_y = max(cell_y for _, cell_y in touched)
+
+        moves_by_piece = {}
+        for piece_id, moves in parent.items():
+            orientations = ORIENTATIONS[piece_id]
+            kept = []
+            for move in moves:
+                orientation = orientations[move[1]]
+                x, y = move[2], move[3]
+                if (x > max_x or y > max_y or
+                    x + orientation.height <= min_x or y + orientation.width <= min_y or
+                    self.is_valid_move(orientation, x, y, color)):
+                    kept.append(move)
+            moves_by_piece[piece_id] = kept
+
+        if record.color == color and record.corners_added:
+            new_moves = self._anchored_moves(color, ORIENTATIONS, record.corners_added)
+            known = {move for moves in moves_by_piece.values() for move in moves}
+            for move in new_moves:
+                if move not in known:
+                    moves_by_piece[move[0]].append(move)
+        return moves_by_piece
+
+    def update_moves(self, moves: List[Tuple[int, int, int, int]], color: int, piece_ids: Set[int],
+                     record: Optional[PlacementRecord] = None) -> List[Tuple[int, int, int, int]]:
+        """
+        Met à jour les coups valides d'un joueur, calculés juste avant un placement.
+        
+        Contrairement au cache de legal_moves, seules les pièces données sont suivies,
+        ce qui convient aux recherches de fin de partie où il reste peu de pièces.
+        
+        Args:
+            moves (List[Tuple[int, int, int, int]]): Les coups valides avant le placement.
+            color (int): La couleur du joueur.
+            piece_ids (Set[int]): Les identifiants des pièces restantes après le placement.
+            record (PlacementRecord, optional): Le placement. Par défaut, le dernier.
+        
+        Returns:
+            List[Tuple[int, int, int, int]]: Les coups valides après le placement.
+        """
+        record = record if record is not None else self.history[-1]
+        own = record.color == color
+        if own and self.squares_placed[color] == len(record.cells):
+            return self.find_all_moves(color, piece_ids)
+        # Own pieces also forbid the cells along their edges
+        margin = 1 if own else 0
+        min_x = min(cell_x for cell_x, _ in record.cells) - margin
+        max_x = max(cell_x for cell_x, _ in record.cells) + margin
+        min_y = min(cell_y for _, cell_y in record.cells) - margin
+        max_y = max(cell_y for _, cell_y in record.cells) + margin
+
+        kept = []
+        for move in moves:
+            if move[0] not in piece_ids:
+                continue
+            orientation = ORIENTATIONS[move[0]][move[1]]
+            x, y = move[2], move[3]
+            if (x > max_x or y > max_y or
+                x + orientation.height <= min_x or y + orientation.width <= min_y or
+                self.is_valid_move(orientation, x, y, color)):
+                kept.append(move)
+        if own and record.corners_added:
+            known = set(kept)
+            kept.extend(move for move in self._anchored_moves(color, piece_ids, record.corners_added)
+                        if move not in known)
+        return kept
+
+    def sample_move(self, color: int, piece_ids: Iterable[int], rng: Any = random,
+                    dead: Optional[Set[int]] = None) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Tire au hasard un coup valide, en essayant d'abord les plus grosses pièces.
+        
+        Les coins sont mélangés et la recherche s'arrête au premier placement valide :
+        c'est le générateur léger des parties simulées, bien moins coûteux que la
+        liste complète des coups.
+        
+        Args:
+            color (int): La couleur du joueur.
+            piece_ids (Iterable[int]): Les identifiants des pièces restantes.
+            rng (random.Random, optional): Le générateur aléatoire. Par défaut, le module random.
+            dead (Set[int], optional): Les pièces qui ne rentrent déjà plus nulle part ; elles
+                sont ignorées et l'ensemble reçoit celles qui viennent d'échouer. Le plateau ne
+                faisant que se remplir, une pièce morte le reste tant qu'aucun coup n'est annulé.
+        
+        Returns:
+            Optional[Tuple[int, int, int, int]]: Un coup (piece_id, orientation_id, x, y),
+            ou None si le joueur est bloqué.
+        """
+        # Sorted: the order of the set depends on how the position was reached (a loaded
+        # board has no history), and a given generator state must draw the same move
+        corners = sorted(self.corners[color] if self.squares_placed[color] else self.board_corners)
+        if not corners:
+            return None
+        rng.shuffle(corners)
+        pieces = sorted(piece_ids, key=lambda piece_id: (-ORIENTATIONS[piece_id][0].size, rng.random()))
+        for piece_id in pieces:
+            if dead is not None and piece_id in dead:
+                continue
+            moves = self._anchored_moves(color, (piece_id,), corners, first=True)
+            if moves:
+                return moves[0]
+            if dead is not None:
+                dead.add(piece_id)
+        return None
+
+    def has_any_move(self, color: int, piece_ids: Iterable[int]) -> bool:
+        """
+        Vérifie si un joueur peut encore poser l'une de ses pièces.
+        
+        La recherche s'arrête au premier coup valide, en testant d'abord les pièces
+        les moins coûteuses et les coins les plus dégagés. Un joueur bloqué le reste
+        tant que le plateau ne fait que se remplir : ce résultat est mémorisé.
+        
+        Args:
+            color (int): La couleur du joueur.
+            piece_ids (Iterable[int]): Les identifiants des pièces restantes.
+        
+        Returns:
+            bool: True s'il existe au moins un coup valide, sinon False.
+        """
+        piece_ids = set(piece_ids)
+        if not piece_ids:
+            return False
+        proof = self._blocked.get(color)
+        if proof is not None and piece_ids <= proof[1]:
+            return False
+        moves_by_piece = self._move_cache.get((self.zobrist, color))
+        if moves_by_piece is not None:
+            return any(moves_by_piece[piece_id] for piece_id in piece_ids)
+
+        corners = self.corners[color] if self.squares_placed[color] else self.board_corners
+        corners = sorted(corners, key=lambda corner: -self._corner_room(*corner))
+        pieces = sorted(piece_ids, key=lambda piece_id: (ORIENTATIONS[piece_id][0].size,
+                                                         len(ORIENTATIONS[piece_id])))
+        for corner in corners:
+            for piece_id in pieces:
+                if self._anchored_moves(color, (piece_id,), (corner,), first=True):
+                    return True
+
+        if proof is not None:
+            piece_ids |= proof[1]
+        self._blocked[color] = (len(self.history), frozenset(piece_ids))
+        return False
+
+    def _corner_room(self, x: int, y: int) -> int:
+        """
+        Compte les cases vides adjacentes à un coin, pour essayer d'abord les coins dégagés.
+        
+        Args:
+            x (int): La coordonnée x du coin.
+            y (int): La coordonnée y du coin.
+        
+        Returns:
+            int: Le nombre de voisins vides du coin.
+        """
+        return sum(1 for adj_x, adj_y in self._get_valid_adjacent(x, y)
+                   if self._grid[adj_x][adj_y] == 0)
+
     def can_place_piece(self, piece: Piece, color: int) -> bool:
         """
         Vérifie s'il existe une position valide pour placer la pièce.
@@ -242,6 +849,31 @@ class Board:
         """
         return bool(self.find_valid_moves(piece, color))
 
+    def snapshot(self) -> bytes:
+        """
+        Sérialise la grille de façon compacte : la taille, puis une case par octet.
+        
+        Returns:
+            bytes: L'instantané du plateau, à relire avec from_snapshot.
+        """
+        return bytes([self.size]) + bytes(cell for row in self._grid for cell in row)
+
+    @classmethod
+    def from_snapshot(cls, data: bytes) -> 'Board':
+        """
+        Reconstruit un plateau à partir d'un instantané ; coins et compteurs sont recalculés.
+        
+        Args:
+            data (bytes): L'instantané renvoyé par snapshot.
+        
+        Returns:
+            Board: Le plateau reconstruit, sans historique.
+        """
+        size = data[0]
+        board = cls(size)
+        board.grid = [list(data[1 + i * size:1 + (i + 1) * size]) for i in range(size)]
+        return board
+
     def display(self, preview_grid: List[List[int]] = None) -> None:
         """
         Affiche l'état actuel du plateau avec des visuels améliorés.
@@ -297,4 +929,463 @@ class Board:
         print("\nLégende:")
         for color in range(1, 5):
             print(f"{COLORS[color]}Joueur {color}{COLORS[0]}", end="  ")
-        print("\n")
\ No newline at end of file
+        print("\n")
+
+class BitBoard(Board):
+    """
+    Plateau de Blokus dont la légalité des coups repose sur des masques de bits.
+    
+    Chaque case (x, y) correspond au bit ``x * (size + 1) + y`` d'un entier Python ;
+    la colonne supplémentaire reste toujours vide et empêche les décalages de
+    déborder d'une ligne à l'autre. L'API publique est identique à celle de Board
+    et ``grid`` reste une vue List[List[int]] synchronisée avec les masques.
+    
+    Attributs:
+        _stride (int): Nombre de bits par ligne (size + 1).
+        _full (int): Masque de toutes les cases du plateau.
+        _occupied (int): Masque des cases occupées, toutes couleurs confondues.
+        _color_bits (dict): Masque des cases occupées par chaque couleur.
+        _forbidden (dict): Masque des cases adjacentes par un bord à chaque couleur.
+        _diagonal (dict): Masque des cases en contact diagonal avec chaque couleur.
+        _piece_masks (dict): Cache des masques de pièces, indexé par forme.
+    """
+    _DERIVED = Board._DERIVED + ('_occupied', '_color_bits', '_forbidden', '_diagonal')
+
+    def __init__(self, size: int = 20, backend: str = "bitboard"):
+        """
+        Initialise un nouveau plateau à base de masques de bits.
+        
+        Args:
+            size (int): La taille du plateau de jeu. Par défaut, 20.
+            backend (str): Ignoré, présent pour Board(backend="bitboard").
+        """
+        self._stride = size + 1
+        self._full = 0
+        for i in range(size):
+            self._full |= ((1 << size) - 1) << (i * self._stride)
+        self._piece_masks = {}
+        super().__init__(size)
+
+    def _sync_from_grid(self) -> None:
+        """
+        Recalcule les coins, les compteurs et tous les masques à partir de la grille.
+        """
+        super()._sync_from_grid()
+        self._occupied = 0
+        self._color_bits = {1: 0, 2: 0, 3: 0, 4: 0}
+        for i, row in enumerate(self._grid):
+            for j, cell in enumerate(row):
+                if cell:
+                    bit = 1 << (i * self._stride + j)
+                    self._occupied |= bit
+                    self._color_bits[cell] = self._color_bits.get(cell, 0) | bit
+        self._forbidden = {c: self._edge_neighbours(m) for c, m in self._color_bits.items()}
+        self._diagonal = {c: self._diagonal_neighbours(m) for c, m in self._color_bits.items()}
+
+    def _cells(self, mask: int) -> List[Tuple[int, int]]:
+        """
+        Convertit un masque en liste de cases.
+        
+        Args:
+            mask (int): Le masque à parcourir.
+        
+        Returns:
+            List[Tuple[int, int]]: Les cases (x, y) du masque.
+        """
+        cells = []
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            cells.append(divmod(low.bit_length() - 1, self._stride))
+        return cells
+
+    def _live_corners(self, color: int) -> int:
+        """
+        Retourne le masque des coins libres d'un joueur.
+        
+        Args:
+            color (int): La couleur du joueur.
+        
+        Returns:
+            int: Le masque des cases vides touchant la couleur par un coin et par aucun bord.
+        """
+        return self._diagonal[color] & ~(self._occupied | self._forbidden[color])
+
+    def _edge_neighbours(self, mask: int) -> int:
+        """
+        Calcule les cases partageant un bord avec celles du masque.
+        
+        Args:
+            mask (int): Le masque de départ.
+        
+        Returns:
+            int: Le masque des voisins orthogonaux.
+        """
+        s = self._stride
+        return ((mask << 1) | (mask >> 1) | (mask << s) | (mask >> s)) & self._full
+
+    def _diagonal_neighbours(self, mask: int) -> int:
+        """
+        Calcule les cases partageant un coin avec celles du masque.
+        
+        Args:
+            mask (int): Le masque de départ.
+        
+        Returns:
+            int: Le masque des voisins diagonaux.
+        """
+        s = self._stride
+        return ((mask << (s + 1)) | (mask << (s - 1)) |
+                (mask >> (s - 1)) | (mask >> (s + 1))) & self._full
+
+    def _piece_mask(self, piece: Piece) -> int:
+        """
+        Retourne le masque de la pièce placée en (0, 0) (mis en cache).
+        
+        Args:
+            piece (Piece): La pièce.
+        
+        Returns:
+            int: Le masque de la pièce.
+        """
+        shape = piece.shape
+        key = shape if isinstance(shape, tuple) else tuple(map(tuple, shape))
+        mask = self._piece_masks.get(key)
+        if mask is None:
+            mask = 0
+            for i, row in enumerate(key):
+                for j, cell in enumerate(row):
+                    if cell == 1:
+                        mask |= 1 << (i * self._stride + j)
+            self._piece_masks[key] = mask
+        return mask
+
+    def _board_corner_mask(self) -> int:
+        """
+        Retourne le masque des coins du plateau encore libres.
+        
+        Returns:
+            int: Le masque des coins du plateau.
+        """
+        mask = 0
+        for corner_x, corner_y in self.board_corners:
+            mask |= 1 << (corner_x * self._stride + corner_y)
+        return mask
+
+    def is_valid_move(self, piece: Piece, x: int, y: int, color: int) -> bool:
+        """
+        Vérifie si le placement d'une pièce à (x, y) est valide.
+        
+        Args:
+            piece (Piece): La pièce à placer.
+            x (int): La coordonnée x de la position de placement.
+            y (int): La coordonnée y de la position de placement.
+            color (int): La couleur du joueur.
+        
+        Returns:
+            bool: True si le placement est valide, sinon False.
+        """
+        if (x < 0 or y < 0 or
+            x + piece.height > self.size or
+            y + piece.width > self.size):
+            return False
+
+        mask = self._piece_mask(piece) << (x * self._stride + y)
+        if mask & (self._occupied | self._forbidden[color]):
+            return False
+        if mask & self._diagonal[color]:
+            return True
+        # Pour le premier coup, vérifier si on touche un coin du plateau
+        return not self.squares_placed[color] and bool(mask & self._board_corner_mask())
+
+    def place_piece(self, piece: Piece, x: int, y: int, color: int) -> PlacementRecord:
+        """
+        Place une pièce et met à jour les masques et les coins disponibles.
+        
+        Args:
+            piece (Piece): La pièce à placer.
+            x (int): La coordonnée x de la position de placement.
+            y (int): La coordonnée y de la position de placement.
+            color (int): La couleur du joueur.
+        
+        Returns:
+            PlacementRecord: La trace du placement, à passer à undo().
+        """
+        for i in range(piece.height):
+            row = self._grid[x + i]
+            for j in range(piece.width):
+                if piece.shape[i][j] == 1:
+                    list.__setitem__(row, y + j, color)
+
+        mask = self._piece_mask(piece) << (x * self._stride + y)
+        cells = self._cells(mask)
+        engine_state = (self._occupied, self._color_bits[color],
+                        self._forbidden[color], self._diagonal[color])
+        old_live = self._live_corners(color)
+        self._occupied |= mask
+        self._color_bits[color] |= mask
+        self._forbidden[color] |= self._edge_neighbours(mask)
+        self._diagonal[color] |= self._diagonal_neighbours(mask)
+        new_live = self._live_corners(color)
+        self.squares_placed[color] += len(cells)
+        self.zobrist ^= self._cells_key(cells, color)
+
+        # Covered cells are dead corners for everyone, the mover's set follows its masks
+        used = self.board_corners.intersection(cells)
+        self.board_corners.difference_update(used)
+        removed = {}
+        for corner_color, corners in self.corners.items():
+            if corner_color != color:
+                gone = corners.intersection(cells)
+                if gone:
+                    corners.difference_update(gone)
+                    removed[corner_color] = gone
+        gone = set(self._cells(old_live & ~new_live))
+        added = set(self._cells(new_live & ~old_live))
+        if gone:
+            self.corners[color].difference_update(gone)
+            removed[color] = gone
+        self.corners[color].update(added)
+
+        record = PlacementRecord(piece, x, y, color, cells, added, removed, used, engine_state)
+        self.history.append(record)
+        return record
+
+    def undo(self, record: Optional[PlacementRecord] = None) -> PlacementRecord:
+        """
+        Annule le dernier placement et restaure les masques du joueur.
+        
+        Args:
+            record (PlacementRecord, optional): La trace renvoyée par place_piece.
+                Par défaut, le dernier placement.
+        
+        Returns:
+            PlacementRecord: La trace du placement annulé.
+        """
+        record = super().undo(record)
+        color = record.color
+        (self._occupied, self._color_bits[color],
+         self._forbidden[color], self._diagonal[color]) = record.engine_state
+        return record
+
+    def corner_count(self, color: int) -> int:
+        """
+        Retourne le nombre de coins libres d'un joueur, indicateur de sa mobilité.
+        
+        Args:
+            color (int): La couleur du joueur.
+        
+        Returns:
+            int: Le nombre de coins libres.
+        """
+        return self._live_corners(color).bit_count()
+
+    def _scan_valid_moves(self, piece: Piece, color: int) -> List[Tuple[int, int]]:
+        """
+        Cherche les positions valides d'une pièce autour des coins libres du joueur.
+        
+        Args:
+            piece (Piece): La pièce à placer.
+            color (int): La couleur du joueur.
+        
+        Returns:
+            List[Tuple[int, int]]: Liste des positions valides.
+        """
+        height, width = piece.height, piece.width
+        max_x, max_y = self.size - height, self.size - width
+        base = self._piece_mask(piece)
+        blocked = self._occupied | self._forbidden[color]
+        stride = self._stride
+        valid_positions = []
+
+        # If first move, only check board corners
+        if not self.squares_placed[color]:
+            contact = self._diagonal[color] | self._board_corner_mask()
+            for corner_x, corner_y in self.board_corners:
+                for x in range(corner_x - height + 1, corner_x + 1):
+                    if x < 0 or x > max_x:
+                        continue
+                    for y in range(corner_y - width + 1, corner_y + 1):
+                        if y < 0 or y > max_y:
+                            continue
+                        mask = base << (x * stride + y)
+                        if not mask & blocked and mask & contact:
+                            valid_positions.append((x, y))
+            return valid_positions
+
+        # Otherwise, only anchor the piece on live corners: a valid placement
+        # always covers an empty cell diagonal to, but not beside, our color
+        contact = self._diagonal[color]
+        live = self._live_corners(color)
+        checked_positions = set()
+        while live:
+            low = live & -live
+            live ^= low
+            corner_x, corner_y = divmod(low.bit_length() - 1, stride)
+            ys = range(max(0, corner_y - width + 1), min(max_y, corner_y) + 1)
+            for x in range(max(0, corner_x - height + 1), min(max_x, corner_x) + 1):
+                for y in ys:
+                    pos = (x, y)
+                    if pos in checked_positions:
+                        continue
+                    checked_positions.add(pos)
+                    mask = base << (x * stride + y)
+                    if not mask & blocked and mask & contact:
+                        valid_positions.append(pos)
+
+        return valid_positions
+
+    def _anchored_moves(self, color: int, piece_ids: Iterable[int],
+                        corners: Iterable[Tuple[int, int]], first: bool = False) -> List[Tuple[int, int, int, int]]:
+        """
+        Teste par masques les placements qui posent une case d'ancrage sur l'un des coins donnés.
+        
+        Args:
+            color (int): La couleur du joueur.
+            piece_ids (Iterable[int]): Les identifiants des pièces à essayer.
+            corners (Iterable[Tuple[int, int]]): Les coins sur lesquels ancrer les pièces.
+            first (bool): Si True, s'arrête au premier coup valide trouvé.
+        
+        Returns:
+            List[Tuple[int, int, int, int]]: Liste des coups valides, sans doublons.
+        """
+        blocked = self._occupied | self._forbidden[color]
+        contact = self._diagonal[color]
+        if not self.squares_placed[color]:
+            contact |= self._board_corner_mask()
+        stride = self._stride
+
+        max_coord = self.size
+        moves = []
+        for piece_id in piece_ids:
+            for orientation in ORIENTATIONS[piece_id]:
+                base = self._piece_mask(orientation)
+                max_x = max_coord - orientation.height
+                max_y = max_coord - orientation.width
+                checked_positions = set()
+                for corner_x, corner_y in corners:
+                    for i, j in orientation.anchor_cells:
+                        x, y = corner_x - i, corner_y - j
+                        if x < 0 or y < 0 or x > max_x or y > max_y:
+                            continue
+                        pos = (x, y)
+                        if pos in checked_positions:
+                            continue
+                        checked_positions.add(pos)
+                        mask = base << (x * stride + y)
+                        if not mask & blocked and mask & contact:
+                            moves.append((piece_id, orientation.orientation_id, x, y))
+                            if first:
+                                return moves
+        return moves
+
+
+class NumpyBoard(Board):
+    """
+    Plateau de Blokus doublé d'une grille NumPy, pour les outils d'analyse.
+    
+    Le jeu lui-même suit les règles de Board ; la grille ``cells`` sert à calculer
+    en une passe vectorisée toutes les positions légales d'une orientation.
+    S'obtient avec ``Board(backend="numpy")`` et nécessite NumPy.
+    
+    Attributs:
+        cells (np.ndarray): La grille en uint8, synchronisée avec ``grid``.
+    """
+    _DERIVED = Board._DERIVED + ('cells',)
+
+    def __init__(self, size: int = 20, backend: str = "numpy"):
+        """
+        Initialise un nouveau plateau doublé d'une grille NumPy.
+        
+        Args:
+            size (int): La taille du plateau de jeu. Par défaut, 20.
+            backend (str): Ignoré, présent pour Board(backend="numpy").
+        """
+        if np is None:
+            raise ImportError("The numpy board backend requires NumPy")
+        super().__init__(size)
+
+    def _sync_from_grid(self) -> None:
+        """
+        Recalcule les coins, les compteurs et la grille NumPy à partir de la grille.
+        """
+        super()._sync_from_grid()
+        self.cells = np.array(self._grid, dtype=np.uint8).reshape(self.size, self.size)
+
+    def place_piece(self, piece: Piece, x: int, y: int, color: int) -> PlacementRecord:
+        """
+        Place une pièce et reporte ses cases dans la grille NumPy.
+        
+        Args:
+            piece (Piece): La pièce à placer.
+            x (int): La coordonnée x de la position de placement.
+            y (int): La coordonnée y de la position de placement.
+            color (int): La couleur du joueur.
+        
+        Returns:
+            PlacementRecord: La trace du placement, à passer à undo.
+        """
+        record = super().place_piece(piece, x, y, color)
+        for cell_x, cell_y in record.cells:
+            self.cells[cell_x, cell_y] = color
+        return record
+
+    def undo(self, record: Optional[PlacementRecord] = None) -> PlacementRecord:
+        """
+        Annule le dernier placement et vide ses cases dans la grille NumPy.
+        
+        Args:
+            record (PlacementRecord, optional): La trace renvoyée par place_piece.
+                Par défaut, le dernier placement.
+        
+        Returns:
+            PlacementRecord: La trace du placement annulé.
+        """
+        record = super().undo(record)
+        for cell_x, cell_y in record.cells:
+            self.cells[cell_x, cell_y] = 0
+        return record
+
+    def legal_anchor_mask(self, piece: Piece, color: int) -> "np.ndarray":
+        """
+        Calcule en une passe le masque des positions (x, y) où la pièce peut être posée.
+        
+        Chaque case de la pièce décale une fenêtre sur la grille : la somme des
+        fenêtres de cases bloquées (occupées ou bordant la couleur) doit être nulle,
+        celle des cases de contact (en diagonale de la couleur, ou coins du plateau
+        au premier coup) strictement positive.
+        
+        Args:
+            piece (Piece): L'orientation de la pièce.
+            color (int): La couleur du joueur.
+        
+        Returns:
+            np.ndarray: Un masque booléen size x size, vrai là où is_valid_move l'est.
+        """
+        size = self.size
+        own = np.zeros((size + 2, size + 2), dtype=bool)
+        own[1:-1, 1:-1] = self.cells == color
+        edge = own[:-2, 1:-1] | own[2:, 1:-1] | own[1:-1, :-2] | own[1:-1, 2:]
+        if self.squares_placed[color]:
+            contact = own[:-2, :-2] | own[:-2, 2:] | own[2:, :-2] | own[2:, 2:]
+        else:
+            contact = np.zeros((size, size), dtype=bool)
+            for corner_x, corner_y in self.board_corners:
+                contact[corner_x, corner_y] = True
+        contact &= ~edge
+
+        # Les cases hors plateau sont bloquées pour que les pièces ne débordent pas
+        height, width = piece.height, piece.width
+        blocked = np.ones((size + height, size + width), dtype=np.uint8)
+        blocked[:size, :size] = (self.cells != 0) | edge
+        touching = np.zeros((size + height, size + width), dtype=np.uint8)
+        touching[:size, :size] = contact
+
+        blocked_sum = np.zeros((size, size), dtype=np.uint16)
+        contact_sum = np.zeros((size, size), dtype=np.uint16)
+        for i in range(height):
+            for j in range(width):
+                if piece.shape[i][j] == 1:
+                    blocked_sum += blocked[i:i + size, j:j + size]
+                    contact_sum += touching[i:i + size, j:j + size]
+        return (blocked_sum == 0) & (contact_sum > 0)
@@ -1,29 +1,302 @@
+import math
 import random
-from typing import List
-from .piece import Piece, PIECE_DEFINITIONS
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+from .analysis import RegionAnalysis
+from .board import BitBoard
+from .endgame import ENDGAME_THRESHOLD, EndgameSolver
+from .piece import Piece, PIECE_DEFINITIONS, ORIENTATIONS
+
+# Niveau "expert" : nombre de coups explorés à la racine et à chaque nœud de la recherche
+EXPERT_ROOT_WIDTH = 16
+EXPERT_BEAM_WIDTH = 6
+# Profondeur maximale (en demi-coups, un par couleur) de l'approfondissement itératif
+EXPERT_MAX_DEPTH = 8
+# Poids des coins libres face aux cases posées dans l'évaluation d'une position
+EXPERT_CORNER_WEIGHT = 0.5
+# Poids des cases que seule la couleur peut encore atteindre (voir RegionAnalysis)
+EXPERT_REGION_WEIGHT = 0.25
+# Niveau "mcts" : coups retenus par nœud de l'arbre et constante d'exploration UCT
+MCTS_WIDTH = 24
+MCTS_EXPLORATION = 1.4
+# Niveaux qui jouent les premiers coups de la bibliothèque d'ouvertures au lieu de chercher
+BOOK_LEVELS = ("expert", "mcts")
+# Niveaux qui résolvent exactement la fin de partie (voir EndgameSolver)
+ENDGAME_LEVELS = ("hard", "expert", "mcts")
+
+# Masques d'évaluation par (taille du plateau, pièce, orientation), voir _orientation_masks
+_EVAL_MASKS: Dict[Tuple[int, int, int], Tuple[int, int]] = {}
+# Identifiant de pièce de chaque forme orientée, ses cases ramenées au coin haut-gauche
+_SHAPE_IDS = {frozenset(orientation.cells): piece_id
+              for piece_id, orientations in ORIENTATIONS.items() for orientation in orientations}
+
+
+def _padded_masks(board, color: int) -> Tuple[int, int]:
+    """
+    Calcule les masques des cases vides et des cases d'une couleur sur le plateau bordé
+    d'une case de _orientation_masks.
+    
+    Un BitBoard tient déjà ces masques à jour à chaque placement : ils sont simplement
+    recopiés ligne par ligne, au lieu de relire les size * size cases de la grille.
+    
+    Args:
+        board (Board): Le plateau de jeu.
+        color (int): La couleur.
+    
+    Returns:
+        Tuple[int, int]: Les cases vides et les cases de la couleur.
+    """
+    size = board.size
+    stride = size + 2
+    empty = 0
+    own = 0
+    if isinstance(board, BitBoard):
+        row_mask = (1 << size) - 1
+        occupied, own_bits = board._occupied, board._color_bits.get(color, 0)
+        for i in range(size):
+            shift = i * board._stride
+            offset = (i + 1) * stride + 1
+            empty |= (~(occupied >> shift) & row_mask) << offset
+            own |= ((own_bits >> shift) & row_mask) << offset
+        return empty, own
+    for i, row in enumerate(board.grid):
+        for j, cell in enumerate(row):
+            bit = 1 << ((i + 1) * stride + (j + 1))
+            if cell == 0:
+                empty |= bit
+            elif cell == color:
+                own |= bit
+    return empty, own
+
+
+def _orientation_masks(size: int, piece_id: int, orientation_id: int) -> Tuple[int, int]:
+    """
+    Calcule les masques d'une orientation posée en (0, 0) sur un plateau bordé d'une case.
+    
+    La case (i, j) du plateau correspond au bit ``(i + 1) * (size + 2) + (j + 1)`` ; la
+    bordure n'est jamais vide, ce qui reproduit le découpage de la fenêtre aux bords.
+    
+    Args:
+        size (int): La taille du plateau.
+        piece_id (int): L'identifiant de la pièce.
+        orientation_id (int): L'identifiant de l'orientation.
+    
+    Returns:
+        Tuple[int, int]: La fenêtre autour de la pièce (sans ses cases) et les cases
+        en diagonale d'une case de la pièce.
+    """
+    key = (size, piece_id, orientation_id)
+    masks = _EVAL_MASKS.get(key)
+    if masks is None:
+        orientation = ORIENTATIONS[piece_id][orientation_id]
+        stride = size + 2
+        cells = set(orientation.cells)
+        window = 0
+        for i in range(-1, orientation.height + 1):
+            for j in range(-1, orientation.width + 1):
+                if (i, j) not in cells:
+                    window |= 1 << ((i + 1) * stride + (j + 1))
+        diagonal = 0
+        for i, j in cells:
+            for dx, dy in [(1, 1), (1, -1), (-1, 1), (-1, -1)]:
+                if (i + dx, j + dy) not in cells:
+                    diagonal |= 1 << ((i + dx + 1) * stride + (j + dy + 1))
+        masks = _EVAL_MASKS[key] = (window, diagonal)
+    return masks
+
+
+def _pack_hand(piece_ids) -> int:
+    """Encode un ensemble d'identifiants de pièces en masque de bits."""
+    mask = 0
+    for piece_id in piece_ids:
+        mask |= 1 << piece_id
+    return mask
+
+
+def _unpack_hand(mask: int) -> set:
+    """Décode un masque de bits produit par _pack_hand."""
+    return {piece_id for piece_id in range(len(PIECE_DEFINITIONS)) if mask >> piece_id & 1}
+
+
+def _pieces_on_grid(board, color) -> set:
+    """
+    Retrouve les pièces posées par une couleur en lisant la grille.
+    
+    Deux pièces d'une même couleur ne se touchent jamais par un bord : chaque
+    composante connexe de la couleur est donc exactement une pièce.
+    
+    Args:
+        board (Board): Le plateau de jeu.
+        color (int): La couleur.
+    
+    Returns:
+        set: Les identifiants des pièces posées.
+    """
+    grid = board.grid
+    size = board.size
+    seen = set()
+    placed = set()
+    for x in range(size):
+        for y in range(size):
+            if grid[x][y] != color or (x, y) in seen:
+                continue
+            component, stack = [], [(x, y)]
+            seen.add((x, y))
+            while stack:
+                i, j = stack.pop()
+                component.append((i, j))
+                for ni, nj in ((i + 1, j), (i - 1, j), (i, j + 1), (i, j - 1)):
+                    if 0 <= ni < size and 0 <= nj < size and (ni, nj) not in seen and grid[ni][nj] == color:
+                        seen.add((ni, nj))
+                        stack.append((ni, nj))
+            min_i = min(i for i, _ in component)
+            min_j = min(j for _, j in component)
+            piece_id = _SHAPE_IDS.get(frozenset((i - min_i, j - min_j) for i, j in component))
+            if piece_id is not None:
+                placed.add(piece_id)
+    return placed
+
+
+def _search_worker(level, color, turn_order, snapshot, hands, time_budget, playouts, root_moves, seed):
+    """
+    Recherche menée dans un processus de travail à partir d'un instantané compact.
+    
+    Args:
+        level (str): 'expert' ou 'mcts'.
+        color (int): La couleur du bot.
+        turn_order (List[int]): Les couleurs en jeu, dans l'ordre des tours.
+        snapshot (bytes): L'instantané du plateau (Board.snapshot).
+        hands (Dict[int, int]): Les pièces restantes de chaque couleur, en masques (_pack_hand).
+        time_budget (float): Le temps de réflexion, en secondes.
+        playouts (int): Le nombre de parties simulées ('mcts'), None pour s'en tenir au temps.
+        root_moves (list): Les coups de la racine confiés à ce processus ('expert').
+        seed (int): La graine du générateur aléatoire du processus, tirée du générateur du bot.
+    
+    Returns:
+        Pour 'expert', les résultats de l'approfondissement itératif par profondeur ;
+        pour 'mcts', le nombre de parties simulées et les statistiques des coups de la racine.
+    """
+    deadline = time.perf_counter() + time_budget
+    board = BitBoard.from_snapshot(snapshot)
+    hands = {hand_color: _unpack_hand(mask) for hand_color, mask in hands.items()}
+    bot = BotPlayer(level, color, turn_order=turn_order, time_budget=time_budget, playouts=playouts,
+                    rng=random.Random(seed))
+    bot.remaining_pieces = hands[color]
+    if level == "expert":
+        return bot._iterative_deepening(board, hands, root_moves, deadline)
+    root = _MCTSNode(None, None, turn_order.index(color))
+    done = bot._run_mcts(board, hands, root, deadline)
+    return done, [(child.move, child.visits, child.reward) for child in root.children]
+
+
+class _SearchTimeout(Exception):
+    """Levée lorsque le budget de temps d'une recherche est épuisé."""
+
+
+class _MCTSNode:
+    """
+    Nœud de l'arbre de recherche Monte Carlo.
+    
+    Attributs:
+        move (Tuple[int, int, int, int]): Le coup menant au nœud, None pour un passe ou la racine.
+        mover (int): La couleur qui a joué ce coup, None pour la racine.
+        to_move (int): La position dans turn_order de la couleur qui joue ensuite.
+        passes (int): Le nombre de passes consécutifs menant au nœud.
+        parent (_MCTSNode): Le nœud parent, None pour la racine.
+        children (List[_MCTSNode]): Les nœuds enfants déjà développés.
+        untried (list): Les coups restant à développer, None tant qu'ils ne sont pas générés.
+        visits (int): Le nombre de parties simulées passées par le nœud.
+        reward (float): La somme des gains de mover sur ces parties.
+    """
+    __slots__ = ('move', 'mover', 'to_move', 'passes', 'parent', 'children', 'untried', 'visits', 'reward')
+
+    def __init__(self, move, mover, to_move, passes=0, parent=None):
+        self.move = move
+        self.mover = mover
+        self.to_move = to_move
+        self.passes = passes
+        self.parent = parent
+        self.children = []
+        self.untried = None
+        self.visits = 0
+        self.reward = 0.0
+
+    def select_child(self):
+        """
+        Choisit l'enfant maximisant le score UCT du point de vue de la couleur qui le joue.
+        
+        Returns:
+            _MCTSNode: L'enfant sélectionné.
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.reward / child.visits +
+                   MCTS_EXPLORATION * math.sqrt(log_visits / child.visits))
 
 class BotPlayer:
     """
     Représente un joueur bot dans le jeu Blokus.
     
     Attributs:
-        level (str): Le niveau de difficulté du bot ('easy', 'medium', 'hard').
+        level (str): Le niveau de difficulté du bot ('easy', 'medium', 'hard', 'expert', 'mcts').
         color (int): La couleur du joueur bot.
         pieces (List[Piece]): La liste des pièces disponibles pour le bot.
         remaining_pieces (set): L'ensemble des indices des pièces restantes.
+        turn_order (List[int]): Les couleurs en jeu, dans l'ordre des tours.
+        time_budget (float): Le temps de réflexion par coup des niveaux 'expert' et 'mcts', en secondes.
+        search_depth (int): La profondeur complètement explorée lors du dernier coup 'expert'.
+        playouts (int): Le nombre de parties simulées par coup du niveau 'mcts',
+            None pour s'en tenir à time_budget.
+        search_stats (dict): Les statistiques du dernier coup 'mcts' (parties simulées, durée, débit).
+        workers (int): Le nombre de processus de recherche des niveaux 'expert' et 'mcts'.
+        rng (random.Random): Le générateur aléatoire propre au bot.
+        opening_book (OpeningBook): La bibliothèque d'ouvertures, chargée au premier coup
+            des niveaux 'expert' et 'mcts' ; None si elle est désactivée.
+        endgame_threshold (int): Le nombre total de coups légaux sous lequel les niveaux 'hard',
+            'expert' et 'mcts' résolvent exactement la fin de partie ; 0 pour ne jamais le faire.
     """
-    def __init__(self, level, color):
+    def __init__(self, level, color, turn_order=None, time_budget=1.0, playouts=None, workers=1, rng=None,
+                 opening_book=True, endgame_threshold=ENDGAME_THRESHOLD):
         """
         Initialise un nouveau joueur bot.
         
         Args:
-            level (str): Le niveau de difficulté du bot ('easy', 'medium', 'hard').
+            level (str): Le niveau de difficulté du bot ('easy', 'medium', 'hard', 'expert', 'mcts').
             color (int): La couleur du joueur bot.
+            turn_order (List[int], optional): Les couleurs en jeu dans l'ordre des tours.
+                Par défaut, les quatre couleurs.
+            time_budget (float): Le temps de réflexion par coup des niveaux 'expert' et 'mcts'.
+                Par défaut, 1 seconde.
+            playouts (int, optional): Le nombre fixe de parties simulées par coup du niveau 'mcts'.
+            workers (int): Le nombre de processus de recherche. Au-delà de 1, 'mcts' lance un
+                arbre par processus et 'expert' leur répartit les coups de la racine. Par défaut, 1.
+            rng (random.Random, optional): Le générateur aléatoire du bot ; avec une graine fixe,
+                ses coups sont reproductibles. Par défaut, un générateur indépendant.
+            opening_book (OpeningBook | bool): La bibliothèque d'ouvertures à utiliser ; True pour
+                celle livrée avec le jeu, False pour toujours chercher. Par défaut, True.
+            endgame_threshold (int): Le nombre total de coups légaux, toutes couleurs confondues,
+                sous lequel la fin de partie est résolue exactement. Par défaut, ENDGAME_THRESHOLD.
         """
         self.level = level
         self.color = color
         self.pieces = self._initialize_pieces()
         self.remaining_pieces = set(range(len(self.pieces)))
+        self.turn_order = list(turn_order) if turn_order else [1, 2, 3, 4]
+        self.time_budget = time_budget
+        self.search_depth = 0
+        self.playouts = playouts
+        self.search_stats = {}
+        self._mcts_root = None
+        self._mcts_record = None
+        self.workers = workers
+        self._executor = None
+        self.rng = rng if rng is not None else random.Random()
+        self._book_setting = opening_book
+        self._opening_book = None
+        self.endgame_threshold = endgame_threshold
+        self._endgame = None
+        self._regions = None
 
     def _initialize_pieces(self) -> List[Piece]:
         """
@@ -32,7 +305,7 @@ class BotPlayer:
         Returns:
             List[Piece]: La liste des pièces disponibles.
         """
-        return [Piece(shape, i) for i, shape in enumerate(PIECE_DEFINITIONS)]
+        return [ORIENTATIONS[i][0] for i in range(len(PIECE_DEFINITIONS))]
 
     def play(self, board):
         """
@@ -41,15 +314,90 @@ class BotPlayer:
         Args:
             board (Board): Le plateau de jeu.
         """
+        if self.level in BOOK_LEVELS and self._play_book_move(board):
+            return
+        if self.level in ENDGAME_LEVELS and self._play_endgame_move(board):
+            return
         if self.level == "easy":
             self._play_random_move(board)
         elif self.level == "medium":
             self._play_medium_move(board)
         elif self.level == "hard":
             self._play_hard_move(board)
+        elif self.level == "expert":
+            self._play_expert_move(board)
+        elif self.level == "mcts":
+            self._play_mcts_move(board)
         else:
             raise ValueError("Invalid level specified")
 
+    @property
+    def opening_book(self):
+        """
+        Retourne la bibliothèque d'ouvertures du bot, lue au premier accès.
+        
+        Returns:
+            OpeningBook: La bibliothèque, ou None si elle est désactivée.
+        """
+        if self._opening_book is None and self._book_setting:
+            from .opening_book import OpeningBook, get_default_book
+            self._opening_book = (self._book_setting if isinstance(self._book_setting, OpeningBook)
+                                  else get_default_book())
+        return self._opening_book
+
+    def _play_book_move(self, board):
+        """
+        Joue le coup de la bibliothèque d'ouvertures pendant les premiers tours, s'il existe.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+        
+        Returns:
+            bool: True si un coup de la bibliothèque a été joué, sinon False.
+        """
+        from .opening_book import BOOK_MOVES
+        if len(PIECE_DEFINITIONS) - len(self.remaining_pieces) >= BOOK_MOVES or self.opening_book is None:
+            return False
+        move = self.opening_book.lookup(board, self.color, self.turn_order)
+        if move is None:
+            return False
+        piece_id, orientation_id, x, y = move
+        piece = ORIENTATIONS[piece_id][orientation_id]
+        if piece_id not in self.remaining_pieces or not board.is_valid_move(piece, x, y, self.color):
+            return False
+        self.search_depth = 0
+        print(f"Placing piece {piece_id} at ({y}, {x}) (opening book)")
+        self._make_move(board, piece, (x, y))
+        return True
+
+    def _play_endgame_move(self, board):
+        """
+        Joue le coup optimal de fin de partie quand il reste peu de coups légaux.
+        
+        Les adversaires sont supposés jouer contre le bot ; si la résolution dépasse
+        son nombre maximal de positions, le bot revient à sa stratégie habituelle.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+        
+        Returns:
+            bool: True si un coup a été joué, sinon False.
+        """
+        if not self.endgame_threshold or not self.remaining_pieces:
+            return False
+        if self._endgame is None:
+            self._endgame = EndgameSolver(self.color, self.turn_order)
+        hands = self._infer_hands(board)
+        if self._endgame.count_moves(board, hands, self.endgame_threshold) > self.endgame_threshold:
+            return False
+        result = self._endgame.solve(board, hands)
+        if result is None:
+            return False
+        (piece_id, orientation_id, x, y), value = result
+        print(f"Placing piece {piece_id} at ({y}, {x}) (endgame, final margin {value:+d})")
+        self._make_move(board, ORIENTATIONS[piece_id][orientation_id], (x, y))
+        return True
+
     def _play_random_move(self, board):
         """
         Stratégie de jeu aléatoire améliorée qui évalue tous les mouvements possibles avant de choisir.
@@ -60,23 +408,18 @@ class BotPlayer:
         Returns:
             bool: True si un mouvement a été effectué, sinon False.
         """
-        pieces = list(self.get_remaining_pieces())
-        if not pieces:
+        if not self.remaining_pieces:
             return False
         
         # Collect all possible moves
-        all_possible_moves = []
-        for piece in pieces:
-            for variant in self._get_all_variations(piece):
-                moves = board.find_valid_moves(variant, self.color)
-                for x, y in moves:
-                    all_possible_moves.append((piece, variant, x, y))
+        all_possible_moves = board.legal_moves(self.color, self.remaining_pieces)
         
         if all_possible_moves:
-            # Choose a random move from all possibilities
-            chosen_piece, chosen_variant, x, y = random.choice(all_possible_moves)
-            print(f"Placing piece {chosen_piece.piece_id} at ({y}, {x})")
-            self._make_move(board, chosen_variant, (x, y))
+            # Choose a random move from all possibilities, in an order that does not
+            # depend on how the board's move cache was filled
+            piece_id, orientation_id, x, y = self.rng.choice(sorted(all_possible_moves))
+            print(f"Placing piece {piece_id} at ({y}, {x})")
+            self._make_move(board, ORIENTATIONS[piece_id][orientation_id], (x, y))
             return True
         
         print("No available moves")
@@ -97,20 +440,15 @@ class BotPlayer:
 
     def _get_all_variations(self, piece):
         """
-        Génère toutes les rotations et inversions d'une pièce.
+        Retourne les orientations distinctes d'une pièce (table précalculée).
         
         Args:
             piece (Piece): La pièce à varier.
         
         Returns:
-            List[Piece]: Liste de toutes les variations de la pièce.
+            List[Piece]: Liste des orientations distinctes de la pièce.
         """
-        variations = []
-        for _ in range(4):
-            piece = piece.rotate()
-            variations.append(piece)
-            variations.append(piece.flip())
-        return variations
+        return piece.get_all_variations()
 
     def get_pieces(self):
         """
@@ -143,8 +481,8 @@ class BotPlayer:
         Returns:
             bool: True si un mouvement a été effectué, sinon False.
         """
-        pieces = sorted(self.get_remaining_pieces(), 
-                    key=lambda p: sum(sum(row) for row in p.shape), 
+        piece_ids = sorted(self.remaining_pieces,
+                    key=lambda piece_id: ORIENTATIONS[piece_id][0].size,
                     reverse=True)  # Sort by piece size
         
         best_move = None
@@ -154,16 +492,13 @@ class BotPlayer:
         center_x = board.size // 2
         center_y = board.size // 2
         
-        for piece in pieces:
-            for variant in self._get_all_variations(piece):
-                moves = board.find_valid_moves(variant, self.color)
-                for move in moves:
-                    x, y = move
-                    score = self._evaluate_move(board, variant, x, y, center_x, center_y, 
-                                                CENTER_WEIGHT=1.0, SIZE_WEIGHT=0.5, TERRITORY_WEIGHT=1.0)
-                    if score > best_score:
-                        best_score = score
-                        best_move = (variant, x, y)
+        moves = board.legal_moves(self.color, piece_ids)
+        scores = self._evaluate_moves(board, moves, center_x, center_y,
+                                      CENTER_WEIGHT=1.0, SIZE_WEIGHT=0.5, TERRITORY_WEIGHT=1.0)
+        for (piece_id, orientation_id, x, y), score in zip(moves, scores):
+            if score > best_score:
+                best_score = score
+                best_move = (ORIENTATIONS[piece_id][orientation_id], x, y)
         
         if best_move:
             piece, x, y = best_move
@@ -185,8 +520,8 @@ class BotPlayer:
         Returns:
             bool: True si un mouvement a été effectué, sinon False.
         """
-        pieces = sorted(self.get_remaining_pieces(), 
-                    key=lambda p: sum(sum(row) for row in p.shape), 
+        piece_ids = sorted(self.remaining_pieces,
+                    key=lambda piece_id: ORIENTATIONS[piece_id][0].size,
                     reverse=True)  # Sort by piece size
         
         best_move = None
@@ -196,16 +531,13 @@ class BotPlayer:
         center_x = board.size // 2
         center_y = board.size // 2
         
-        for piece in pieces:
-            for variant in self._get_all_variations(piece):
-                moves = board.find_valid_moves(variant, self.color)
-                for move in moves:
-                    x, y = move
-                    score = self._evaluate_move(board, variant, x, y, center_x, center_y, 
-                                                CENTER_WEIGHT=2.0, SIZE_WEIGHT=1.5, TERRITORY_WEIGHT=2.0)
-                    if score > best_score:
-                        best_score = score
-                        best_move = (variant, x, y)
+        moves = board.legal_moves(self.color, piece_ids)
+        scores = self._evaluate_moves(board, moves, center_x, center_y,
+                                      CENTER_WEIGHT=2.0, SIZE_WEIGHT=1.5, TERRITORY_WEIGHT=2.0)
+        for (piece_id, orientation_id, x, y), score in zip(moves, scores):
+            if score > best_score:
+                best_score = score
+                best_move = (ORIENTATIONS[piece_id][orientation_id], x, y)
         
         if best_move:
             piece, x, y = best_move
@@ -214,6 +546,588 @@ class BotPlayer:
             return True
         return False
 
+    def _play_expert_move(self, board):
+        """
+        Stratégie de niveau expert : recherche alpha-bêta paranoïaque.
+        
+        Les adversaires sont supposés jouer ensemble contre le bot. La recherche
+        s'approfondit d'un demi-coup à la fois jusqu'à épuisement de time_budget,
+        en posant et retirant les pièces sur le plateau lui-même (place_piece/undo),
+        et joue le meilleur coup de la dernière profondeur terminée.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+        
+        Returns:
+            bool: True si un mouvement a été effectué, sinon False.
+        """
+        self.search_depth = 0
+        if not self.remaining_pieces:
+            return False
+        deadline = time.perf_counter() + self.time_budget
+        root_moves = self._ordered_moves(board, self.color, self.remaining_pieces)[:EXPERT_ROOT_WIDTH]
+        if not root_moves:
+            print("No available moves")
+            return False
+
+        hands = self._infer_hands(board)
+        if self.workers > 1:
+            results = self._parallel_expert_search(board, hands, root_moves)
+        else:
+            results = self._iterative_deepening(board, hands, root_moves, deadline)
+        best_move = root_moves[0]
+        if results:
+            self.search_depth = max(results)
+            best_move = results[self.search_depth][0]
+
+        piece_id, orientation_id, x, y = best_move
+        print(f"Placing piece {piece_id} at ({y}, {x})")
+        self._make_move(board, ORIENTATIONS[piece_id][orientation_id], (x, y))
+        return True
+
+    def _iterative_deepening(self, board, hands, root_moves, deadline):
+        """
+        Approfondit la recherche d'un demi-coup à la fois jusqu'à l'échéance.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+            hands (Dict[int, set]): Les pièces restantes de chaque couleur.
+            root_moves (List[Tuple[int, int, int, int]]): Les coups du bot, déjà ordonnés.
+            deadline (float): L'instant (time.perf_counter) où la recherche doit s'arrêter.
+        
+        Returns:
+            Dict[int, Tuple[Tuple[int, int, int, int], float]]: Pour chaque profondeur terminée,
+            le meilleur coup et sa valeur.
+        """
+        results = {}
+        root_moves = list(root_moves)
+        try:
+            for depth in range(1, EXPERT_MAX_DEPTH + 1):
+                best_move, value = self._search_root(board, hands, root_moves, depth, deadline)
+                results[depth] = (best_move, value)
+                # The best move is searched first at the next depth
+                root_moves.remove(best_move)
+                root_moves.insert(0, best_move)
+        except _SearchTimeout:
+            pass
+        return results
+
+    def _get_executor(self):
+        """
+        Retourne le groupe de processus de recherche, créé au premier besoin.
+        
+        Returns:
+            ProcessPoolExecutor: Le groupe de self.workers processus.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self):
+        """
+        Arrête les processus de recherche éventuellement lancés par le bot.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _submit_searches(self, board, hands, jobs):
+        """
+        Lance une recherche par processus sur un instantané compact du plateau et des mains.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+            hands (Dict[int, set]): Les pièces restantes de chaque couleur.
+            jobs (list): Pour chaque processus, le nombre de parties simulées et les coups de la racine.
+        
+        Returns:
+            list: Les résultats de _search_worker, dans l'ordre des jobs.
+        """
+        snapshot = board.snapshot()
+        packed = {color: _pack_hand(pieces) for color, pieces in hands.items()}
+        executor = self._get_executor()
+        futures = [executor.submit(_search_worker, self.level, self.color, self.turn_order, snapshot,
+                                   packed, self.time_budget, playouts, root_moves, self.rng.getrandbits(32))
+                   for playouts, root_moves in jobs]
+        return [future.result() for future in futures]
+
+    def _parallel_expert_search(self, board, hands, root_moves):
+        """
+        Répartit les coups de la racine entre les processus et fusionne leurs résultats.
+        
+        Chaque processus approfondit sa part des coups ; seules les profondeurs terminées
+        par tous sont comparables, et le meilleur coup est pris à la plus grande d'entre elles.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+            hands (Dict[int, set]): Les pièces restantes de chaque couleur.
+            root_moves (List[Tuple[int, int, int, int]]): Les coups du bot, déjà ordonnés.
+        
+        Returns:
+            Dict[int, Tuple[Tuple[int, int, int, int], float]]: Le meilleur coup et sa valeur
+            à la profondeur commune, ou un dictionnaire vide.
+        """
+        shares = [root_moves[index::self.workers] for index in range(self.workers)]
+        results = self._submit_searches(board, hands, [(None, share) for share in shares if share])
+        depth = min(max(result, default=0) for result in results)
+        if not depth:
+            return {}
+        return {depth: max((result[depth] for result in results), key=lambda entry: entry[1])}
+
+    def _infer_hands(self, board):
+        """
+        Reconstitue les pièces restantes de chaque couleur à partir de l'historique du plateau.
+        
+        Quand l'historique ne couvre pas toutes les cases d'une couleur (partie chargée,
+        grille affectée directement), ses pièces sont relues sur la grille.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+        
+        Returns:
+            Dict[int, set]: Les identifiants des pièces restantes de chaque couleur en jeu.
+        """
+        hands = {color: set(range(len(PIECE_DEFINITIONS))) for color in self.turn_order}
+        covered = dict.fromkeys(hands, 0)
+        for record in board.history:
+            if record.color in hands:
+                hands[record.color].discard(record.piece.piece_id)
+                covered[record.color] += len(record.cells)
+        for color in hands:
+            if covered[color] != board.squares_placed.get(color, 0):
+                hands[color] = set(range(len(PIECE_DEFINITIONS))) - _pieces_on_grid(board, color)
+        hands[self.color] = set(self.remaining_pieces)
+        return hands
+
+    def _ordered_moves(self, board, color, piece_ids):
+        """
+        Retourne les coups valides d'une couleur, du plus prometteur au moins prometteur.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+            color (int): La couleur qui joue.
+            piece_ids (Iterable[int]): Les identifiants des pièces restantes.
+        
+        Returns:
+            List[Tuple[int, int, int, int]]: Les coups triés selon _evaluate_move.
+        """
+        moves = board.legal_moves(color, piece_ids)
+        scores = self._evaluate_moves(board, moves, board.size // 2, board.size // 2,
+                                      CENTER_WEIGHT=2.0, SIZE_WEIGHT=1.5, TERRITORY_WEIGHT=2.0, color=color)
+        order = sorted(range(len(moves)), key=lambda index: scores[index], reverse=True)
+        return [moves[index] for index in order]
+
+    def _search_root(self, board, hands, root_moves, depth, deadline):
+        """
+        Explore les coups de la racine à la profondeur donnée.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+            hands (Dict[int, set]): Les pièces restantes de chaque couleur.
+            root_moves (List[Tuple[int, int, int, int]]): Les coups du bot, déjà ordonnés.
+            depth (int): La profondeur de recherche, en demi-coups.
+            deadline (float): L'instant (time.perf_counter) où la recherche doit s'arrêter.
+        
+        Returns:
+            Tuple[Tuple[int, int, int, int], float]: Le meilleur coup trouvé et sa valeur.
+        
+        Raises:
+            _SearchTimeout: Si le budget de temps est épuisé avant la fin.
+        """
+        next_index = (self.turn_order.index(self.color) + 1) % len(self.turn_order)
+        best_move, alpha = root_moves[0], float('-inf')
+        for move in root_moves:
+            value = self._search_move(board, hands, move, self.color, next_index,
+                                      depth, alpha, float('inf'), deadline)
+            if value > alpha:
+                best_move, alpha = move, value
+        return best_move, alpha
+
+    def _search_move(self, board, hands, move, color, next_index, depth, alpha, beta, deadline):
+        """
+        Joue un coup, explore la position obtenue puis annule le coup.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+            hands (Dict[int, set]): Les pièces restantes de chaque couleur.
+            move (Tuple[int, int, int, int]): Le coup (piece_id, orientation_id, x, y).
+            color (int): La couleur qui joue le coup.
+            next_index (int): La position dans turn_order de la couleur suivante.
+            depth (int): La profondeur restante avant le coup, en demi-coups.
+            alpha (float): La borne inférieure courante.
+            beta (float): La borne supérieure courante.
+            deadline (float): L'instant (time.perf_counter) où la recherche doit s'arrêter.
+        
+        Returns:
+            float: La valeur de la position après le coup, du point de vue du bot.
+        """
+        piece_id, orientation_id, x, y = move
+        board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+        hands[color].remove(piece_id)
+        try:
+            return self._alphabeta(board, hands, next_index, depth - 1, alpha, beta, 0, deadline)
+        finally:
+            hands[color].add(piece_id)
+            board.undo()
+
+    def _alphabeta(self, board, hands, index, depth, alpha, beta, passes, deadline):
+        """
+        Recherche alpha-bêta paranoïaque : le bot maximise, toutes les autres couleurs minimisent.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+            hands (Dict[int, set]): Les pièces restantes de chaque couleur.
+            index (int): La position dans turn_order de la couleur qui joue.
+            depth (int): La profondeur restante, en demi-coups.
+            alpha (float): La borne inférieure courante.
+            beta (float): La borne supérieure courante.
+            passes (int): Le nombre de couleurs consécutives qui n'ont pas pu jouer.
+            deadline (float): L'instant (time.perf_counter) où la recherche doit s'arrêter.
+        
+        Returns:
+            float: La valeur de la position du point de vue du bot.
+        
+        Raises:
+            _SearchTimeout: Si le budget de temps est épuisé.
+        """
+        if time.perf_counter() > deadline:
+            raise _SearchTimeout()
+        if depth == 0 or passes == len(self.turn_order):
+            return self._evaluate_position(board)
+
+        color = self.turn_order[index]
+        next_index = (index + 1) % len(self.turn_order)
+        moves = self._ordered_moves(board, color, hands[color])[:EXPERT_BEAM_WIDTH]
+        if not moves:
+            # A blocked color passes without using up depth
+            return self._alphabeta(board, hands, next_index, depth, alpha, beta, passes + 1, deadline)
+
+        if color == self.color:
+            value = float('-inf')
+            for move in moves:
+                value = max(value, self._search_move(board, hands, move, color, next_index,
+                                                     depth, alpha, beta, deadline))
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    break
+        else:
+            value = float('inf')
+            for move in moves:
+                value = min(value, self._search_move(board, hands, move, color, next_index,
+                                                     depth, alpha, beta, deadline))
+                beta = min(beta, value)
+                if alpha >= beta:
+                    break
+        return value
+
+    def _evaluate_position(self, board):
+        """
+        Évalue une position : cases posées, coins libres et territoire propre du bot,
+        moins ceux du meilleur adversaire.
+        
+        Le territoire est suivi par une RegionAnalysis mise à jour à chaque
+        placement ou annulation de la recherche, sans remplissage complet par feuille.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+        
+        Returns:
+            float: La valeur de la position du point de vue du bot.
+        """
+        if self._regions is None or self._regions.board is not board:
+            self._regions = RegionAnalysis(board, self.turn_order)
+        territory = self._regions.exclusive_counts()
+        values = {color: board.squares_placed[color] + EXPERT_CORNER_WEIGHT * board.corner_count(color)
+                  + EXPERT_REGION_WEIGHT * territory[color]
+                  for color in self.turn_order}
+        mine = values.pop(self.color)
+        return mine - max(values.values(), default=0)
+
+    def _play_mcts_move(self, board):
+        """
+        Stratégie Monte Carlo : arbre UCT sur l'ordre des tours, chaque couleur maximisant ses gains.
+        
+        Chaque itération descend l'arbre, développe un coup puis termine la partie au
+        hasard avec Board.sample_move ; les coups sont posés puis retirés du plateau.
+        Le sous-arbre du coup joué est conservé pour le tour suivant.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+        
+        Returns:
+            bool: True si un mouvement a été effectué, sinon False.
+        """
+        if not self.remaining_pieces or not board.has_any_move(self.color, self.remaining_pieces):
+            print("No available moves")
+            return False
+
+        hands = self._infer_hands(board)
+        start = time.perf_counter()
+        if self.workers > 1:
+            root, playouts = self._parallel_mcts_search(board, hands)
+        else:
+            root = self._reuse_mcts_root(board)
+            if root is None:
+                root = _MCTSNode(None, None, self.turn_order.index(self.color))
+            playouts = self._run_mcts(board, hands, root, start + self.time_budget)
+        elapsed = time.perf_counter() - start
+        self.search_stats = {
+            "playouts": playouts,
+            "seconds": elapsed,
+            "playouts_per_second": playouts / elapsed if elapsed > 0 else 0.0,
+        }
+        print(f"MCTS: {playouts} playouts in {elapsed:.2f}s "
+              f"({self.search_stats['playouts_per_second']:.0f} playouts/s)")
+
+        best = max(root.children, key=lambda child: child.visits)
+        if best.move is None:
+            return False
+        piece_id, orientation_id, x, y = best.move
+        print(f"Placing piece {piece_id} at ({y}, {x})")
+        self._make_move(board, ORIENTATIONS[piece_id][orientation_id], (x, y))
+        if self.workers == 1:
+            best.parent = None
+            self._mcts_root = best
+            self._mcts_record = board.history[-1]
+        return True
+
+    def _run_mcts(self, board, hands, root, deadline):
+        """
+        Enchaîne les itérations MCTS jusqu'au nombre de parties demandé ou à l'échéance,
+        avec au moins une itération pour que la racine ait un coup à jouer.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+            hands (Dict[int, set]): Les pièces restantes de chaque couleur.
+            root (_MCTSNode): La racine de l'arbre.
+            deadline (float): L'instant (time.perf_counter) où la recherche doit s'arrêter.
+        
+        Returns:
+            int: Le nombre de parties simulées.
+        """
+        playouts = 0
+        while not playouts or (playouts < self.playouts if self.playouts else time.perf_counter() < deadline):
+            self._mcts_iteration(board, hands, root)
+            playouts += 1
+        return playouts
+
+    def _parallel_mcts_search(self, board, hands):
+        """
+        Parallélisation à la racine : un arbre indépendant par processus, dont les
+        statistiques des coups de la racine sont additionnées.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+            hands (Dict[int, set]): Les pièces restantes de chaque couleur.
+        
+        Returns:
+            Tuple[_MCTSNode, int]: La racine fusionnée et le nombre total de parties simulées.
+        """
+        jobs = []
+        for index in range(self.workers):
+            playouts = None
+            if self.playouts:
+                playouts = self.playouts // self.workers + (index < self.playouts % self.workers)
+                if not playouts:
+                    continue
+            jobs.append((playouts, None))
+        root = _MCTSNode(None, None, self.turn_order.index(self.color))
+        children = {}
+        total = 0
+        for done, stats in self._submit_searches(board, hands, jobs):
+            total += done
+            for move, visits, reward in stats:
+                child = children.get(move)
+                if child is None:
+                    child = children[move] = _MCTSNode(move, self.color, (root.to_move + 1) % len(self.turn_order))
+                    root.children.append(child)
+                child.visits += visits
+                child.reward += reward
+        root.visits = total
+        return root, total
+
+    def _reuse_mcts_root(self, board):
+        """
+        Retrouve dans l'arbre du tour précédent le nœud de la position actuelle.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+        
+        Returns:
+            _MCTSNode: Le nœud à réutiliser comme racine, ou None s'il faut repartir de zéro.
+        """
+        node, record = self._mcts_root, self._mcts_record
+        self._mcts_root = self._mcts_record = None
+        if node is None:
+            return None
+        for index in range(len(board.history) - 1, -1, -1):
+            if board.history[index] is record:
+                break
+        else:
+            return None
+
+        for played in board.history[index + 1:]:
+            move = (played.piece.piece_id, getattr(played.piece, 'orientation_id', None), played.x, played.y)
+            # Colors that were blocked in between passed
+            while node is not None and self.turn_order[node.to_move] != played.color:
+                node = next((child for child in node.children if child.move is None), None)
+            node = next((child for child in node.children if child.move == move), None) if node else None
+            if node is None:
+                return None
+        while node is not None and self.turn_order[node.to_move] != self.color:
+            node = next((child for child in node.children if child.move is None), None)
+        if node is None:
+            return None
+        node.parent = None
+        return node
+
+    def _mcts_iteration(self, board, hands, root):
+        """
+        Effectue une itération : sélection, développement, partie simulée et rétropropagation.
+        
+        Args:
+            board (Board): Le plateau de jeu, rendu dans son état initial.
+            hands (Dict[int, set]): Les pièces restantes de chaque couleur, rendues intactes.
+            root (_MCTSNode): La racine de l'arbre.
+        """
+        played = []
+        try:
+            node = root
+            while node.untried is not None and not node.untried and node.children:
+                node = node.select_child()
+                self._apply_move(board, hands, node.mover, node.move, played)
+
+            if node.untried is None:
+                node.untried = self._tree_moves(board, hands, node)
+            if node.untried:
+                move = node.untried.pop()
+                color = self.turn_order[node.to_move]
+                passes = node.passes + 1 if move is None else 0
+                child = _MCTSNode(move, color, (node.to_move + 1) % len(self.turn_order), passes, node)
+                node.children.append(child)
+                node = child
+                self._apply_move(board, hands, color, move, played)
+
+            rewards = self._playout(board, hands, node, played)
+        finally:
+            for color, piece_id in reversed(played):
+                hands[color].add(piece_id)
+                board.undo()
+
+        while node is not None:
+            node.visits += 1
+            if node.mover is not None:
+                node.reward += rewards[node.mover]
+            node = node.parent
+
+    def _tree_moves(self, board, hands, node):
+        """
+        Génère les coups à développer depuis un nœud : les meilleurs selon l'heuristique.
+        
+        Args:
+            board (Board): Le plateau dans l'état du nœud.
+            hands (Dict[int, set]): Les pièces restantes de chaque couleur.
+            node (_MCTSNode): Le nœud à développer.
+        
+        Returns:
+            list: Les coups, le plus prometteur en dernier ; [None] si la couleur doit passer,
+            [] si la partie est finie.
+        """
+        if node.passes >= len(self.turn_order):
+            return []
+        color = self.turn_order[node.to_move]
+        moves = self._ordered_moves(board, color, hands[color])[:MCTS_WIDTH]
+        moves.reverse()
+        return moves or [None]
+
+    def _apply_move(self, board, hands, color, move, played):
+        """
+        Pose un coup de la recherche sur le plateau et le note pour l'annuler ensuite.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+            hands (Dict[int, set]): Les pièces restantes de chaque couleur.
+            color (int): La couleur qui joue.
+            move (Tuple[int, int, int, int]): Le coup, None pour un passe.
+            played (list): Les (couleur, pièce) posées, à annuler dans l'ordre inverse.
+        """
+        if move is None:
+            return
+        piece_id, orientation_id, x, y = move
+        board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+        hands[color].remove(piece_id)
+        played.append((color, piece_id))
+
+    def _playout(self, board, hands, node, played):
+        """
+        Termine la partie au hasard depuis un nœud et répartit la victoire entre les couleurs.
+        
+        Args:
+            board (Board): Le plateau dans l'état du nœud.
+            hands (Dict[int, set]): Les pièces restantes de chaque couleur.
+            node (_MCTSNode): Le nœud de départ.
+            played (list): Les (couleur, pièce) posées, complétées par la partie simulée.
+        
+        Returns:
+            Dict[int, float]: Le gain de chaque couleur : 1 partagé entre les meilleurs scores.
+        """
+        index, passes = node.to_move, node.passes
+        dead = {color: set() for color in self.turn_order}
+        while passes < len(self.turn_order):
+            color = self.turn_order[index]
+            move = board.sample_move(color, hands[color], rng=self.rng, dead=dead[color])
+            if move is None:
+                passes += 1
+            else:
+                self._apply_move(board, hands, color, move, played)
+                passes = 0
+            index = (index + 1) % len(self.turn_order)
+
+        scores = {color: board.squares_placed[color] for color in self.turn_order}
+        best = max(scores.values())
+        winners = [color for color, score in scores.items() if score == best]
+        return {color: (1.0 / len(winners) if color in winners else 0.0) for color in scores}
+
+    def _evaluate_moves(self, board, moves, center_x, center_y,
+                        CENTER_WEIGHT=2.0, SIZE_WEIGHT=1.0, TERRITORY_WEIGHT=1.5, color=None):
+        """
+        Évalue d'un coup tous les mouvements candidats, sans copier la grille.
+        
+        Les scores sont identiques à ceux de _evaluate_move : les cases vides de la
+        fenêtre autour de la pièce sont comptées par masques de bits, à partir des cases
+        en diagonale de la couleur calculées une seule fois pour le tour.
+        
+        Args:
+            board (Board): Le plateau de jeu.
+            moves (List[Tuple[int, int, int, int]]): Les coups (piece_id, orientation_id, x, y).
+            center_x (int): La coordonnée x du centre du plateau.
+            center_y (int): La coordonnée y du centre du plateau.
+            CENTER_WEIGHT (float): Poids du facteur de distance au centre.
+            SIZE_WEIGHT (float): Poids du facteur de taille de la pièce.
+            TERRITORY_WEIGHT (float): Poids du facteur de contrôle du territoire.
+            color (int, optional): La couleur qui joue les coups. Par défaut, celle du bot.
+        
+        Returns:
+            List[float]: Le score de chaque coup, dans l'ordre de moves.
+        """
+        color = self.color if color is None else color
+        size = board.size
+        stride = size + 2
+        empty, own = _padded_masks(board, color)
+        own_diagonal = (own << (stride + 1)) | (own << (stride - 1)) | (own >> (stride - 1)) | (own >> (stride + 1))
+
+        scores = []
+        for piece_id, orientation_id, x, y in moves:
+            window, diagonal = _orientation_masks(size, piece_id, orientation_id)
+            shift = x * stride + y
+            corners_created = ((window << shift) & empty & (own_diagonal | (diagonal << shift))).bit_count()
+            score = 0
+            score += ORIENTATIONS[piece_id][orientation_id].size * SIZE_WEIGHT
+            score += -((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5 * CENTER_WEIGHT
+            score += corners_created * TERRITORY_WEIGHT
+            scores.append(score)
+        return scores
+
     def _evaluate_move(self, board, piece, x, y, center_x, center_y, 
                     CENTER_WEIGHT=2.0, SIZE_WEIGHT=1.0, TERRITORY_WEIGHT=1.5):
         """
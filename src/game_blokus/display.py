@@ -57,6 +57,7 @@ def display_help():
     print("- Enter piece number (0-20) to select a piece")
     print("- 's' to save the current game")
     print("- 'l' to load a saved game")
+    print("- 'u' to undo the last move, 'r' to redo it")
     print("- 'h' to show this help")
     print("- 'q' to quit the game")
     
@@ -66,11 +67,16 @@ def display_help():
     print("3. Choose whether to flip the piece (y/n)")
     print("4. Confirm the placement after preview")
 
-def display_final_score(game):
-    """Display the final score for each player with colored output"""
-    print("\n🏆 Game Over! 🏆")
-    print("\nFinal Scores:")
-    
+def compute_scores(game) -> list:
+    """
+    Compute the final score of each player, best score first.
+
+    Args:
+        game (BlokusGame): The finished game.
+
+    Returns:
+        list: One dict per player with 'color', 'remaining', 'placed' and 'score'.
+    """
     scores = []
     for player in game.players:
         # Count remaining squares
@@ -90,6 +96,14 @@ def display_final_score(game):
 
     # Sort by score in descending order
     scores.sort(key=lambda x: x['score'], reverse=True)
+    return scores
+
+def display_final_score(game):
+    """Display the final score for each player with colored output"""
+    print("\n🏆 Game Over! 🏆")
+    print("\nFinal Scores:")
+    
+    scores = compute_scores(game)
 
     print("\n" + "═" * 40)
     print("🏆  Final Score  🏆")
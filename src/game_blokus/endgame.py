@@ -0,0 +1,209 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from .board import ZOBRIST_PIECES, Board, hand_key
+from .piece import ORIENTATIONS
+
+# Nombre total de coups légaux (toutes couleurs confondues) sous lequel la fin de partie est résolue
+ENDGAME_THRESHOLD = 24
+# Nombre maximal de positions explorées par résolution ; au-delà, le bot revient à sa stratégie
+ENDGAME_MAX_NODES = 20000
+# Nombre maximal de positions mémorisées ; la table est vidée quand elle l'atteint
+ENDGAME_TABLE_SIZE = 200000
+
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+
+class _NodeLimit(Exception):
+    """Levée quand la résolution dépasse son nombre maximal de positions."""
+
+
+class EndgameSolver:
+    """
+    Résolution exacte des fins de partie par recherche alpha-bêta exhaustive.
+
+    Comme le niveau 'expert', la recherche est paranoïaque : les autres couleurs
+    jouent ensemble contre le bot. Une position finale vaut l'écart entre le score
+    du bot et le meilleur score adverse, calculés comme display_final_score
+    (cases posées moins cases restantes). Les positions déjà résolues sont
+    mémorisées par clé de Zobrist du plateau et des mains, et conservées d'un
+    coup à l'autre jusqu'à ce que la table atteigne max_entries.
+
+    Attributs:
+        color (int): La couleur du bot.
+        turn_order (List[int]): Les couleurs en jeu, dans l'ordre des tours.
+        max_nodes (int): Le nombre maximal de positions explorées par résolution.
+        max_entries (int): Le nombre maximal de positions mémorisées dans table.
+        table (dict): Les valeurs mémorisées par (clé de la position, couleur qui joue), avec leur type de borne.
+        nodes (int): Le nombre de positions explorées lors de la dernière résolution.
+    """
+    def __init__(self, color: int, turn_order: List[int], max_nodes: int = ENDGAME_MAX_NODES,
+                 max_entries: int = ENDGAME_TABLE_SIZE):
+        self.color = color
+        self.turn_order = list(turn_order)
+        self.max_nodes = max_nodes
+        self.max_entries = max_entries
+        self.table: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        self.nodes = 0
+        self._hands_key = 0
+
+    def count_moves(self, board: Board, hands: Dict[int, Set[int]], limit: int) -> int:
+        """
+        Compte les coups légaux de toutes les couleurs, en s'arrêtant dès que limit est dépassé.
+
+        Args:
+            board (Board): Le plateau de jeu.
+            hands (Dict[int, Set[int]]): Les pièces restantes de chaque couleur.
+            limit (int): Le seuil au-delà duquel le compte s'arrête.
+
+        Returns:
+            int: Le nombre de coups légaux, ou une valeur supérieure à limit.
+        """
+        # The bot's own moves first: they are cached for its regular search anyway
+        order = [self.color] + [color for color in self.turn_order if color != self.color]
+        total = 0
+        for color in order:
+            total += len(board.legal_moves(color, hands[color]))
+            if total > limit:
+                break
+        return total
+
+    def solve(self, board: Board, hands: Dict[int, Set[int]]) -> Optional[Tuple[Tuple[int, int, int, int], int]]:
+        """
+        Cherche le coup du bot qui garantit le meilleur écart de score final.
+
+        Args:
+            board (Board): Le plateau de jeu ; il est laissé inchangé.
+            hands (Dict[int, Set[int]]): Les pièces restantes de chaque couleur ; laissées inchangées.
+
+        Returns:
+            Optional[Tuple[Tuple[int, int, int, int], int]]: Le coup (piece_id, orientation_id, x, y)
+            et l'écart de score final obtenu, ou None si le bot ne peut pas jouer ou si la
+            résolution dépasse max_nodes.
+        """
+        self.nodes = 0
+        self._hands_key = 0
+        for color in self.turn_order:
+            self._hands_key ^= hand_key(color, hands[color])
+        index = self.turn_order.index(self.color)
+        next_index = (index + 1) % len(self.turn_order)
+        moves = {color: board.legal_moves(color, hands[color]) for color in self.turn_order}
+        if not moves[self.color]:
+            return None
+        best_move, alpha = None, float('-inf')
+        try:
+            for move in self._ordered(moves[self.color]):
+                value = self._search_move(board, hands, moves, move, self.color, next_index,
+                                          alpha, float('inf'))
+                if value > alpha:
+                    best_move, alpha = move, value
+        except _NodeLimit:
+            return None
+        return best_move, alpha
+
+    def _ordered(self, moves: List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+        """
+        Trie les coups par taille de pièce décroissante, les plus prometteurs en fin de partie.
+        """
+        return sorted(moves, key=lambda move: ORIENTATIONS[move[0]][move[1]].size, reverse=True)
+
+    def _final_value(self, board: Board, hands: Dict[int, Set[int]]) -> int:
+        """
+        Calcule l'écart entre le score final du bot et le meilleur score adverse.
+
+        Returns:
+            int: L'écart de score, positif si le bot est devant.
+        """
+        scores = {color: board.squares_placed[color] - sum(ORIENTATIONS[piece_id][0].size
+                                                           for piece_id in hands[color])
+                  for color in self.turn_order}
+        mine = scores.pop(self.color)
+        return mine - max(scores.values(), default=0)
+
+    def _search_move(self, board, hands, moves, move, color, next_index, alpha, beta):
+        """
+        Joue un coup, met à jour les coups de chaque couleur, résout la position obtenue
+        puis annule le coup.
+        """
+        piece_id, orientation_id, x, y = move
+        record = board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+        hands[color].remove(piece_id)
+        self._hands_key ^= ZOBRIST_PIECES[color][piece_id]
+        try:
+            child_moves = {other: board.update_moves(other_moves, other, hands[other], record)
+                           for other, other_moves in moves.items()}
+            return self._search(board, hands, child_moves, next_index, alpha, beta, 0)
+        finally:
+            self._hands_key ^= ZOBRIST_PIECES[color][piece_id]
+            hands[color].add(piece_id)
+            board.undo()
+
+    def _search(self, board, hands, moves, index, alpha, beta, passes):
+        """
+        Recherche alpha-bêta jusqu'à la fin de la partie, avec mémorisation des positions.
+
+        Args:
+            board (Board): Le plateau de jeu.
+            hands (Dict[int, Set[int]]): Les pièces restantes de chaque couleur.
+            moves (Dict[int, List[Tuple[int, int, int, int]]]): Les coups valides de chaque couleur.
+            index (int): La position dans turn_order de la couleur qui joue.
+            alpha (float): La borne inférieure courante.
+            beta (float): La borne supérieure courante.
+            passes (int): Le nombre de couleurs consécutives qui n'ont pas pu jouer.
+
+        Returns:
+            int: L'écart de score final du point de vue du bot.
+
+        Raises:
+            _NodeLimit: Si la résolution dépasse max_nodes.
+        """
+        if passes == len(self.turn_order):
+            return self._final_value(board, hands)
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            raise _NodeLimit()
+
+        # The same cells can be covered by different pieces, so the hands are part of the key
+        key = (board.zobrist ^ self._hands_key, index)
+        entry = self.table.get(key)
+        if entry is not None:
+            value, bound = entry
+            if bound == _EXACT:
+                return value
+            if bound == _LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        color = self.turn_order[index]
+        next_index = (index + 1) % len(self.turn_order)
+        if not moves[color]:
+            # A blocked color passes; the value does not depend on how many passed before
+            return self._search(board, hands, moves, next_index, alpha, beta, passes + 1)
+
+        original_alpha, original_beta = alpha, beta
+        if color == self.color:
+            value = float('-inf')
+            for move in self._ordered(moves[color]):
+                value = max(value, self._search_move(board, hands, moves, move, color, next_index, alpha, beta))
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    break
+        else:
+            value = float('inf')
+            for move in self._ordered(moves[color]):
+                value = min(value, self._search_move(board, hands, moves, move, color, next_index, alpha, beta))
+                beta = min(beta, value)
+                if alpha >= beta:
+                    break
+
+        if len(self.table) >= self.max_entries:
+            self.table.clear()
+        if value <= original_alpha:
+            self.table[key] = (value, _UPPER)
+        elif value >= original_beta:
+            self.table[key] = (value, _LOWER)
+        else:
+            self.table[key] = (value, _EXACT)
+        return value
@@ -0,0 +1,122 @@
+import asyncio
+import socket
+import struct
+from typing import Iterable, List, Optional
+
+# Every frame is a 4-byte big-endian payload length followed by the payload
+HEADER = struct.Struct('!I')
+# Larger frames are treated as a corrupt or hostile stream
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+class FrameError(ValueError):
+    """Raised when a stream announces a frame larger than MAX_FRAME_SIZE."""
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """
+    Prefix a payload with its length.
+
+    Args:
+        payload (bytes): The message bytes.
+
+    Returns:
+        bytes: The frame, ready to be written to a stream.
+    """
+    if len(payload) > MAX_FRAME_SIZE:
+        raise FrameError(f"Frame of {len(payload)} bytes exceeds {MAX_FRAME_SIZE}")
+    return HEADER.pack(len(payload)) + payload
+
+
+def encode_frames(payloads: Iterable[bytes]) -> bytes:
+    """
+    Concatenate several frames, so a batch of messages goes out in one write.
+
+    Args:
+        payloads (Iterable[bytes]): The message bytes, in order.
+
+    Returns:
+        bytes: The frames, back to back.
+    """
+    return b''.join(encode_frame(payload) for payload in payloads)
+
+
+class FrameReader:
+    """
+    Reassemble frames from arbitrarily split chunks of a byte stream.
+
+    A chunk may hold part of a frame, several frames, or the end of one frame
+    and the start of the next; incomplete data is kept until the rest arrives.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """
+        Add received bytes and return the frames they complete.
+
+        Args:
+            data (bytes): The bytes just received.
+
+        Returns:
+            List[bytes]: The complete payloads, in order (possibly none).
+
+        Raises:
+            FrameError: If a frame header announces more than MAX_FRAME_SIZE bytes.
+        """
+        self._buffer += data
+        payloads = []
+        start = 0
+        buffer = self._buffer
+        while len(buffer) - start >= HEADER.size:
+            (length,) = HEADER.unpack_from(buffer, start)
+            if length > MAX_FRAME_SIZE:
+                raise FrameError(f"Frame of {length} bytes exceeds {MAX_FRAME_SIZE}")
+            end = start + HEADER.size + length
+            if len(buffer) < end:
+                break
+            payloads.append(bytes(buffer[start + HEADER.size:end]))
+            start = end
+        if start:
+            del buffer[:start]
+        return payloads
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes not yet part of a complete frame."""
+        return len(self._buffer)
+
+
+def send_frames(sock: socket.socket, payloads: Iterable[bytes]) -> None:
+    """
+    Write one or more frames to a blocking socket with a single sendall.
+
+    Args:
+        sock (socket.socket): The connected socket.
+        payloads (Iterable[bytes]): The message bytes, in order.
+    """
+    sock.sendall(encode_frames(payloads))
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """
+    Read the next frame from an asyncio stream.
+
+    Args:
+        reader (asyncio.StreamReader): The stream.
+
+    Returns:
+        Optional[bytes]: The payload, or None once the peer has closed the stream.
+
+    Raises:
+        FrameError: If the frame header announces more than MAX_FRAME_SIZE bytes.
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+        (length,) = HEADER.unpack(header)
+        if length > MAX_FRAME_SIZE:
+            raise FrameError(f"Frame of {length} bytes exceeds {MAX_FRAME_SIZE}")
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
@@ -1,6 +1,8 @@
+import random
+import time
 from typing import List, Tuple, Optional
-from .board import Board
-from .piece import Piece
+from .board import BitBoard, ZOBRIST_TURN, hand_key
+from .piece import Piece, get_orientation
 from .bot_player import BotPlayer
 from .spectactor import start_spectator
 from .player import Player
@@ -11,18 +13,26 @@ from .display import (
 )
 from .tutorial import start_tutorial
 from .save_load import save_game, load_game
-from .utils import clear_screen
+from .utils import clear_screen, new_seed
 from .network_client import BlokusClient
 
+# Attempts to get back into an online game after losing the connection, and the
+# delay before the first retry (doubled at each retry)
+RECONNECT_ATTEMPTS = 3
+RECONNECT_DELAY = 0.5
+
 class BlokusGame:
-    def __init__(self, num_players: int = 4, ai_levels: List[str] = None):
+    def __init__(self, num_players: int = 4, ai_levels: List[str] = None, seed: int = None):
         """
         Initialise une nouvelle partie de Blokus.
         
         Args:
             num_players (int): Le nombre de joueurs. Par défaut, 4.
             ai_levels (List[str]): Les niveaux de difficulté des bots. Par défaut, None.
+            seed (int): La graine des générateurs aléatoires des bots, pour rejouer une
+                partie à l'identique. Par défaut, une graine tirée au hasard.
         """
+        self.seed = new_seed() if seed is None else seed
 
         self.network_client = None
         self.is_online = False
@@ -39,29 +49,48 @@ class BlokusGame:
             num_players (int): Number of players for the game.
             ai_levels (List[str]): List of AI levels for bot players
         """
-        self.board = Board()
+        self.board = BitBoard()
         self.players = []
         self.current_player = 0
+        self.move_history = []  # (player index, placement record) of each move played
+        self.redo_stack = []  # Undone moves, most recent last
+        self._game_over_cache = (None, False)  # (position key without side to move, result)
         ai_levels = ai_levels or []
         for i in range(num_players):
             color = i + 1 # Assign a unique color to each player
             if i < len(ai_levels):
-                self.players.append(BotPlayer(ai_levels[i], color))
+                self.players.append(BotPlayer(ai_levels[i], color, turn_order=range(1, num_players + 1)))
             else:
                 self.players.append(Player(color))
+        self.seed_rngs()
+
+    def seed_rngs(self) -> None:
+        """
+        Re-create the random generators of the game and of its bots from the game seed.
 
-    def reset_game(self, num_players: int = None, ai_levels: List[str] = None) -> None:
+        Called when a game starts and when one is loaded, so that a given seed
+        always continues the same way from the same position.
+        """
+        # Each bot draws from its own stream, spawned from the game seed
+        self.rng = random.Random(self.seed)
+        for player in self.players:
+            if isinstance(player, BotPlayer):
+                player.rng = random.Random(self.rng.getrandbits(64))
+
+    def reset_game(self, num_players: int = None, ai_levels: List[str] = None, seed: int = None) -> None:
         """
         Reset the game state for a new game.
         
         Args:
             num_players (int): Number of players for the game.
             ai_levels (List[str]): List of AI levels for bot players
+            seed (int): Seed of the new game, a fresh random one by default
         Returns:
             None
         """
         if num_players is None:
             num_players = len(self.players)
+        self.seed = new_seed() if seed is None else seed
         self._initialize_game(num_players, ai_levels)
 
     def start_game(self) -> None:
@@ -110,12 +139,12 @@ class BlokusGame:
         Returns:
             None
         """
-        valid_levels = ["easy", "medium", "hard"]
+        valid_levels = ["easy", "medium", "hard", "expert", "mcts"]
         ai_level = ""
         while ai_level not in valid_levels:
-            ai_level = input("Choose AI level (easy/medium/hard): ").lower()
+            ai_level = input("Choose AI level (easy/medium/hard/expert/mcts): ").lower()
             if ai_level not in valid_levels:
-                print("Invalid choice. Please choose either 'easy', 'medium', or 'hard'.")
+                print("Invalid choice. Please choose either 'easy', 'medium', 'hard', 'expert' or 'mcts'.")
         self.reset_game(num_players=2, ai_levels=[ai_level])
 
     def _setup_local_multiplayer(self) -> None:
@@ -252,7 +281,10 @@ class BlokusGame:
         """
         if isinstance(player, BotPlayer):
             print(f"\n{COLORS[player.color]}AI is thinking...{COLORS[0]}")
+            history_size = len(self.board.history)
             player.play(self.board)
+            if len(self.board.history) > history_size:
+                self._record_move(self.current_player, self.board.history[-1])
             self.current_player = (self.current_player + 1) % len(self.players)
             input("\nPress Enter to continue...")
             return True
@@ -295,6 +327,7 @@ class BlokusGame:
         print(f"{BORDER_CHARS['vertical']} • Piece number to place it".ljust(39) + BORDER_CHARS['vertical'])
         print(f"{BORDER_CHARS['vertical']} • 's' to save".ljust(39) + BORDER_CHARS['vertical'])
         print(f"{BORDER_CHARS['vertical']} • 'l' to load".ljust(39) + BORDER_CHARS['vertical'])
+        print(f"{BORDER_CHARS['vertical']} • 'u' to undo, 'r' to redo".ljust(39) + BORDER_CHARS['vertical'])
         print(f"{BORDER_CHARS['vertical']} • 'q' to quit".ljust(39) + BORDER_CHARS['vertical'])
         print(BORDER_CHARS['horizontal'] * 40)
 
@@ -335,7 +368,15 @@ class BlokusGame:
             save_game(self)
             return True
         elif command == 'l':
-            load_game(self)
+            if load_game(self):
+                self.move_history.clear()
+                self.redo_stack.clear()
+            return True
+        elif command == 'u':
+            self._handle_undo()
+            return True
+        elif command == 'r':
+            self._handle_redo()
             return True
         elif command == 'q':
             if input("Are you sure you want to quit? (y/n): ").lower() == 'y':
@@ -416,10 +457,7 @@ class BlokusGame:
             bool: True if the placement was not successful, False otherwise
         """
         # Apply transformations
-        if flip:
-            piece = piece.flip()
-        for _ in range(rotation):
-            piece = piece.rotate()
+        piece = get_orientation(piece_id, rotation, flip)
 
         # Show preview
         preview = self.board.preview_move(piece, x, y, player.color)
@@ -464,13 +502,104 @@ class BlokusGame:
                 'color': player.color
             })
         else:
-            self.board.place_piece(piece, x, y, player.color)
+            record = self.board.place_piece(piece, x, y, player.color)
             player.remaining_pieces.remove(piece_id)
+            self._record_move(self.current_player, record)
             self.current_player = (self.current_player + 1) % len(self.players)
             print(f"\n{COLORS[player.color]}Piece placed successfully!{COLORS[0]}")
         
         return True
 
+    def _record_move(self, player_index: int, record) -> None:
+        """
+        Push a move on the undo stack; a new move invalidates the redo stack
+        
+        Args:
+            player_index (int): Index of the player who moved
+            record (PlacementRecord): The record returned by Board.place_piece
+        """
+        self.move_history.append((player_index, record))
+        self.redo_stack.clear()
+
+    def undo_move(self) -> bool:
+        """
+        Undo the last move and give the turn back to the player who made it
+        
+        Returns:
+            bool: True if a move was undone, False if there was nothing to undo
+        """
+        if not self.move_history:
+            return False
+        player_index, record = self.move_history.pop()
+        self.board.undo(record)
+        self.players[player_index].remaining_pieces.add(record.piece.piece_id)
+        self.current_player = player_index
+        self.redo_stack.append((player_index, record))
+        return True
+
+    def redo_move(self) -> bool:
+        """
+        Replay the last undone move
+        
+        Returns:
+            bool: True if a move was replayed, False if there was nothing to redo
+        """
+        if not self.redo_stack:
+            return False
+        player_index, record = self.redo_stack.pop()
+        new_record = self.board.place_piece(record.piece, record.x, record.y, record.color)
+        self.players[player_index].remaining_pieces.remove(record.piece.piece_id)
+        self.move_history.append((player_index, new_record))
+        self.current_player = (player_index + 1) % len(self.players)
+        return True
+
+    def _handle_undo(self) -> None:
+        """
+        Handle the undo command: bot moves are undone too, until a human move is taken back
+        """
+        if self.is_online:
+            print("Undo is not available in online games!")
+        elif not self.undo_move():
+            print("Nothing to undo!")
+        else:
+            while (isinstance(self.players[self.current_player], BotPlayer)
+                   and self.undo_move()):
+                pass
+            print(f"\nMove undone, back to Player {self.players[self.current_player].color}.")
+        input("Press Enter to continue...")
+
+    def _handle_redo(self) -> None:
+        """
+        Handle the redo command: replays undone moves up to the next human move
+        """
+        if self.is_online:
+            print("Redo is not available in online games!")
+        elif not self.redo_move():
+            print("Nothing to redo!")
+        else:
+            while (self.redo_stack
+                   and isinstance(self.players[self.redo_stack[-1][0]], BotPlayer)
+                   and self.redo_move()):
+                pass
+            print(f"\nMove redone, Player {self.players[self.current_player].color} to play.")
+        input("Press Enter to continue...")
+
+    def position_key(self, include_turn: bool = True) -> int:
+        """
+        Zobrist key of the whole position: board cells, every hand and side to move
+        
+        Args:
+            include_turn (bool): Whether the side to move is part of the key
+        Returns:
+            int: The position key
+        """
+        key = self.board.zobrist
+        for player in self.players:
+            key ^= hand_key(player.color, player.remaining_pieces)
+        if include_turn:
+            key ^= ZOBRIST_TURN[self.current_player % len(ZOBRIST_TURN)]
+        return key
+
     def _check_game_over(self) -> bool:
         """
         Check if the game is over
@@ -478,18 +607,29 @@ class BlokusGame:
         Returns:
             bool: True if the game is over, False otherwise
             """
+        # The answer only depends on the board and the hands
+        key = self.position_key(include_turn=False)
+        if self._game_over_cache[0] == key:
+            return self._game_over_cache[1]
+        game_over = self._compute_game_over()
+        self._game_over_cache = (key, game_over)
+        return game_over
+
+    def _compute_game_over(self) -> bool:
+        """
+        Check whether no player can place any piece anymore
+        
+        Returns:
+            bool: True if the game is over, False otherwise
+        """
         # First check if all players have no pieces left
         if all(len(p.remaining_pieces) == 0 for p in self.players):
             return True
             
         # Then check if any player with remaining pieces can make a valid move
         for p in self.players:
-            if p.remaining_pieces:
-                for piece_id in p.remaining_pieces:
-                    piece = p.pieces[piece_id]
-                    for variant in piece.get_all_variations():
-                        if self.board.find_valid_moves(variant, p.color):
-                            return False
+            if self.board.has_any_move(p.color, p.remaining_pieces):
+                return False
                             
         # If no player can make a valid move, the game is over
         return True
@@ -719,6 +859,7 @@ class BlokusGame:
             return
         
         self.network_client.set_callback(self.handle_network_message)
+        self.network_client.set_disconnect_callback(self._handle_connection_lost)
         self.is_online = True
         print("Waiting for other players to join...")
         self.reset_game(num_players)
@@ -731,11 +872,17 @@ class BlokusGame:
             message (dict): The message received from the server
         """
         message_handlers = {
+            # The client itself switches to the codec the welcome names
+            'welcome': lambda message: None,
             'game_start': self._handle_game_start,
             'waiting': self._handle_waiting,
             'move': self._handle_move,
             'error': self._handle_error,
-            'player_disconnected': self._handle_player_disconnected
+            'player_disconnected': self._handle_player_disconnected,
+            'player_reconnected': self._handle_player_reconnected,
+            'resume': self._handle_resume,
+            'snapshot': self._handle_snapshot,
+            'game_over': self._handle_game_over
         }
         
         handler = message_handlers.get(message['type'])
@@ -755,6 +902,31 @@ class BlokusGame:
         self.total_players = message['total_players']
         print(f"You are Player {self.player_number + 1} of {self.total_players}")
 
+    def _handle_resume(self, message: dict):
+        """
+        Handle resume message from server, sent back after a reconnection;
+        the missed moves or a snapshot follow it
+        
+        Args:
+            message (dict): The message received from the server
+        """
+        print("\nReconnected to the game!")
+        self.player_number = message['player_number']
+        self.current_player = message['current_player']
+        self.total_players = message['total_players']
+
+    def _handle_snapshot(self, message: dict):
+        """
+        Handle snapshot message from server: replace the board and the remaining
+        pieces when too many moves were missed to replay them
+        
+        Args:
+            message (dict): The message received from the server
+        """
+        self.board = type(self.board).from_snapshot(message['board'])
+        for player in self.players:
+            player.remaining_pieces = set(message['hands'].get(player.color, ()))
+
     def _handle_waiting(self, message: dict):
         """
         Handle waiting message from server
@@ -765,13 +937,14 @@ class BlokusGame:
         print(f"\n{message['message']}")
 
     def _handle_move(self, message: dict):
-        """Handle move message from server
+        """Handle move message from server; the server checks every move against
+        its own board before broadcasting it, so it is applied as is
         
         Args:
             message (dict): The message received from the server
         """
         piece = self._prepare_piece(message)
-        if piece and self._is_valid_move(piece, message):
+        if piece:
             self._apply_move(piece, message)
 
     def _prepare_piece(self, message: dict) -> Optional[Piece]:
@@ -782,15 +955,7 @@ class BlokusGame:
         Returns:
             Optional[Piece]: The prepared piece or None
         """
-        player = self.players[self.current_player]
-        piece = player.pieces[message['piece_id']]
-        
-        if message['flip']:
-            piece = piece.flip()
-        for _ in range(message['rotation']):
-            piece = piece.rotate()
-        
-        return piece
+        return get_orientation(message['piece_id'], message['rotation'], message['flip'])
 
     def _is_valid_move(self, piece: Piece, message: dict) -> bool:
         """Check if the move is valid
@@ -811,7 +976,7 @@ class BlokusGame:
             piece (Piece): The piece to place
             message (dict): The message received from the server
         """
-        player = self.players[self.current_player]
+        player = self.players[message['color'] - 1]
         self.board.place_piece(piece, message['x'], message['y'], message['color'])
         player.remaining_pieces.remove(message['piece_id'])
         self.current_player = message['current_player']
@@ -832,5 +997,45 @@ class BlokusGame:
         Args:
             message (dict): The message received from the server
         """
-        print("\nPlayer disconnected from the game!")
+        print(f"\nPlayer {message['player_number'] + 1} disconnected from the game!")
         # Handle disconnection (maybe end game or wait for reconnection)
+
+    def _handle_player_reconnected(self, message: dict):
+        """Handle player reconnection message from server
+        
+        Args:
+            message (dict): The message received from the server
+        """
+        print(f"\nPlayer {message['player_number'] + 1} reconnected to the game!")
+
+    def _handle_game_over(self, message: dict):
+        """Handle game over message from server, which carries the final scores
+        it computed on its own board, best score first
+        
+        Args:
+            message (dict): The message received from the server
+        """
+        self.game_over = True
+        print("\n🎮 Game Over! 🎮")
+        for rank, score in enumerate(message['scores'], 1):
+            print(f"{rank}. {COLORS[score['color']]}Player {score['color']}{COLORS[0]}: {score['score']} "
+                  f"({score['placed']} squares placed, {score['remaining']} remaining)")
+
+    def _handle_connection_lost(self) -> bool:
+        """
+        Get back into the online game after the connection to the server dropped;
+        the server resends what was missed since the last move received
+
+        Returns:
+            bool: True if the game was rejoined, False otherwise
+        """
+        print("\nConnection to the server lost, reconnecting...")
+        delay = RECONNECT_DELAY
+        for attempt in range(RECONNECT_ATTEMPTS):
+            if attempt:
+                time.sleep(delay)
+                delay *= 2
+            if self.network_client.reconnect():
+                return True
+        print("Could not reconnect to the server!")
+        return False
@@ -1,9 +1,12 @@
 import socket
-import pickle
 import threading
-from typing import Callable, Optional
+import traceback
+from typing import Callable, List, Optional
 import uuid
 
+from .framing import FrameError, FrameReader, send_frames
+from .protocol import CODECS, PROTOCOL_VERSION, ProtocolError, decode_message, encode_message
+
 class BlokusClient:
     def __init__(self, host='10.77.255.43', port=6000):
         """
@@ -15,7 +18,15 @@ class BlokusClient:
         self.game_id: Optional[str] = None
         self.player_id: Optional[str] = None
         self.callback: Optional[Callable] = None
+        # Called from the receiving thread when the server connection drops unexpectedly
+        self.disconnect_callback: Optional[Callable] = None
         self.connected = False
+        # Control message codec, JSON until the server's welcome names the negotiated one
+        self.codec = 'json'
+        # Sequence number of the last move received, to resume from after a reconnection
+        self.last_seq = 0
+        # Secret from the server's welcome that gives the seat back after a reconnection
+        self.resume_token: Optional[str] = None
         
     def connect(self, num_players: int = None, game_id: str = None) -> bool:
         """
@@ -25,27 +36,65 @@ class BlokusClient:
             num_players (int, optional): Number of players for the game. Defaults to None.
             game_id (str, optional): ID of the game to join or create. Defaults to None.
 
+        Returns:
+            bool: True if connection is successful, False otherwise.
+        """
+        # Generate unique IDs
+        self.player_id = str(uuid.uuid4())
+        # Use provided game_id or generate a new one
+        self.game_id = game_id or str(uuid.uuid4())
+        self.last_seq = 0
+        self.resume_token = None
+
+        # Send initialization data
+        init_data = {
+            'type': 'init',
+            'player_id': self.player_id,
+            'game_id': self.game_id,
+            'protocol': PROTOCOL_VERSION,
+            'codecs': list(CODECS),
+        }
+        if num_players is not None:  # Only include num_players when creating a new game
+            init_data['num_players'] = num_players
+        return self._open(init_data)
+
+    def reconnect(self) -> bool:
+        """
+        Reconnect to the current game after the connection was lost.
+
+        The server checks resume_token, gives the player its seat back, then sends
+        a `resume` message followed by the moves logged after last_seq, or by a
+        `snapshot` of the board and hands if too many moves were missed.
+
+        Returns:
+            bool: True if connection is successful, False otherwise.
+        """
+        self.close()
+        self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.codec = 'json'
+        return self._open({
+            'type': 'init',
+            'player_id': self.player_id,
+            'game_id': self.game_id,
+            'protocol': PROTOCOL_VERSION,
+            'codecs': list(CODECS),
+            'last_seq': self.last_seq,
+            'resume_token': self.resume_token,
+        })
+
+    def _open(self, init_data: dict) -> bool:
+        """
+        Connect the socket, send the init message and start listening.
+
+        Args:
+            init_data (dict): The init message.
+
         Returns:
             bool: True if connection is successful, False otherwise.
         """
         try:
             self.client_socket.connect((self.host, self.port))
             self.connected = True
-            
-            # Generate unique IDs
-            self.player_id = str(uuid.uuid4())
-            # Use provided game_id or generate a new one
-            self.game_id = game_id or str(uuid.uuid4())
-            
-            # Send initialization data
-            init_data = {
-                'type': 'init',
-                'player_id': self.player_id,
-                'game_id': self.game_id,
-            }
-            if num_players is not None:  # Only include num_players when creating a new game
-                init_data['num_players'] = num_players
-            
             self.send_message(init_data)
             
             # Start listening thread
@@ -90,26 +139,70 @@ class BlokusClient:
         Args:
             message (dict): Dictionary containing the message data.
         """
+        self.send_messages([message])
+
+    def send_messages(self, messages: List[dict]):
+        """
+        Send several messages to server in a single write.
+
+        Args:
+            messages (List[dict]): The messages, in order.
+        """
         try:
-            data = pickle.dumps(message)
-            self.client_socket.send(data)
+            send_frames(self.client_socket, [encode_message(message, self.codec) for message in messages])
         except Exception as e:
             print(f"Error sending message: {e}")
             self.connected = False
             
     def receive_messages(self):
-        """Continuously receive messages from server"""
-        while self.connected:
+        """
+        Continuously receive messages from server, reassembling split or merged frames.
+
+        Only a dropped connection calls the disconnect callback. A malformed message is
+        skipped, a corrupt stream is closed, and an exception raised by the message
+        callback is printed; none of them leads to a reconnection.
+        """
+        frames = FrameReader()
+        # After a reconnection, the thread of the old socket must not touch the new one's state
+        sock = self.client_socket
+        while self.connected and sock is self.client_socket:
             try:
-                data = self.client_socket.recv(4096)
-                if data:
-                    message = pickle.loads(data)
-                    if self.callback:
-                        self.callback(message)
-            except Exception as e:
-                print(f"Error receiving message: {e}")
-                self.connected = False
+                data = sock.recv(65536)
+                if not data:
+                    # Server closed the connection
+                    raise ConnectionError("Connection closed by server")
+            except OSError as e:
+                # Nothing to report once close() or reconnect() made this socket obsolete
+                if sock is self.client_socket and self.connected:
+                    print(f"Error receiving message: {e}")
+                    self.connected = False
+                    if self.disconnect_callback:
+                        self.disconnect_callback()
                 break
+            try:
+                payloads = frames.feed(data)
+            except FrameError as e:
+                # The frame boundaries are lost: the rest of the stream cannot be read
+                print(f"Closing corrupt connection: {e}")
+                self.close()
+                break
+            for payload in payloads:
+                try:
+                    message = decode_message(payload)
+                except ProtocolError as e:
+                    print(f"Ignoring invalid message: {e}")
+                    continue
+                if message.get('type') == 'welcome':
+                    self.codec = message['codec']
+                    self.resume_token = message.get('resume_token')
+                elif 'seq' in message and message.get('type') in ('move', 'snapshot'):
+                    self.last_seq = message['seq']
+                if self.callback:
+                    try:
+                        self.callback(message)
+                    except Exception:
+                        print(f"Error handling {message.get('type')} message:")
+                        traceback.print_exc()
                 
     def set_callback(self, callback: Callable):
         """
@@ -119,8 +212,22 @@ class BlokusClient:
             callback (Callable): Function to call when a message is received.
         """
         self.callback = callback
+
+    def set_disconnect_callback(self, callback: Callable):
+        """
+        Set callback function for an unexpected loss of the connection.
+
+        Args:
+            callback (Callable): Function called without arguments, typically to reconnect().
+        """
+        self.disconnect_callback = callback
         
     def close(self):
         """Close the connection"""
         self.connected = False
-        self.client_socket.close() 
+        try:
+            # Wakes up the receiving thread and lets the server see the connection end
+            self.client_socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # Never connected, or already closed
+        self.client_socket.close()
@@ -0,0 +1,284 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .board import Board
+from .piece import ORIENTATIONS, PIECE_DEFINITIONS
+
+# Bibliothèque livrée avec le jeu, construite par build_book
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.json")
+# Nombre de pièces posées par une couleur au-delà duquel la bibliothèque n'est plus consultée
+BOOK_MOVES = 3
+BOOK_VERSION = 1
+
+# Les huit symétries du plateau carré, appliquées à une case (ligne, colonne) ; m = taille - 1
+_SYMMETRIES = (
+    lambda r, c, m: (r, c),
+    lambda r, c, m: (c, m - r),
+    lambda r, c, m: (m - r, m - c),
+    lambda r, c, m: (m - c, r),
+    lambda r, c, m: (r, m - c),
+    lambda r, c, m: (c, r),
+    lambda r, c, m: (m - r, c),
+    lambda r, c, m: (m - c, m - r),
+)
+# Indice de la symétrie réciproque de chacune
+_INVERSE = (0, 3, 2, 1, 4, 5, 6, 7)
+
+# Orientation de chaque (pièce, ensemble de cases relatives), construite au premier besoin
+_ORIENTATION_BY_CELLS: Dict[Tuple[int, frozenset], int] = {}
+
+_DEFAULT_BOOK: Optional['OpeningBook'] = None
+
+
+def canonical_key(board: Board, color: int, turn_order: List[int]) -> Tuple[str, int]:
+    """
+    Calcule la clé canonique d'une position, commune à ses huit images par symétrie.
+
+    Les couleurs sont renumérotées selon leur rang après celle qui joue, si bien
+    qu'une même ouverture jouée par une autre couleur donne la même clé.
+
+    Args:
+        board (Board): Le plateau de jeu.
+        color (int): La couleur qui doit jouer.
+        turn_order (List[int]): Les couleurs en jeu, dans l'ordre des tours.
+
+    Returns:
+        Tuple[str, int]: L'empreinte de la position normalisée et l'indice de la
+        symétrie qui y mène depuis le plateau.
+    """
+    players = len(turn_order)
+    start = turn_order.index(color)
+    relative = {c: (turn_order.index(c) - start) % players for c in turn_order}
+    cells = [(r, c, relative[value]) for r, row in enumerate(board.grid)
+             for c, value in enumerate(row) if value]
+    m = board.size - 1
+    best, best_symmetry = None, 0
+    for index, symmetry in enumerate(_SYMMETRIES):
+        image = sorted(symmetry(r, c, m) + (rank,) for r, c, rank in cells)
+        if best is None or image < best:
+            best, best_symmetry = image, index
+    text = f"{board.size}/{players}/" + ";".join(f"{r},{c},{rank}" for r, c, rank in best)
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest(), best_symmetry
+
+
+def _move_cells(move: Tuple[int, int, int, int]) -> List[Tuple[int, int]]:
+    """
+    Retourne les cases couvertes par un coup (piece_id, orientation_id, x, y).
+    """
+    piece_id, orientation_id, x, y = move
+    return [(x + i, y + j) for i, j in ORIENTATIONS[piece_id][orientation_id].cells]
+
+
+def _cells_move(piece_id: int, cells: List[Tuple[int, int]]) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Retrouve le coup (piece_id, orientation_id, x, y) couvrant exactement des cases données.
+
+    Returns:
+        Optional[Tuple[int, int, int, int]]: Le coup, ou None si aucune orientation ne correspond.
+    """
+    if not _ORIENTATION_BY_CELLS:
+        for pid, orientations in ORIENTATIONS.items():
+            for orientation in orientations:
+                _ORIENTATION_BY_CELLS[(pid, frozenset(orientation.cells))] = orientation.orientation_id
+    x = min(r for r, _ in cells)
+    y = min(c for _, c in cells)
+    orientation_id = _ORIENTATION_BY_CELLS.get((piece_id, frozenset((r - x, c - y) for r, c in cells)))
+    if orientation_id is None:
+        return None
+    return piece_id, orientation_id, x, y
+
+
+class OpeningBook:
+    """
+    Bibliothèque d'ouvertures : le meilleur coup précalculé de positions de début de partie.
+
+    Attributs:
+        entries (Dict[str, list]): Pour chaque clé canonique, la pièce jouée et ses cases
+            dans le repère normalisé.
+        metadata (dict): La façon dont la bibliothèque a été construite (niveau, profondeur...).
+    """
+    def __init__(self, entries: Dict[str, list] = None, metadata: dict = None):
+        self.entries = entries if entries is not None else {}
+        self.metadata = metadata if metadata is not None else {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, board: Board, color: int, turn_order: List[int]) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Cherche le coup de la bibliothèque pour une position.
+
+        Args:
+            board (Board): Le plateau de jeu.
+            color (int): La couleur qui doit jouer.
+            turn_order (List[int]): Les couleurs en jeu, dans l'ordre des tours.
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: Le coup (piece_id, orientation_id, x, y)
+            ramené dans le repère du plateau, ou None si la position est inconnue.
+        """
+        if not self.entries:
+            return None
+        key, symmetry = canonical_key(board, color, turn_order)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        piece_id, cells = entry
+        inverse = _SYMMETRIES[_INVERSE[symmetry]]
+        m = board.size - 1
+        return _cells_move(piece_id, [inverse(r, c, m) for r, c in cells])
+
+    def add(self, board: Board, color: int, turn_order: List[int], move: Tuple[int, int, int, int]) -> str:
+        """
+        Enregistre le coup à jouer dans une position.
+
+        Args:
+            board (Board): Le plateau de jeu.
+            color (int): La couleur qui doit jouer.
+            turn_order (List[int]): Les couleurs en jeu, dans l'ordre des tours.
+            move (Tuple[int, int, int, int]): Le coup (piece_id, orientation_id, x, y).
+
+        Returns:
+            str: La clé canonique de la position.
+        """
+        key, symmetry = canonical_key(board, color, turn_order)
+        m = board.size - 1
+        cells = sorted(_SYMMETRIES[symmetry](r, c, m) for r, c in _move_cells(move))
+        self.entries[key] = [move[0], [list(cell) for cell in cells]]
+        return key
+
+    def save(self, path: str = DEFAULT_BOOK_PATH) -> None:
+        """
+        Écrit la bibliothèque au format JSON.
+
+        Args:
+            path (str): Le fichier de destination.
+        """
+        with open(path, 'w') as f:
+            json.dump({"version": BOOK_VERSION, "metadata": self.metadata, "entries": self.entries},
+                      f, separators=(',', ':'), sort_keys=True)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_BOOK_PATH) -> 'OpeningBook':
+        """
+        Lit une bibliothèque écrite par save.
+
+        Args:
+            path (str): Le fichier à lire.
+
+        Returns:
+            OpeningBook: La bibliothèque, vide si le fichier est absent ou d'une autre version.
+        """
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != BOOK_VERSION:
+            return cls()
+        return cls(data["entries"], data.get("metadata", {}))
+
+
+def get_default_book() -> OpeningBook:
+    """
+    Retourne la bibliothèque livrée avec le jeu, lue au premier appel seulement.
+
+    Returns:
+        OpeningBook: La bibliothèque par défaut.
+    """
+    global _DEFAULT_BOOK
+    if _DEFAULT_BOOK is None:
+        _DEFAULT_BOOK = OpeningBook.load(DEFAULT_BOOK_PATH)
+    return _DEFAULT_BOOK
+
+
+def build_book(plies: int = 8, width: int = 2, level: str = "expert", time_budget: float = 1.0,
+               num_players: int = 4, book: OpeningBook = None, verbose: bool = False) -> OpeningBook:
+    """
+    Construit une bibliothèque hors ligne en faisant jouer le niveau de bot le plus fort.
+
+    Depuis le plateau vide, chaque position reçoit le coup choisi par le bot ; l'arbre
+    est développé sur les `width` coups jugés les plus prometteurs par l'heuristique
+    des bots, ce qui couvre les écarts probables des adversaires. Les positions
+    symétriques ne sont calculées qu'une fois.
+
+    Args:
+        plies (int): La profondeur de l'arbre en demi-coups, un par couleur.
+        width (int): Le nombre de coups développés à chaque position.
+        level (str): Le niveau du bot qui choisit les coups.
+        time_budget (float): Le temps de réflexion par position, en secondes.
+        num_players (int): Le nombre de couleurs en jeu.
+        book (OpeningBook, optional): Une bibliothèque à compléter.
+        verbose (bool): Affiche l'avancement.
+
+    Returns:
+        OpeningBook: La bibliothèque construite.
+    """
+    from .bot_player import BotPlayer
+
+    book = book if book is not None else OpeningBook()
+    book.metadata.update({"level": level, "time_budget": time_budget, "plies": plies, "width": width})
+    turn_order = list(range(1, num_players + 1))
+    board = Board(backend="bitboard")
+    hands = {color: set(range(len(PIECE_DEFINITIONS))) for color in turn_order}
+    visited = set()
+
+    def expand(index: int, depth: int) -> None:
+        color = turn_order[index]
+        key, _ = canonical_key(board, color, turn_order)
+        if key in visited:
+            return
+        visited.add(key)
+        bot = BotPlayer(level, color, turn_order=turn_order, time_budget=time_budget, opening_book=False)
+        bot.remaining_pieces = set(hands[color])
+        moves = bot._ordered_moves(board, color, hands[color])
+        if not moves:
+            return
+        with contextlib.redirect_stdout(io.StringIO()):
+            bot.play(board)
+        bot.close()
+        record = board.undo()
+        best = (record.piece.piece_id, record.piece.orientation_id, record.x, record.y)
+        book.add(board, color, turn_order, best)
+        if verbose:
+            print(f"{len(book)} positions, depth {depth}")
+        if depth + 1 >= plies:
+            return
+        children = [best] + [move for move in moves if move != best][:width - 1]
+        for piece_id, orientation_id, x, y in children:
+            board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+            hands[color].remove(piece_id)
+            expand((index + 1) % num_players, depth + 1)
+            hands[color].add(piece_id)
+            board.undo()
+
+    expand(0, 0)
+    return book
+
+
+def main(argv: List[str] = None) -> None:
+    """Command line entry point: python -m game_blokus.opening_book."""
+    parser = argparse.ArgumentParser(description="Build the Blokus opening book offline.")
+    parser.add_argument('--plies', type=int, default=8, help="depth of the book, one ply per color")
+    parser.add_argument('--width', type=int, default=2, help="moves expanded at each position")
+    parser.add_argument('--level', default="expert", help="bot level choosing the book moves")
+    parser.add_argument('--time-budget', type=float, default=1.0, help="thinking time per position, in seconds")
+    parser.add_argument('--players', type=int, default=4, choices=[2, 3, 4], help="number of colors in play")
+    parser.add_argument('--output', default=DEFAULT_BOOK_PATH, help="book file, extended if it exists")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    book = build_book(args.plies, args.width, args.level, args.time_budget, args.players,
+                      book=OpeningBook.load(args.output), verbose=True)
+    book.save(args.output)
+    print(f"{len(book)} positions written to {args.output} in {time.perf_counter() - start:.0f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
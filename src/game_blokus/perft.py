@@ -0,0 +1,140 @@
+import argparse
+import sys
+import time
+from typing import Dict, List, Set, Tuple
+
+from .board import BACKENDS, Board
+from .piece import ORIENTATIONS, PIECE_DEFINITIONS
+
+# Leaf counts from the empty 20x20 board, four players with full hands, color 1 first.
+# Checked against both generators and the python and bitboard backends.
+REFERENCE_COUNTS = {1: 232, 2: 40368, 3: 4682688}
+
+GENERATORS = ("legal_moves", "find_all_moves")
+
+
+def initial_hands(turn_order: List[int]) -> Dict[int, Set[int]]:
+    """Return full hands for every color in play."""
+    return {color: set(range(len(PIECE_DEFINITIONS))) for color in turn_order}
+
+
+def _generate(board: Board, color: int, pieces: Set[int], generator: str) -> List[Tuple[int, int, int, int]]:
+    """Generate moves with the cached generator or the full corner-anchored scan."""
+    if generator == "legal_moves":
+        return board.legal_moves(color, pieces)
+    return board.find_all_moves(color, pieces)
+
+
+def perft(board: Board, hands: Dict[int, Set[int]], turn_order: List[int], index: int, depth: int,
+          passes: int = 0, generator: str = "legal_moves") -> int:
+    """
+    Count the move sequences of a given length from a position.
+
+    A stuck player has exactly one move, a pass, which also uses up one ply.
+    Once every player has passed in a row the game is over and the position
+    has no successors. Moves are made and unmade on the board itself.
+
+    Args:
+        board (Board): The position; it is left unchanged.
+        hands (Dict[int, Set[int]]): The remaining pieces of each color; left unchanged.
+        turn_order (List[int]): The colors in turn order.
+        index (int): The position in turn_order of the color to move.
+        depth (int): The number of plies to count.
+        passes (int): The number of consecutive passes leading to this position.
+        generator (str): "legal_moves" (cached, incremental) or "find_all_moves" (full scan).
+
+    Returns:
+        int: The number of leaf positions at exactly `depth` plies.
+    """
+    if depth == 0:
+        return 1
+    if passes == len(turn_order):
+        return 0
+    color = turn_order[index]
+    next_index = (index + 1) % len(turn_order)
+    moves = _generate(board, color, hands[color], generator)
+    if not moves:
+        return perft(board, hands, turn_order, next_index, depth - 1, passes + 1, generator)
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for piece_id, orientation_id, x, y in moves:
+        board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+        hands[color].remove(piece_id)
+        try:
+            nodes += perft(board, hands, turn_order, next_index, depth - 1, 0, generator)
+        finally:
+            hands[color].add(piece_id)
+            board.undo()
+    return nodes
+
+
+def divide(board: Board, hands: Dict[int, Set[int]], turn_order: List[int], index: int, depth: int,
+           generator: str = "legal_moves") -> Dict[Tuple[int, int, int, int], int]:
+    """
+    Split a perft count by root move, to locate a move generation discrepancy.
+
+    Args:
+        board (Board): The position; it is left unchanged.
+        hands (Dict[int, Set[int]]): The remaining pieces of each color; left unchanged.
+        turn_order (List[int]): The colors in turn order.
+        index (int): The position in turn_order of the color to move.
+        depth (int): The number of plies to count, root move included (at least 1).
+        generator (str): "legal_moves" or "find_all_moves".
+
+    Returns:
+        Dict[Tuple[int, int, int, int], int]: The leaf count below each root move
+        (piece_id, orientation_id, x, y); a pass is keyed None.
+    """
+    color = turn_order[index]
+    next_index = (index + 1) % len(turn_order)
+    moves = _generate(board, color, hands[color], generator)
+    if not moves:
+        return {None: perft(board, hands, turn_order, next_index, depth - 1, 1, generator)}
+    counts = {}
+    for move in moves:
+        piece_id, orientation_id, x, y = move
+        board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+        hands[color].remove(piece_id)
+        try:
+            counts[move] = perft(board, hands, turn_order, next_index, depth - 1, 0, generator)
+        finally:
+            hands[color].add(piece_id)
+            board.undo()
+    return counts
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point: python -m game_blokus.perft."""
+    parser = argparse.ArgumentParser(description="Count Blokus move sequences from the empty board.")
+    parser.add_argument('--depth', type=int, default=2, help="number of plies to count")
+    parser.add_argument('--players', type=int, default=4, choices=[2, 3, 4], help="number of colors in play")
+    parser.add_argument('--backend', choices=BACKENDS, default="bitboard", help="board implementation")
+    parser.add_argument('--generator', choices=GENERATORS, default="legal_moves", help="move generator")
+    parser.add_argument('--divide', action='store_true', help="print the count below each root move")
+    args = parser.parse_args(argv)
+
+    board = Board(backend=args.backend)
+    turn_order = list(range(1, args.players + 1))
+    hands = initial_hands(turn_order)
+    start = time.perf_counter()
+    for depth in range(1, args.depth + 1):
+        if args.divide and depth == args.depth:
+            counts = divide(board, hands, turn_order, 0, depth, args.generator)
+            for move, count in sorted(counts.items(), key=lambda item: item[0] or ()):
+                print(f"{move}: {count}")
+            nodes = sum(counts.values())
+        else:
+            nodes = perft(board, hands, turn_order, 0, depth, generator=args.generator)
+        elapsed = time.perf_counter() - start
+        reference = REFERENCE_COUNTS.get(depth) if args.players == 4 else None
+        status = "" if reference is None else " ok" if reference == nodes else f" MISMATCH (expected {reference})"
+        print(f"perft({depth}) = {nodes}  {elapsed:.2f}s  {nodes / elapsed if elapsed else 0:.0f} nodes/s{status}")
+        if reference is not None and reference != nodes:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,4 +1,5 @@
-from typing import List
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
 PIECE_DEFINITIONS = [
     [[1]],  # 1 square (monomino)
@@ -69,10 +70,25 @@ class Piece:
 
     def get_all_variations(self) -> List['Piece']:
         """
-        Génère toutes les orientations possibles de la pièce.
+        Retourne les orientations distinctes de la pièce.
+        
+        Les pièces standard sont lues dans la table ORIENTATIONS ; les autres
+        formes sont dédoublonnées à la volée.
         
         Returns:
-            List[Piece]: Liste de toutes les variations de la pièce.
+            List[Piece]: Liste des orientations distinctes de la pièce.
+        """
+        shape = _freeze(self.shape)
+        if shape in _ORIENTATION_BY_SHAPE.get(self.piece_id, {}):
+            return list(ORIENTATIONS[self.piece_id])
+        return list(_build_orientations(shape, self.piece_id))
+
+    def _get_raw_variations(self) -> List['Piece']:
+        """
+        Génère les huit rotations et retournements de la pièce, doublons compris.
+        
+        Returns:
+            List[Piece]: Liste des huit variations de la pièce.
         """
         variations = []
         current = self
@@ -86,4 +102,169 @@ class Piece:
         for _ in range(4):
             variations.append(current)
             current = current.rotate()
-        return variations
\ No newline at end of file
+        return variations
+
+
+@dataclass(frozen=True)
+class Orientation(Piece):
+    """
+    Orientation immuable et précalculée d'une pièce.
+    
+    Attributs:
+        piece_id (int): L'identifiant de la pièce.
+        orientation_id (int): L'indice de l'orientation dans ORIENTATIONS[piece_id].
+        shape (Tuple[Tuple[int, ...], ...]): La forme orientée.
+        cells (Tuple[Tuple[int, int], ...]): Les cases occupées, relatives au coin haut-gauche.
+        size (int): Le nombre de cases de la pièce.
+        height (int): La hauteur de la boîte englobante.
+        width (int): La largeur de la boîte englobante.
+        corner_offsets (Tuple[Tuple[int, int], ...]): Les cases touchant la pièce par un coin uniquement.
+        edge_offsets (Tuple[Tuple[int, int], ...]): Les cases touchant la pièce par un bord.
+        anchor_cells (Tuple[Tuple[int, int], ...]): Les cases pouvant recouvrir un coin libre,
+            c'est-à-dire ayant une diagonale dont les trois cases voisines sont hors de la pièce.
+    """
+    piece_id: int
+    orientation_id: int
+    shape: Tuple[Tuple[int, ...], ...]
+    cells: Tuple[Tuple[int, int], ...] = field(compare=False, repr=False)
+    size: int = field(compare=False, repr=False)
+    height: int = field(compare=False, repr=False)
+    width: int = field(compare=False, repr=False)
+    corner_offsets: Tuple[Tuple[int, int], ...] = field(compare=False, repr=False)
+    edge_offsets: Tuple[Tuple[int, int], ...] = field(compare=False, repr=False)
+    anchor_cells: Tuple[Tuple[int, int], ...] = field(compare=False, repr=False)
+
+
+def _freeze(shape) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Convertit une forme en tuple de tuples hachable.
+    
+    Args:
+        shape: La forme de la pièce.
+    
+    Returns:
+        Tuple[Tuple[int, ...], ...]: La forme figée.
+    """
+    return tuple(tuple(row) for row in shape)
+
+
+def _make_orientation(shape: Tuple[Tuple[int, ...], ...], piece_id: int,
+                      orientation_id: int) -> Orientation:
+    """
+    Construit une orientation et précalcule ses cases et ses voisinages.
+    
+    Args:
+        shape (Tuple[Tuple[int, ...], ...]): La forme orientée.
+        piece_id (int): L'identifiant de la pièce.
+        orientation_id (int): L'indice de l'orientation.
+    
+    Returns:
+        Orientation: L'orientation précalculée.
+    """
+    cells = tuple((i, j) for i, row in enumerate(shape) for j, cell in enumerate(row) if cell == 1)
+    occupied = set(cells)
+    edges = {(i + dx, j + dy) for i, j in cells
+             for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]} - occupied
+    corners = {(i + dx, j + dy) for i, j in cells
+               for dx, dy in [(1, 1), (1, -1), (-1, 1), (-1, -1)]} - occupied - edges
+    anchors = tuple((i, j) for i, j in cells
+                    if any((i + dx, j + dy) not in occupied and
+                           (i + dx, j) not in occupied and
+                           (i, j + dy) not in occupied
+                           for dx, dy in [(1, 1), (1, -1), (-1, 1), (-1, -1)]))
+    return Orientation(
+        piece_id=piece_id,
+        orientation_id=orientation_id,
+        shape=shape,
+        cells=cells,
+        size=len(cells),
+        height=len(shape),
+        width=len(shape[0]),
+        corner_offsets=tuple(sorted(corners)),
+        edge_offsets=tuple(sorted(edges)),
+        anchor_cells=anchors,
+    )
+
+
+def _build_orientations(shape, piece_id: int) -> Tuple[Orientation, ...]:
+    """
+    Génère les orientations distinctes d'une forme, dans l'ordre des
+    rotations puis des rotations de la forme retournée.
+    
+    Args:
+        shape: La forme de la pièce.
+        piece_id (int): L'identifiant de la pièce.
+    
+    Returns:
+        Tuple[Orientation, ...]: Les orientations sans doublons.
+    """
+    unique = []
+    for variant in Piece(shape, piece_id)._get_raw_variations():
+        frozen = _freeze(variant.shape)
+        if frozen not in unique:
+            unique.append(frozen)
+    return tuple(_make_orientation(s, piece_id, i) for i, s in enumerate(unique))
+
+
+# Table des orientations distinctes des 21 pièces (91 au total), construite à l'import
+ORIENTATIONS: Dict[int, Tuple[Orientation, ...]] = {
+    piece_id: _build_orientations(shape, piece_id)
+    for piece_id, shape in enumerate(PIECE_DEFINITIONS)
+}
+
+_ORIENTATION_BY_SHAPE: Dict[int, Dict[Tuple[Tuple[int, ...], ...], Orientation]] = {
+    piece_id: {o.shape: o for o in orientations}
+    for piece_id, orientations in ORIENTATIONS.items()
+}
+
+
+def _build_transforms() -> Dict[int, Dict[Tuple[int, bool], Orientation]]:
+    """
+    Associe chaque couple (rotation, retournement) de l'interface à son orientation,
+    le retournement étant appliqué avant les rotations.
+    
+    Returns:
+        Dict[int, Dict[Tuple[int, bool], Orientation]]: La table de correspondance par pièce.
+    """
+    transforms = {}
+    for piece_id, shape in enumerate(PIECE_DEFINITIONS):
+        transforms[piece_id] = {}
+        for flip in (False, True):
+            current = Piece(shape, piece_id).flip() if flip else Piece(shape, piece_id)
+            for rotation in range(4):
+                transforms[piece_id][(rotation, flip)] = _ORIENTATION_BY_SHAPE[piece_id][_freeze(current.shape)]
+                current = current.rotate()
+    return transforms
+
+
+_TRANSFORMS = _build_transforms()
+
+
+def get_orientation(piece_id: int, rotation: int = 0, flip: bool = False) -> Orientation:
+    """
+    Retourne l'orientation obtenue en retournant puis en tournant une pièce standard.
+    
+    Args:
+        piece_id (int): L'identifiant de la pièce.
+        rotation (int): Le nombre de quarts de tour horaires (0-3).
+        flip (bool): True si la pièce est retournée avant la rotation.
+    
+    Returns:
+        Orientation: L'orientation correspondante.
+    """
+    return _TRANSFORMS[piece_id][(rotation % 4, bool(flip))]
+
+
+def find_orientation(piece: Piece) -> Optional[Orientation]:
+    """
+    Retrouve dans la table l'orientation standard ayant la forme d'une pièce.
+    
+    Args:
+        piece (Piece): La pièce à identifier.
+    
+    Returns:
+        Optional[Orientation]: L'orientation correspondante, ou None pour une forme non standard.
+    """
+    if isinstance(piece, Orientation):
+        return piece
+    return _ORIENTATION_BY_SHAPE.get(piece.piece_id, {}).get(_freeze(piece.shape))
@@ -1,5 +1,5 @@
 from typing import List, Set
-from .piece import Piece, PIECE_DEFINITIONS
+from .piece import Piece, PIECE_DEFINITIONS, ORIENTATIONS
 
 
 class Player:
@@ -27,7 +27,7 @@ class Player:
         Returns:
             List[Piece]: La liste des pièces disponibles.
         """
-        return [Piece(shape, i) for i, shape in enumerate(PIECE_DEFINITIONS)]
+        return [ORIENTATIONS[i][0] for i in range(len(PIECE_DEFINITIONS))]
     
     def get_remaining_pieces(self) -> List[Piece]:
         """
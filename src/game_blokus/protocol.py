@@ -0,0 +1,278 @@
+import json
+import struct
+from typing import Dict, Iterable, Tuple
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional: control messages fall back to JSON
+    msgpack = None
+
+from .piece import PIECE_DEFINITIONS, get_orientation
+
+# Version of the wire format, sent by the client in its `init` message
+# (2: moves carry their sequence number, snapshots for resuming clients)
+PROTOCOL_VERSION = 2
+# Encodings of control messages, by order of preference
+CODECS = ('msgpack', 'json') if msgpack is not None else ('json',)
+
+# First byte of every payload: what follows it
+TAG_MOVE = 0x01
+TAG_GAME_START = 0x02
+TAG_JSON = 0x03
+TAG_MSGPACK = 0x04
+TAG_SNAPSHOT = 0x05
+
+# piece_id, orientation_id, x, y, color, current_player (NO_PLAYER when absent),
+# followed by the varint sequence number of the move when the server logged it
+MOVE = struct.Struct('!BBBBBB')
+NO_PLAYER = 0xFF
+# Varints hold unsigned 64-bit integers, so at most 10 bytes; longer ones are rejected
+# before their value grows (a long run of continuation bytes would be quadratic)
+MAX_VARINT_BYTES = 10
+_VARINT_LIMIT = 1 << 64
+# Players of a game, whose colors are 1 to MAX_PLAYERS
+MAX_PLAYERS = 4
+_MOVE_TAG, _GAME_START_TAG = bytes((TAG_MOVE,)), bytes((TAG_GAME_START,))
+_JSON_TAG, _MSGPACK_TAG, _SNAPSHOT_TAG = bytes((TAG_JSON,)), bytes((TAG_MSGPACK,)), bytes((TAG_SNAPSHOT,))
+# Keys a move may carry to use the fixed layout; the sender's player_id is dropped,
+# the server knows it from the connection
+_MOVE_KEYS = {'type', 'piece_id', 'orientation_id', 'rotation', 'flip', 'x', 'y', 'color',
+              'current_player', 'player_id', 'seq'}
+_GAME_START_KEYS = {'type', 'player_number', 'current_player', 'total_players'}
+
+# (piece_id, orientation_id) <-> (rotation, flip) understood by the game messages
+ROTATION_FLIP: Dict[Tuple[int, int], Tuple[int, bool]] = {}
+_ORIENTATION_IDS: Dict[Tuple[int, int, bool], int] = {}
+for _piece_id in range(len(PIECE_DEFINITIONS)):
+    for _flip in (True, False):
+        for _rotation in range(3, -1, -1):
+            _orientation_id = get_orientation(_piece_id, _rotation, _flip).orientation_id
+            ROTATION_FLIP[(_piece_id, _orientation_id)] = (_rotation, _flip)
+            _ORIENTATION_IDS[(_piece_id, _rotation, _flip)] = _orientation_id
+
+_JSON = json.JSONEncoder(separators=(',', ':'))
+
+
+class ProtocolError(ValueError):
+    """Raised when a payload is not a valid message of this protocol."""
+
+
+def encode_varint(value: int) -> bytes:
+    """
+    Encode a non-negative 64-bit integer on as few bytes as needed (7 bits per byte).
+
+    Args:
+        value (int): The integer.
+
+    Returns:
+        bytes: The encoded integer.
+    """
+    if not 0 <= value < _VARINT_LIMIT:
+        raise ValueError(f"Cannot encode varint {value} outside 64 unsigned bits")
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def decode_varint(data: bytes, offset: int = 0) -> Tuple[int, int]:
+    """
+    Decode an integer written by encode_varint.
+
+    Args:
+        data (bytes): The buffer.
+        offset (int): Where the integer starts.
+
+    Returns:
+        Tuple[int, int]: The integer and the offset just after it.
+
+    Raises:
+        ProtocolError: If the integer is truncated, longer than MAX_VARINT_BYTES
+            or does not fit in 64 unsigned bits.
+    """
+    value = shift = 0
+    for offset in range(offset, min(offset + MAX_VARINT_BYTES, len(data))):
+        byte = data[offset]
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            if value >= _VARINT_LIMIT:
+                raise ProtocolError("Varint does not fit in 64 bits")
+            return value, offset + 1
+        shift += 7
+    if shift == 7 * MAX_VARINT_BYTES:
+        raise ProtocolError(f"Varint longer than {MAX_VARINT_BYTES} bytes")
+    raise ProtocolError("Truncated varint")
+
+
+def negotiate_codec(offered: Iterable[str]) -> str:
+    """
+    Pick the control message encoding for a connection.
+
+    Args:
+        offered (Iterable[str]): The codecs the peer supports.
+
+    Returns:
+        str: The first codec of CODECS the peer also supports ('json' otherwise).
+    """
+    offered = set(offered or ())
+    for codec in CODECS:
+        if codec in offered:
+            return codec
+    return 'json'
+
+
+def _pack_move(message: dict):
+    """Fixed layout of a move, or None if the move does not fit it (it then goes as a control message)."""
+    if not _MOVE_KEYS.issuperset(message):
+        return None
+    try:
+        piece_id = message['piece_id']
+        orientation_id = message.get('orientation_id')
+        if orientation_id is None:
+            orientation_id = _ORIENTATION_IDS[(piece_id, message['rotation'], message['flip'])]
+        elif (piece_id, orientation_id) not in ROTATION_FLIP:
+            return None
+        current_player = message.get('current_player', NO_PLAYER)
+        if current_player == NO_PLAYER and 'current_player' in message:
+            return None
+        packed = MOVE.pack(piece_id, orientation_id, message['x'], message['y'], message['color'], current_player)
+        if 'seq' in message:
+            packed += encode_varint(message['seq'])
+        return packed
+    except (KeyError, TypeError, ValueError, struct.error):
+        return None
+
+
+def _pack_snapshot(message: dict) -> bytes:
+    """
+    Binary layout of a snapshot: varint seq, varint length and bytes of the board
+    (Board.snapshot), varint number of colors, then for each one its color and
+    its hand as a varint bit mask of piece ids.
+    """
+    board = message['board']
+    hands = message['hands']
+    out = [encode_varint(message['seq']), encode_varint(len(board)), bytes(board), encode_varint(len(hands))]
+    for color, hand in sorted(hands.items()):
+        mask = 0
+        for piece_id in hand:
+            mask |= 1 << piece_id
+        out.append(encode_varint(int(color)))
+        out.append(encode_varint(mask))
+    return b''.join(out)
+
+
+def _unpack_snapshot(body: bytes) -> dict:
+    """Decode a snapshot written by _pack_snapshot."""
+    seq, offset = decode_varint(body)
+    length, offset = decode_varint(body, offset)
+    if offset + length > len(body):
+        raise ProtocolError("Truncated snapshot")
+    board = bytes(body[offset:offset + length])
+    count, offset = decode_varint(body, offset + length)
+    if count > MAX_PLAYERS:
+        raise ProtocolError(f"Snapshot of {count} colors")
+    hands = {}
+    for _ in range(count):
+        color, offset = decode_varint(body, offset)
+        mask, offset = decode_varint(body, offset)
+        if not 1 <= color <= MAX_PLAYERS or color in hands:
+            raise ProtocolError(f"Invalid snapshot color {color}")
+        if mask >> len(PIECE_DEFINITIONS):
+            raise ProtocolError(f"Invalid hand of color {color}")
+        hands[color] = [piece_id for piece_id in range(mask.bit_length()) if mask >> piece_id & 1]
+    if offset != len(body):
+        raise ProtocolError("Trailing bytes after snapshot")
+    return {'type': 'snapshot', 'seq': seq, 'board': board, 'hands': hands}
+
+
+def encode_message(message: dict, codec: str = 'json') -> bytes:
+    """
+    Encode a message for the wire.
+
+    Moves use a fixed 7-byte layout (plus their sequence number), game starts
+    three varints and snapshots their own binary layout; every other message
+    is a control message, encoded with the negotiated codec.
+
+    Args:
+        message (dict): The message.
+        codec (str): The control message codec of the connection. Defaults to 'json'.
+
+    Returns:
+        bytes: The payload, to be framed.
+    """
+    kind = message.get('type')
+    if kind == 'move':
+        packed = _pack_move(message)
+        if packed is not None:
+            return _MOVE_TAG + packed
+    elif kind == 'game_start' and _GAME_START_KEYS.issuperset(message):
+        try:
+            return (_GAME_START_TAG + encode_varint(message['player_number'])
+                    + encode_varint(message['current_player']) + encode_varint(message['total_players']))
+        except (KeyError, TypeError, ValueError):
+            pass
+    elif kind == 'snapshot':
+        return _SNAPSHOT_TAG + _pack_snapshot(message)
+    if codec == 'msgpack' and msgpack is not None:
+        return _MSGPACK_TAG + msgpack.packb(message, use_bin_type=True)
+    return _JSON_TAG + _JSON.encode(message).encode('utf-8')
+
+
+def decode_message(payload: bytes) -> dict:
+    """
+    Decode a payload written by encode_message. Unlike pickle, nothing in a
+    payload is ever executed, so messages from untrusted peers are safe to decode.
+
+    Args:
+        payload (bytes): The payload of one frame.
+
+    Returns:
+        dict: The message. Moves carry both orientation_id and (rotation, flip).
+
+    Raises:
+        ProtocolError: If the payload is not a valid message.
+    """
+    if not payload:
+        raise ProtocolError("Empty payload")
+    tag, body = payload[0], payload[1:]
+    try:
+        if tag == TAG_MOVE:
+            piece_id, orientation_id, x, y, color, current_player = MOVE.unpack_from(body)
+            rotation, flip = ROTATION_FLIP[(piece_id, orientation_id)]
+            message = {'type': 'move', 'piece_id': piece_id, 'orientation_id': orientation_id,
+                       'rotation': rotation, 'flip': flip, 'x': x, 'y': y, 'color': color}
+            if current_player != NO_PLAYER:
+                message['current_player'] = current_player
+            if len(body) > MOVE.size:
+                message['seq'], offset = decode_varint(body, MOVE.size)
+                if offset != len(body):
+                    raise ProtocolError("Trailing bytes after move")
+            return message
+        if tag == TAG_SNAPSHOT:
+            return _unpack_snapshot(body)
+        if tag == TAG_GAME_START:
+            player_number, offset = decode_varint(body)
+            current_player, offset = decode_varint(body, offset)
+            total_players, offset = decode_varint(body, offset)
+            if offset != len(body):
+                raise ProtocolError("Trailing bytes after game_start")
+            if not (total_players <= MAX_PLAYERS and player_number < total_players
+                    and current_player < total_players):
+                raise ProtocolError("Player numbers out of range in game_start")
+            return {'type': 'game_start', 'player_number': player_number,
+                    'current_player': current_player, 'total_players': total_players}
+        if tag == TAG_JSON:
+            message = json.loads(body.decode('utf-8'))
+        elif tag == TAG_MSGPACK and msgpack is not None:
+            message = msgpack.unpackb(body, raw=False)
+        else:
+            raise ProtocolError(f"Unknown message tag {tag:#x}")
+    except (struct.error, KeyError, UnicodeDecodeError, ValueError) as e:
+        if isinstance(e, ProtocolError):
+            raise
+        raise ProtocolError(f"Malformed message: {e}") from e
+    if not isinstance(message, dict):
+        raise ProtocolError("Control message is not a mapping")
+    return message
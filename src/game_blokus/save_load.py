@@ -1,7 +1,40 @@
 import json
+import random
 from dataclasses import asdict
+from .bot_player import BotPlayer
 from .state import GameState
 
+
+def _dump_rng(rng: random.Random) -> list:
+    """
+    Convertit l'état d'un générateur aléatoire en liste sérialisable en JSON.
+    
+    Args:
+        rng (random.Random): Le générateur.
+    
+    Returns:
+        list: La version, l'état interne et la valeur gaussienne en attente.
+    """
+    version, internal, gauss_next = rng.getstate()
+    return [version, list(internal), gauss_next]
+
+
+def _load_rng(state: list) -> random.Random:
+    """
+    Recrée un générateur aléatoire à partir d'un état écrit par _dump_rng.
+    
+    Args:
+        state (list): L'état sauvegardé.
+    
+    Returns:
+        random.Random: Le générateur, qui reprend exactement où il en était.
+    """
+    version, internal, gauss_next = state
+    rng = random.Random()
+    rng.setstate((version, tuple(internal), gauss_next))
+    return rng
+
+
 def save_game(game, filename: str = "blokus_save.json") -> None:
     """
     Sauvegarde l'état actuel du jeu.
@@ -11,10 +44,13 @@ def save_game(game, filename: str = "blokus_save.json") -> None:
     """
 
     state = GameState(
-        board_state=game.board.grid,
+        board_state=[list(row) for row in game.board.grid],
         current_player=game.current_player,
         player_pieces=[list(p.remaining_pieces) for p in game.players],
-        player_corners=[list(game.board.corners[i+1]) for i in range(len(game.players))]
+        player_corners=[list(game.board.corners[i+1]) for i in range(len(game.players))],
+        seed=game.seed,
+        rng_states=[_dump_rng(game.rng)] + [_dump_rng(p.rng) if isinstance(p, BotPlayer) else None
+                                            for p in game.players]
     )
     
     with open(filename, 'w') as f:
@@ -41,8 +77,19 @@ def load_game(game, filename: str = "blokus_save.json") -> bool:
         for i, pieces in enumerate(state['player_pieces']):
             game.players[i].remaining_pieces = set(pieces)
             game.players[i].pieces = {piece_id: game.players[i].pieces[piece_id] for piece_id in pieces}
-        for i, corners in enumerate(state['player_corners']):
-            game.board.corners[i+1] = set(tuple(c) for c in corners)
+        # Live corners are rebuilt from the grid: the saved player_corners are ignored,
+        # they are still written so that older versions can read newer saves
+        if state.get('seed') is not None:
+            game.seed = state['seed']
+        # The generators resume where they were saved, so a loaded game continues
+        # exactly like the original; saves without their states restart them from the seed
+        game.seed_rngs()
+        rng_states = state.get('rng_states')
+        if rng_states:
+            game.rng = _load_rng(rng_states[0])
+            for player, rng_state in zip(game.players, rng_states[1:]):
+                if rng_state is not None and isinstance(player, BotPlayer):
+                    player.rng = _load_rng(rng_state)
         
         print(f"\nGame loaded from {filename}")
         return True
@@ -1,97 +1,168 @@
-import socket
-import threading
-import json
-from typing import Dict, List
-import pickle
+import argparse
+import asyncio
+import hmac
+import secrets
+import sys
+from typing import Dict, List, Optional
+
+from .board import Board
+from .framing import encode_frame, encode_frames, read_frame
+from .piece import ORIENTATIONS, PIECE_DEFINITIONS, Orientation, get_orientation
+from .protocol import MAX_PLAYERS, PROTOCOL_VERSION, ProtocolError, decode_message, encode_message, negotiate_codec
+
+# Pending connections the OS queues while the event loop is busy
+DEFAULT_BACKLOG = 1024
+# Rules engine of the server-side boards: validation is a few mask operations
+SERVER_BOARD_BACKEND = "bitboard"
+# Fields of a move relayed to the players; anything else a client adds is dropped
+_MOVE_FIELDS = ('piece_id', 'orientation_id', 'rotation', 'flip', 'x', 'y', 'color')
+# Missed moves beyond which a resuming client gets a snapshot instead: a logged move
+# is about 13 bytes on the wire, a snapshot of a 20x20 board about 420
+SNAPSHOT_THRESHOLD = 32
+# Seconds a client may leave its receive buffer full before it is dropped
+DRAIN_TIMEOUT = 10.0
+
 
 class BlokusServer:
-    def __init__(self, host='0.0.0.0', port=6000):
+    def __init__(self, host='0.0.0.0', port=6000, backlog=DEFAULT_BACKLOG):
         """
         Initialize the Blokus server.
 
+        All connections are served by a single asyncio event loop, so an idle or
+        waiting player costs a stream pair instead of an OS thread.
+
         Args:
             host (str): Host address to bind the server. Defaults to '0.0.0.0'.
-            port (int): Port number to bind the server. Defaults to 6000.
+            port (int): Port number to bind the server, 0 for any free port. Defaults to 6000.
+            backlog (int): Maximum number of pending connections. Defaults to DEFAULT_BACKLOG.
         """
         self.host = host
         self.port = port
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.bind((self.host, self.port))
-        self.server_socket.listen(4)  # Max 4 players per game
-        
+        self.backlog = backlog
+        self.server = None
+
         self.games: Dict[str, Dict] = {}  # game_id -> game_info
-        self.clients: Dict[socket.socket, Dict] = {}  # socket -> client_info
-        
-        print(f"Server started on {host}:{port}")
-        
+        self.clients: Dict[asyncio.StreamWriter, Dict] = {}  # writer -> client_info
+        self._drains: Dict[asyncio.StreamWriter, asyncio.Task] = {}  # writer -> pending drain
+
+    async def start_server(self):
+        """
+        Bind the listening socket and start accepting connections in the running loop.
+
+        Returns:
+            asyncio.base_events.Server: The listening server.
+        """
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port,
+                                                 backlog=self.backlog)
+        self.port = self.server.sockets[0].getsockname()[1]
+        print(f"Server started on {self.host}:{self.port}")
+        return self.server
+
+    async def serve_forever(self):
+        """Start the server and accept client connections until cancelled"""
+        server = await self.start_server()
+        async with server:
+            await server.serve_forever()
+
     def start(self):
-        """Start accepting client connections"""
-        while True:
-            client_socket, address = self.server_socket.accept()
-            print(f"New connection from {address}")
-            
-            # Start a new thread to handle this client
-            client_thread = threading.Thread(
-                target=self.handle_client,
-                args=(client_socket,)
-            )
-            client_thread.start()
-            
-    def handle_client(self, client_socket: socket.socket):
+        """Start accepting client connections (blocking)"""
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            pass
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """
         Handle individual client connection.
-        
+
         Args:
-            client_socket (socket.socket): The socket representing the client connection.
+            reader (asyncio.StreamReader): The stream receiving the client's messages.
+            writer (asyncio.StreamWriter): The stream sending messages to the client.
         """
+        print(f"New connection from {writer.get_extra_info('peername')}")
         try:
-            init_data = self.receive_message(client_socket)
+            init_data = await self.receive_message(reader)
             if init_data.get('type') == 'init':
-                self._handle_client_initialization(client_socket, init_data)
-            
-            self._handle_game_messages(client_socket)
-            
+                if init_data.get('protocol') != PROTOCOL_VERSION:
+                    self.send_message(writer, {
+                        'type': 'error',
+                        'message': f'Unsupported protocol version, server speaks {PROTOCOL_VERSION}'
+                    })
+                    return
+                if not self._handle_client_initialization(writer, init_data):
+                    return
+
+            await self._handle_game_messages(reader, writer)
+
         except Exception as e:
             print(f"Error handling client: {e}")
         finally:
-            self.handle_client_disconnect(client_socket)
+            self.handle_client_disconnect(writer)
 
-    def _handle_client_initialization(self, client_socket: socket.socket, init_data: dict):
+    def _handle_client_initialization(self, writer: asyncio.StreamWriter, init_data: dict) -> bool:
         """
         Handle initial client connection and game setup.
 
+        The welcome gives the connection a secret resume token, which becomes the
+        token of the seat it takes. A player whose game has already started takes
+        its seat back by presenting the seat's token as `resume_token`, and receives
+        what it missed since the move numbered `last_seq`.
+
         Args:
-            client_socket (socket.socket): The socket representing the client connection.
+            writer (asyncio.StreamWriter): The stream of the client connection.
             init_data (dict): The initialization data sent by the client.
+
+        Returns:
+            bool: True if the client joined a game, False if it was turned away
+            (started game without a seat for it, invalid number of players).
         """
         player_id = init_data.get('player_id')
         game_id = init_data.get('game_id')
-        
-        self._register_client(client_socket, player_id, game_id)
-        self._setup_or_join_game(client_socket, game_id, init_data.get('num_players', 2))
+        codec = negotiate_codec(init_data.get('codecs'))
+
+        self._register_client(writer, player_id, game_id, codec)
+        self.send_message(writer, {'type': 'welcome', 'protocol': PROTOCOL_VERSION, 'codec': codec,
+                                   'resume_token': self.clients[writer]['resume_token']})
+        game = self.games.get(game_id)
+        if game and game['started']:
+            last_seq = init_data.get('last_seq')
+            return self._rejoin_game(writer, game_id, init_data.get('resume_token'),
+                                     last_seq if type(last_seq) is int else 0)
+        num_players = init_data.get('num_players', 2)
+        if type(num_players) is not int or not 2 <= num_players <= MAX_PLAYERS:
+            # The server's rules engine has one color per player
+            self.send_message(writer, {'type': 'error',
+                                       'message': f'The number of players must be 2 to {MAX_PLAYERS}'})
+            return False
+        self._setup_or_join_game(writer, game_id, num_players)
         self._check_game_start(game_id)
+        return True
 
-    def _register_client(self, client_socket: socket.socket, player_id: str, game_id: str):
+    def _register_client(self, writer: asyncio.StreamWriter, player_id: str, game_id: str, codec: str = 'json'):
         """
         Register new client in the server.
 
         Args:
-            client_socket (socket.socket): The socket representing the client connection.
+            writer (asyncio.StreamWriter): The stream of the client connection.
             player_id (str): The ID of the player.
             game_id (str): The ID of the game.
+            codec (str): The control message codec negotiated with the client. Defaults to 'json'.
         """
-        self.clients[client_socket] = {
+        self.clients[writer] = {
             'player_id': player_id,
             'game_id': game_id,
-            'player_number': None
+            'player_number': None,
+            'codec': codec,
+            # Secret that lets this player take its seat back; opponents never see it
+            'resume_token': secrets.token_urlsafe(16)
         }
 
-    def _setup_or_join_game(self, client_socket: socket.socket, game_id: str, num_players: int):
+    def _setup_or_join_game(self, writer: asyncio.StreamWriter, game_id: str, num_players: int):
         """
         Setup new game or join existing one.
 
         Args:
-            client_socket (socket.socket): The socket representing the client connection.
+            writer (asyncio.StreamWriter): The stream of the client connection.
             game_id (str): The ID of the game.
             num_players (int): Number of players in the game.
         """
@@ -100,16 +171,101 @@ class BlokusServer:
                 'players': [],
                 'current_player': 0,
                 'board_state': None,
+                'hands': None,
                 'started': False,
-                'num_players': num_players
+                'finished': False,
+                'num_players': num_players,
+                'seats': [],  # player number -> player_id, kept for rejoining
+                'tokens': [],  # player number -> resume token of the seat
+                'log': []  # broadcast moves; a move's seq is its position + 1
             }
-        
-        player_number = len(self.games[game_id]['players'])
-        self.clients[client_socket]['player_number'] = player_number
-        self.games[game_id]['players'].append(client_socket)
-        
+
+        game = self.games[game_id]
+        player_number = len(game['seats'])
+        self.clients[writer]['player_number'] = player_number
+        game['seats'].append(self.clients[writer]['player_id'])
+        game['tokens'].append(self.clients[writer]['resume_token'])
+        game['players'].append(writer)
+
         print(f"Player {player_number} joined game {game_id}")
 
+    def _rejoin_game(self, writer: asyncio.StreamWriter, game_id: str, resume_token, last_seq: int) -> bool:
+        """
+        Give a started game's seat back to its player and bring the client up to date.
+
+        A connection still holding the seat is one the server has not seen drop
+        yet: the resume token proves the seat is the client's, so the new connection
+        replaces it. The seat then takes the token of the new connection.
+
+        Args:
+            writer (asyncio.StreamWriter): The stream of the new client connection.
+            game_id (str): The ID of the game.
+            resume_token: The seat's token, as received in the welcome of an earlier connection.
+            last_seq (int): The sequence number of the last move the client received.
+
+        Returns:
+            bool: True if the client took its seat back, False if it has no seat in the game.
+        """
+        game = self.games[game_id]
+        player_id = self.clients[writer]['player_id']
+        if player_id not in game['seats']:
+            self.send_message(writer, {'type': 'error', 'message': 'Game already started'})
+            return False
+
+        player_number = game['seats'].index(player_id)
+        if not (isinstance(resume_token, str) and
+                hmac.compare_digest(resume_token.encode(), game['tokens'][player_number].encode())):
+            self.send_message(writer, {'type': 'error', 'message': 'Invalid resume token'})
+            return False
+        game['tokens'][player_number] = self.clients[writer]['resume_token']
+        for stale_writer in game['players']:
+            if self.clients[stale_writer]['player_number'] == player_number:
+                game['players'].remove(stale_writer)
+                del self.clients[stale_writer]
+                stale_writer.close()
+                break
+        self.clients[writer]['player_number'] = player_number
+        game['players'].append(writer)
+        print(f"Player {player_number} rejoined game {game_id}")
+        self.send_messages(writer, self._catch_up_messages(game, player_number, last_seq))
+        self.broadcast_to_game(game_id, {'type': 'player_reconnected', 'player_number': player_number},
+                               exclude=writer)
+        return True
+
+    def _catch_up_messages(self, game: dict, player_number: int, last_seq: int) -> List[dict]:
+        """
+        Build what a resuming client missed: the moves logged after last_seq, or a
+        snapshot of the board and hands when that would be larger.
+
+        Args:
+            game (dict): The game.
+            player_number (int): The player number of the client.
+            last_seq (int): The sequence number of the last move the client received.
+
+        Returns:
+            List[dict]: A `resume` message, then the missed moves or a snapshot.
+        """
+        log = game['log']
+        messages = [{
+            'type': 'resume',
+            'player_number': player_number,
+            'current_player': game['current_player'],
+            'total_players': game['num_players'],
+            'seq': len(log)
+        }]
+        if 0 <= last_seq <= len(log) and len(log) - last_seq <= SNAPSHOT_THRESHOLD:
+            messages.extend(log[last_seq:])
+        else:
+            messages.append({
+                'type': 'snapshot',
+                'seq': len(log),
+                'board': game['board_state'].snapshot(),
+                'hands': {color: sorted(hand) for color, hand in game['hands'].items()}
+            })
+        if game['finished']:
+            messages.append({'type': 'game_over', 'scores': self._final_scores(game)})
+        return messages
+
     def _check_game_start(self, game_id: str):
         """
         Check if game can start and notify players.
@@ -134,10 +290,14 @@ class BlokusServer:
         print(f"Game {game_id} is starting with {game['num_players']} players")
         game['started'] = True
         game['current_player'] = 0
+        # The server's own board is the reference: every move is checked against it
+        game['board_state'] = Board(backend=SERVER_BOARD_BACKEND)
+        game['hands'] = {player_number + 1: set(range(len(PIECE_DEFINITIONS)))
+                         for player_number in range(game['num_players'])}
 
-        for player_socket in game['players']:
-            player_num = self.clients[player_socket]['player_number']
-            self.send_message(player_socket, {
+        for player_writer in game['players']:
+            player_num = self.clients[player_writer]['player_number']
+            self.send_message(player_writer, {
                 'type': 'game_start',
                 'player_number': player_num,
                 'current_player': 0,
@@ -147,7 +307,7 @@ class BlokusServer:
     def _send_waiting_message(self, game_id: str):
         """
         Send waiting message to all players in the game.
-        
+
         Args:
             game_id (str): The ID of the game.
         """
@@ -158,139 +318,351 @@ class BlokusServer:
         }
         self.broadcast_to_game(game_id, waiting_msg)
 
-    def _handle_game_messages(self, client_socket: socket.socket):
+    async def _handle_game_messages(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """
         Handle ongoing game messages from client.
 
         Args:
-            client_socket (socket.socket): The socket representing the client connection.
+            reader (asyncio.StreamReader): The stream receiving the client's messages.
+            writer (asyncio.StreamWriter): The stream of the client connection.
         """
         while True:
-            data = self.receive_message(client_socket)
+            data = await self.receive_message(reader)
             if not data:
                 break
-                
-            game_id = self.clients[client_socket]['game_id']
+
+            game_id = self.clients[writer]['game_id']
             game = self.games.get(game_id)
-            
+
             if not game or not game['started']:
                 continue
-            
+
             if data.get('type') == 'move':
-                self._handle_move(client_socket, game_id, data)
+                self._handle_move(writer, game_id, data)
 
-    def _handle_move(self, client_socket: socket.socket, game_id: str, move_data: dict):
+    def _handle_move(self, writer: asyncio.StreamWriter, game_id: str, move_data: dict):
         """
-        Handle a move from a player.
-        
+        Handle a move from a player: check the turn, then the move itself.
+
         Args:
-            client_socket (socket.socket): The socket representing the client connection.
+            writer (asyncio.StreamWriter): The stream of the client connection.
             game_id (str): The ID of the game.
             move_data (dict): The move data sent by the client.
         """
         game = self.games[game_id]
-        player_number = self.clients[client_socket]['player_number']
+        player_number = self.clients[writer]['player_number']
         current_player = game['current_player']
-        
-        if player_number == current_player:
-            self._process_valid_move(game_id, move_data)
+
+        if game['finished']:
+            self._send_illegal_move_message(writer, 'The game is over')
+        elif player_number != current_player:
+            self._send_invalid_turn_message(writer)
         else:
-            self._send_invalid_turn_message(client_socket)
+            piece = self._prepare_piece(move_data)
+            error = self._check_move(game, player_number + 1, piece, move_data)
+            if error:
+                self._send_illegal_move_message(writer, error)
+            else:
+                self._process_valid_move(game_id, piece, move_data)
 
-    def _process_valid_move(self, game_id: str, move_data: dict):
+    def _prepare_piece(self, move_data: dict) -> Optional[Orientation]:
         """
-        Process and broadcast a valid move.
-        
+        Get the oriented piece of a move.
+
+        Args:
+            move_data (dict): The move data sent by the client.
+
+        Returns:
+            Optional[Orientation]: The piece, or None if the move does not name a valid one.
+        """
+        try:
+            piece_id = move_data['piece_id']
+            if 'orientation_id' in move_data:
+                return ORIENTATIONS[piece_id][move_data['orientation_id']]
+            return get_orientation(piece_id, move_data['rotation'], move_data['flip'])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+
+    def _check_move(self, game: dict, color: int, piece: Optional[Orientation], move_data: dict) -> Optional[str]:
+        """
+        Check a move against the rules, on the game's own board.
+
+        Args:
+            game (dict): The game.
+            color (int): The color of the player whose turn it is.
+            piece (Optional[Orientation]): The piece of the move, as returned by _prepare_piece.
+            move_data (dict): The move data sent by the client.
+
+        Returns:
+            Optional[str]: Why the move is illegal, or None if it is legal.
+        """
+        if piece is None:
+            return 'Unknown piece'
+        if move_data.get('color') != color:
+            return 'Not your color'
+        if move_data['piece_id'] not in game['hands'][color]:
+            return 'Piece already played'
+        x, y = move_data.get('x'), move_data.get('y')
+        if type(x) is not int or type(y) is not int:
+            return 'Invalid position'
+        if not game['board_state'].is_valid_move(piece, x, y, color):
+            return 'Illegal move'
+        return None
+
+    def _process_valid_move(self, game_id: str, piece: Orientation, move_data: dict):
+        """
+        Play a legal move on the game's board and broadcast it.
+
+        Players left without any legal move are skipped; once nobody can play,
+        the game is over and the final scores are broadcast.
+
         Args:
             game_id (str): The ID of the game.
+            piece (Orientation): The piece of the move.
             move_data (dict): The move data sent by the client.
         """
         game = self.games[game_id]
-        game['current_player'] = (game['current_player'] + 1) % game['num_players']
-        
-        move_data['current_player'] = game['current_player']
-        self.broadcast_to_game(game_id, move_data)
+        board = game['board_state']
+        color = move_data['color']
+        board.place_piece(piece, move_data['x'], move_data['y'], color)
+        game['hands'][color].discard(move_data['piece_id'])
+
+        next_player = self._next_player(game)
+        game['finished'] = next_player is None
+        if next_player is None:
+            next_player = (game['current_player'] + 1) % game['num_players']
+        game['current_player'] = next_player
+
+        message = {field: move_data[field] for field in _MOVE_FIELDS if field in move_data}
+        message['orientation_id'] = piece.orientation_id
+        message['type'] = 'move'
+        message['current_player'] = next_player
+        game['log'].append(message)
+        message['seq'] = len(game['log'])
+        self.broadcast_to_game(game_id, message)
+        if game['finished']:
+            self.broadcast_to_game(game_id, {'type': 'game_over', 'scores': self._final_scores(game)})
+
+    def _next_player(self, game: dict) -> Optional[int]:
+        """
+        Find the next player who can still move.
+
+        Args:
+            game (dict): The game.
 
-    def _send_invalid_turn_message(self, client_socket: socket.socket):
+        Returns:
+            Optional[int]: The player number, or None if no player can move.
+        """
+        board = game['board_state']
+        for step in range(1, game['num_players'] + 1):
+            player_number = (game['current_player'] + step) % game['num_players']
+            color = player_number + 1
+            # A blocked player stays blocked: has_any_move remembers it
+            if board.has_any_move(color, game['hands'][color]):
+                return player_number
+        return None
+
+    def _final_scores(self, game: dict) -> List[dict]:
+        """
+        Compute the final score of each player, best score first, like compute_scores.
+
+        Args:
+            game (dict): The finished game.
+
+        Returns:
+            List[dict]: One dict per player with 'color', 'remaining', 'placed' and 'score'.
+        """
+        board = game['board_state']
+        scores = []
+        for color, hand in game['hands'].items():
+            remaining = sum(ORIENTATIONS[piece_id][0].size for piece_id in hand)
+            placed = board.squares_placed[color]
+            scores.append({'color': color, 'remaining': remaining, 'placed': placed,
+                           'score': placed - remaining})
+        scores.sort(key=lambda score: score['score'], reverse=True)
+        return scores
+
+    def _send_invalid_turn_message(self, writer: asyncio.StreamWriter):
         """
         Send error message for invalid turn.
-        
+
         Args:
-            client_socket (socket.socket): The socket representing the client connection.
+            writer (asyncio.StreamWriter): The stream of the client connection.
         """
-        self.send_message(client_socket, {
+        self.send_message(writer, {
             'type': 'error',
             'message': 'Not your turn'
         })
 
-    def handle_client_disconnect(self, client_socket: socket.socket):
+    def _send_illegal_move_message(self, writer: asyncio.StreamWriter, reason: str):
+        """
+        Send error message for a move the rules reject; the turn does not pass.
+
+        Args:
+            writer (asyncio.StreamWriter): The stream of the client connection.
+            reason (str): Why the move was rejected.
+        """
+        self.send_message(writer, {
+            'type': 'error',
+            'message': reason
+        })
+
+    def handle_client_disconnect(self, writer: asyncio.StreamWriter):
         """
         Clean up when a client disconnects.
 
         Args:
-            client_socket (socket.socket): The socket representing the client connection.
+            writer (asyncio.StreamWriter): The stream of the client connection.
         """
-        if client_socket in self.clients:
-            game_id = self.clients[client_socket]['game_id']
-            if game_id in self.games:
-                self.games[game_id]['players'].remove(client_socket)
-                # Notify other players about disconnection
+        if writer in self.clients:
+            game_id = self.clients[writer]['game_id']
+            game = self.games.get(game_id)
+            if game and writer in game['players']:
+                game['players'].remove(writer)
+                departed = self.clients[writer]['player_number']
+                if not game['started']:
+                    # Nothing to rejoin yet: free the seat and renumber the others
+                    del game['seats'][departed]
+                    del game['tokens'][departed]
+                    for player_number, player_writer in enumerate(game['players']):
+                        self.clients[player_writer]['player_number'] = player_number
+                # Notify other players about disconnection; the player ID stays private,
+                # with the resume token it is what gives the seat back
                 self.broadcast_to_game(game_id, {
                     'type': 'player_disconnected',
-                    'player_id': self.clients[client_socket]['player_id']
+                    'player_number': departed
                 })
                 # Remove game if no players left
                 if not self.games[game_id]['players']:
                     del self.games[game_id]
-            del self.clients[client_socket]
-        client_socket.close()
-            
+            del self.clients[writer]
+        writer.close()
+
     def broadcast_to_game(self, game_id: str, message: dict, exclude=None):
         """
-        Send message to all players in a game except excluded socket.
+        Send message to all players in a game except excluded stream.
 
         Args:
             game_id (str): The ID of the game.
             message (dict): The message to send.
-            exclude (socket.socket, optional): The socket to exclude from the broadcast. Defaults to None.
+            exclude (asyncio.StreamWriter, optional): The stream to exclude from the broadcast. Defaults to None.
         """
         if game_id in self.games:
-            for player_socket in self.games[game_id]['players']:
-                if player_socket != exclude:
-                    self.send_message(player_socket, message)
-                
-    def send_message(self, client_socket: socket.socket, message: dict):
+            # Encode once per codec rather than once per player
+            frames = {}
+            for player_writer in self.games[game_id]['players']:
+                if player_writer != exclude:
+                    codec = self._codec(player_writer)
+                    try:
+                        if codec not in frames:
+                            frames[codec] = encode_frame(encode_message(message, codec))
+                        player_writer.write(frames[codec])
+                        self._flush(player_writer)
+                    except Exception as e:
+                        print(f"Error sending message: {e}")
+
+    def _codec(self, writer: asyncio.StreamWriter) -> str:
+        """Control message codec of a client; JSON until the handshake is done."""
+        client = self.clients.get(writer)
+        return client['codec'] if client else 'json'
+
+    def send_message(self, writer: asyncio.StreamWriter, message: dict):
         """
-        Send message to a client.
+        Queue a message to a client; the event loop flushes it without blocking.
 
         Args:
-            client_socket (socket.socket): The socket representing the client connection.
+            writer (asyncio.StreamWriter): The stream of the client connection.
             message (dict): The message to send.
         """
         try:
-            data = pickle.dumps(message)
-            client_socket.send(data)
+            writer.write(encode_frame(encode_message(message, self._codec(writer))))
+            self._flush(writer)
         except Exception as e:
             print(f"Error sending message: {e}")
-            
-    def receive_message(self, client_socket: socket.socket) -> dict:
+
+    def send_messages(self, writer: asyncio.StreamWriter, messages: List[dict]):
         """
-        Receive message from a client.
+        Queue several messages to a client in a single write.
 
         Args:
-            client_socket (socket.socket): The socket representing the client connection.
+            writer (asyncio.StreamWriter): The stream of the client connection.
+            messages (List[dict]): The messages to send, in order.
+        """
+        try:
+            codec = self._codec(writer)
+            writer.write(encode_frames(encode_message(message, codec) for message in messages))
+            self._flush(writer)
+        except Exception as e:
+            print(f"Error sending message: {e}")
+
+    def _flush(self, writer: asyncio.StreamWriter):
+        """
+        Wait in the background for a client's buffer to drain once it is over its
+        high-water mark, so a client that stops reading cannot grow it without bound.
+
+        Args:
+            writer (asyncio.StreamWriter): The stream just written to.
+        """
+        if writer in self._drains:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Called outside the event loop: nothing can be waited for
+        transport = writer.transport
+        if transport.get_write_buffer_size() <= transport.get_write_buffer_limits()[1]:
+            return  # drain() would return at once
+        task = loop.create_task(self._drain(writer))
+        self._drains[writer] = task
+        task.add_done_callback(lambda _: self._drains.pop(writer, None))
+
+    async def _drain(self, writer: asyncio.StreamWriter):
+        """
+        Wait for a client's buffer to drain, dropping the client if it stays stalled.
+
+        Args:
+            writer (asyncio.StreamWriter): The stream of the client connection.
+        """
+        try:
+            await asyncio.wait_for(writer.drain(), DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            print(f"Dropping client stalled for {DRAIN_TIMEOUT}s")
+            self.handle_client_disconnect(writer)
+            # close() would wait for the buffer to flush, which is what is not happening
+            writer.transport.abort()
+        except Exception:
+            pass  # The connection is gone: the client's reader cleans it up
+
+    async def receive_message(self, reader: asyncio.StreamReader) -> dict:
+        """
+        Receive the next message from a client, however TCP split or merged it.
+
+        Args:
+            reader (asyncio.StreamReader): The stream receiving the client's messages.
 
         Returns:
-            dict: The received message.
+            dict: The received message, empty once the client is gone.
         """
         try:
-            data = client_socket.recv(4096)
-            if data:
-                return pickle.loads(data)
+            payload = await read_frame(reader)
+            if payload is not None:
+                return decode_message(payload)
+        except ProtocolError as e:
+            print(f"Dropping client after invalid message: {e}")
         except Exception as e:
             print(f"Error receiving message: {e}")
         return {}
 
+
+def main(argv: List[str] = None):
+    """Command line entry point: python -m game_blokus.server."""
+    parser = argparse.ArgumentParser(description="Run the Blokus game server.")
+    parser.add_argument('--host', default='0.0.0.0', help="address to bind")
+    parser.add_argument('--port', type=int, default=6000, help="port to bind")
+    parser.add_argument('--backlog', type=int, default=DEFAULT_BACKLOG, help="maximum pending connections")
+    args = parser.parse_args(argv)
+    BlokusServer(args.host, args.port, args.backlog).start()
+
+
 if __name__ == "__main__":
-    server = BlokusServer()
-    server.start() 
\ No newline at end of file
+    main(sys.argv[1:])
@@ -20,18 +20,18 @@ def start_spectator(game):
     """
     print("\n🕶️ Spectator Mode Activated: AI Duel 🕶️")
 
-    valid_levels = ["easy", "medium", "hard"]
+    valid_levels = ["easy", "medium", "hard", "expert", "mcts"]
     ai_levels = []
 
     for i in range(2):
         while True:
-            ai_level = input(f"Select difficulty level for AI {i + 1} (easy/medium/hard): ").lower()
+            ai_level = input(f"Select difficulty level for AI {i + 1} (easy/medium/hard/expert/mcts): ").lower()
             if ai_level in valid_levels:
                 ai_levels.append(ai_level)
                 ai_levels.append(ai_level)  # Chaque IA contrôle deux couleurs
                 break
             else:
-                print("Invalid choice. Please enter 'easy', 'medium', or 'hard'.")
+                print("Invalid choice. Please enter 'easy', 'medium', 'hard', 'expert' or 'mcts'.")
 
     def get_valid_ai_speed(prompt="Select the speed of the AI (seconds between moves, value between 0 and 10): "):
         while True:
@@ -59,12 +59,7 @@ def start_spectator(game):
         print(f"\nAI {current_player.color} ({current_player.level}) is thinking...")
 
         # Vérifier si le joueur actuel peut jouer
-        can_play = any(
-            game.board.find_valid_moves(variant, current_player.color)
-            for piece_id in current_player.remaining_pieces
-            for piece in [current_player.pieces[piece_id]]
-            for variant in piece.get_all_variations()
-        )
+        can_play = game.board.has_any_move(current_player.color, current_player.remaining_pieces)
 
         if can_play:
             current_player.play(game.board)
@@ -74,12 +69,7 @@ def start_spectator(game):
 
         # Vérifier si la partie est terminée
         game_over = all(
-            not any(
-                game.board.find_valid_moves(variant, player.color)
-                for piece_id in player.remaining_pieces
-                for piece in [player.pieces[piece_id]]
-                for variant in piece.get_all_variations()
-            )
+            not game.board.has_any_move(player.color, player.remaining_pieces)
             for player in game.players
         )
 
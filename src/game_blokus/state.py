@@ -1,4 +1,4 @@
-from typing import List, Set, Tuple
+from typing import List, Optional, Set, Tuple
 from dataclasses import dataclass
 
 
@@ -8,4 +8,7 @@ class GameState:
     board_state: List[List[int]]
     current_player: int
     player_pieces: List[Set[int]]
-    player_corners: List[Set[Tuple[int, int]]]
\ No newline at end of file
+    player_corners: List[Set[Tuple[int, int]]]
+    seed: Optional[int] = None
+    # State of the game's generator, then of each player's (None for humans)
+    rng_states: Optional[List[Optional[list]]] = None
@@ -0,0 +1,238 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict, List
+
+from .game import BlokusGame
+from .display import compute_scores
+
+ELO_START = 1500.0
+ELO_K = 16.0
+
+
+def seat_levels(levels: List[str], game_index: int, rotate: bool) -> List[str]:
+    """
+    Return the bot level sitting at each color for a game.
+
+    Args:
+        levels (List[str]): The levels in seat order (color 1 first).
+        game_index (int): The index of the game in the tournament.
+        rotate (bool): Whether seats rotate by one color from one game to the next.
+
+    Returns:
+        List[str]: The level of each seat for this game.
+    """
+    if not rotate:
+        return list(levels)
+    shift = game_index % len(levels)
+    return list(levels[shift:]) + list(levels[:shift])
+
+
+def play_game(game_index: int, levels: List[str], seed: int, time_budget: float = 1.0) -> Dict:
+    """
+    Play one headless bot-vs-bot game to the end.
+
+    Args:
+        game_index (int): The index of the game in the tournament.
+        levels (List[str]): The bot level of each seat, color 1 first.
+        seed (int): The random seed of the game.
+        time_budget (float): The thinking time per move of the search levels.
+
+    Returns:
+        Dict: The game result: seats, final scores, moves and think time per move.
+    """
+    game = BlokusGame(num_players=len(levels), ai_levels=levels, seed=seed)
+    for bot in game.players:
+        bot.time_budget = time_budget
+    think_times = {bot.color: [] for bot in game.players}
+
+    # Bots print their moves: keep the runner quiet
+    with contextlib.redirect_stdout(io.StringIO()):
+        passes = 0
+        while passes < len(game.players):
+            bot = game.players[game.current_player]
+            if game.board.has_any_move(bot.color, bot.remaining_pieces):
+                start = time.perf_counter()
+                bot.play(game.board)
+                think_times[bot.color].append(time.perf_counter() - start)
+                passes = 0
+            else:
+                passes += 1
+            game.current_player = (game.current_player + 1) % len(game.players)
+        for bot in game.players:
+            bot.close()
+
+    return {
+        'game': game_index,
+        'seed': seed,
+        'seats': {bot.color: bot.level for bot in game.players},
+        'scores': compute_scores(game),
+        'moves': {color: len(times) for color, times in think_times.items()},
+        'think_times': think_times,
+    }
+
+
+def run_tournament(levels: List[str], games: int, seed: int = 0, rotate: bool = True,
+                   workers: int = 1, time_budget: float = 1.0) -> List[Dict]:
+    """
+    Play a series of games, in parallel across processes when workers > 1.
+
+    Args:
+        levels (List[str]): The bot level of each seat (2 to 4 seats).
+        games (int): The number of games to play.
+        seed (int): The seed of the first game; game i uses seed + i.
+        rotate (bool): Whether seats rotate from one game to the next.
+        workers (int): The number of worker processes.
+        time_budget (float): The thinking time per move of the search levels.
+
+    Returns:
+        List[Dict]: The results of play_game, in game order.
+    """
+    if not 2 <= len(levels) <= 4:
+        raise ValueError("A tournament needs between 2 and 4 seats")
+    jobs = [(index, seat_levels(levels, index, rotate), seed + index, time_budget)
+            for index in range(games)]
+    if workers <= 1:
+        return [play_game(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(play_game, *zip(*jobs)))
+
+
+def result_rows(results: List[Dict]) -> List[Dict]:
+    """
+    Flatten game results into one row per seat.
+
+    Args:
+        results (List[Dict]): The results of play_game.
+
+    Returns:
+        List[Dict]: One row per game and seat, with its score and think time.
+    """
+    rows = []
+    for result in results:
+        for rank, score in enumerate(result['scores'], 1):
+            color = score['color']
+            times = result['think_times'][color]
+            rows.append({
+                'game': result['game'],
+                'seed': result['seed'],
+                'color': color,
+                'level': result['seats'][color],
+                'rank': rank,
+                'score': score['score'],
+                'placed': score['placed'],
+                'remaining': score['remaining'],
+                'moves': result['moves'][color],
+                'think_total': round(sum(times), 6),
+                'think_max': round(max(times, default=0.0), 6),
+            })
+    return rows
+
+
+def write_results(results: List[Dict], path: str) -> None:
+    """
+    Write results as CSV (one row per seat) or JSONL (one game per line, with every
+    think time), depending on the file extension.
+
+    Args:
+        results (List[Dict]): The results of play_game.
+        path (str): The output file, ending in .csv or .jsonl.
+    """
+    if path.endswith('.jsonl'):
+        with open(path, 'w') as f:
+            for result in results:
+                f.write(json.dumps(result) + '\n')
+        return
+    rows = result_rows(results)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ['game'])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def summarize(results: List[Dict]) -> Dict[str, Dict]:
+    """
+    Compute win rate, mean score and Elo rating of each bot level.
+
+    Every game counts as one pairwise match between each pair of seats, scored
+    by final score (ties are draws). Ratings are updated game by game with
+    K split between the opponents of each seat. A win shared by several
+    seats is split between them.
+
+    Args:
+        results (List[Dict]): The results of play_game, in game order.
+
+    Returns:
+        Dict[str, Dict]: For each level, its games, wins, win_rate, mean_score and elo.
+    """
+    summary = {}
+    for result in results:
+        for level in result['seats'].values():
+            summary.setdefault(level, {'games': 0, 'wins': 0.0, 'total_score': 0, 'elo': ELO_START})
+
+    for result in results:
+        scores = {score['color']: score['score'] for score in result['scores']}
+        best = max(scores.values())
+        winners = [color for color, score in scores.items() if score == best]
+        for color, score in scores.items():
+            stats = summary[result['seats'][color]]
+            stats['games'] += 1
+            stats['total_score'] += score
+            if color in winners:
+                stats['wins'] += 1.0 / len(winners)
+
+        k = ELO_K / (len(scores) - 1)
+        deltas = {color: 0.0 for color in scores}
+        for first, second in combinations(scores, 2):
+            first_elo = summary[result['seats'][first]]['elo']
+            second_elo = summary[result['seats'][second]]['elo']
+            expected = 1.0 / (1.0 + 10 ** ((second_elo - first_elo) / 400.0))
+            outcome = 1.0 if scores[first] > scores[second] else 0.5 if scores[first] == scores[second] else 0.0
+            deltas[first] += k * (outcome - expected)
+            deltas[second] -= k * (outcome - expected)
+        for color, delta in deltas.items():
+            summary[result['seats'][color]]['elo'] += delta
+
+    for stats in summary.values():
+        stats['win_rate'] = stats['wins'] / stats['games']
+        stats['mean_score'] = stats.pop('total_score') / stats['games']
+    return summary
+
+
+def print_summary(summary: Dict[str, Dict]) -> None:
+    """Print the per-level summary, best Elo first."""
+    print(f"{'level':<10}{'games':>7}{'wins':>8}{'win rate':>10}{'mean score':>12}{'elo':>8}")
+    for level, stats in sorted(summary.items(), key=lambda item: item[1]['elo'], reverse=True):
+        print(f"{level:<10}{stats['games']:>7}{stats['wins']:>8.1f}{stats['win_rate']:>10.1%}"
+              f"{stats['mean_score']:>12.1f}{stats['elo']:>8.0f}")
+
+
+def main(argv: List[str] = None) -> None:
+    """Command line entry point: python -m game_blokus.tournament."""
+    parser = argparse.ArgumentParser(description="Play headless Blokus bot-vs-bot tournaments.")
+    parser.add_argument('--levels', nargs='+', default=['easy', 'medium', 'hard', 'expert'],
+                        help="bot level of each seat, color 1 first (2 to 4 seats)")
+    parser.add_argument('--games', type=int, default=10, help="number of games to play")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument('--no-rotate', action='store_true', help="keep every level on the same seat")
+    parser.add_argument('--workers', type=int, default=1, help="number of games played in parallel")
+    parser.add_argument('--time-budget', type=float, default=1.0,
+                        help="thinking time per move of the search levels, in seconds")
+    parser.add_argument('--output', help="write per-game results to this .csv or .jsonl file")
+    args = parser.parse_args(argv)
+
+    results = run_tournament(args.levels, args.games, seed=args.seed, rotate=not args.no_rotate,
+                             workers=args.workers, time_budget=args.time_budget)
+    if args.output:
+        write_results(results, args.output)
+    print_summary(summarize(results))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,5 +1,10 @@
 import os
+import random
 
 def clear_screen():
     """Nettoie l'écran de manière cross-platform"""
     os.system('cls' if os.name == 'nt' else 'clear')
+
+def new_seed() -> int:
+    """Tire une graine de 32 bits pour une nouvelle partie, indépendamment du module random"""
+    return random.SystemRandom().getrandbits(32)
@@ -2,20 +2,35 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
+import asyncio
+import importlib.util
+import pickle
+import random
+import socket
+import threading
+import time
 import unittest
 
 from io import StringIO
 from unittest.mock import patch, MagicMock, call
-from game_blokus.display import display_final_score
+from game_blokus.display import display_final_score, compute_scores
 from game_blokus.game import BlokusGame
-from game_blokus.board import Board
+from game_blokus.board import Board, BitBoard, NumpyBoard
 from game_blokus.player import Player
-from game_blokus.piece import Piece
+from game_blokus.piece import Piece, ORIENTATIONS, get_orientation
 from game_blokus.save_load import save_game, load_game
 from game_blokus.bot_player import BotPlayer
 from game_blokus.network_client import BlokusClient
-from game_blokus.server import BlokusServer
+from game_blokus.server import SNAPSHOT_THRESHOLD, BlokusServer
 from game_blokus.spectactor import start_spectator
+from game_blokus.tournament import play_game, run_tournament, summarize, write_results
+from game_blokus.perft import REFERENCE_COUNTS, divide, initial_hands, perft
+from game_blokus.opening_book import OpeningBook, canonical_key, get_default_book
+from game_blokus.endgame import EndgameSolver
+from game_blokus.analysis import RegionAnalysis
+from game_blokus.framing import FrameError, FrameReader, encode_frame, encode_frames, read_frame
+from game_blokus.protocol import (PROTOCOL_VERSION, ProtocolError, decode_message, decode_varint,
+                                  encode_message, encode_varint, negotiate_codec)
 
 class TestBlokusGame(unittest.TestCase ):
     def setUp(self):
@@ -73,6 +88,52 @@ class TestBlokusGame(unittest.TestCase ):
         self.assertEqual(self.game.current_player, 0)
         self.assertEqual(len(self.game.players), 4)
 
+    def test_save_and_load_seed(self):
+        """Test that the game seed is saved and restored."""
+        game = BlokusGame(num_players=2, ai_levels=["easy"], seed=1234)
+        save_game(game, self.test_filename)
+        self.game.seed = 1
+        self.assertTrue(load_game(self.game, self.test_filename))
+        self.assertEqual(self.game.seed, 1234)
+
+    def test_load_replays_from_seed(self):
+        """Test that a loaded game continues like the saved one, whatever its generators did before."""
+        game = BlokusGame(num_players=2, ai_levels=["easy", "easy"], seed=99)
+        with patch('sys.stdout', new_callable=StringIO):
+            for turn in range(4):
+                game.players[turn % 2].play(game.board)
+            save_game(game, self.test_filename)
+            for turn in range(6):
+                game.players[turn % 2].play(game.board)
+            grids = []
+            for spent in (0, 50):
+                loaded = BlokusGame(num_players=2, ai_levels=["easy", "easy"], seed=7)
+                for _ in range(spent):
+                    loaded.players[0].rng.random()
+                self.assertTrue(load_game(loaded, self.test_filename))
+                for turn in range(6):
+                    loaded.players[turn % 2].play(loaded.board)
+                grids.append([row[:] for row in loaded.board.grid])
+        self.assertEqual(grids[0], game.board.grid)
+        self.assertEqual(grids[1], game.board.grid)
+
+    def test_seeded_games_replay(self):
+        """Test that a seed replays a bot game exactly."""
+        first = play_game(0, ["easy", "easy", "easy"], seed=42)
+        second = play_game(0, ["easy", "easy", "easy"], seed=42)
+        self.assertEqual(first['scores'], second['scores'])
+        self.assertEqual(first['moves'], second['moves'])
+
+        # Playout-bounded searches replay too
+        grids = []
+        for _ in range(2):
+            game = BlokusGame(num_players=2, ai_levels=["mcts", "easy"], seed=5)
+            game.players[0].playouts = 10
+            with patch('sys.stdout', new_callable=StringIO):
+                game.players[0].play(game.board)
+            grids.append([row[:] for row in game.board.grid])
+        self.assertEqual(grids[0], grids[1])
+
     def test_load_nonexistent_file(self):
         """Test loading a non-existent save file."""
         loaded = load_game(self.game, "non_existent_file.json")
@@ -209,7 +270,27 @@ class TestBlokusGame(unittest.TestCase ):
         piece = Piece([[1, 1], [1, 0]], 0)
         self.board.place_piece(piece, 0, 0, 1)
         self.assertNotIn((0, 0), self.board.board_corners)
-        self.assertIn((1, 1), self.board.corners[1])
+        # (1, 1) shares edges with the piece, so it is not a live corner
+        self.assertEqual(self.board.corners[1], {(1, 2), (2, 1)})
+        self.assertEqual(self.board.corner_count(1), 2)
+
+    def test_corners_pruned_for_every_color(self):
+        """Test that live corners stay exact as the board fills up."""
+        for board in (Board(), BitBoard()):
+            board.place_piece(Piece([[1]], 0), 0, 0, 1)
+            self.assertEqual(board.corners[1], {(1, 1)})
+            # Another color covering the corner kills it
+            board.place_piece(Piece([[1]], 0), 1, 1, 2)
+            self.assertEqual(board.corners[1], set())
+            self.assertEqual(board.corner_count(1), 0)
+            # A blocked player does not get a second first move
+            self.assertFalse(board.is_valid_move(Piece([[1]], 0), 19, 19, 1))
+            self.assertEqual(board.find_all_moves(1, range(21)), [])
+            # Same-color edge contact kills the corner too
+            board.place_piece(Piece([[1, 1]], 1), 2, 2, 2)
+            self.assertNotIn((2, 1), board.corners[2])
+            self.assertNotIn((3, 2), board.corners[2])
+            self.assertIn((3, 4), board.corners[2])
 
     def test_get_valid_adjacent(self):
         """Test getting valid adjacent positions."""
@@ -261,6 +342,209 @@ class TestBlokusGame(unittest.TestCase ):
         can_place = self.board.can_place_piece(piece, 1)
         self.assertTrue(can_place)
 
+    def test_game_uses_bitboard(self):
+        """Test that the game runs on the bitboard engine."""
+        self.assertIsInstance(self.game.board, BitBoard)
+
+    def test_bitboard_matches_board(self):
+        """Test that BitBoard accepts exactly the same moves as Board."""
+        reference, bitboard = Board(), BitBoard()
+        pieces = Player(1).pieces
+        for turn in range(12):
+            color = turn % 4 + 1
+            piece = pieces[20 - turn]
+            self.assertEqual(sorted(reference.find_valid_moves(piece, color)),
+                             sorted(bitboard.find_valid_moves(piece, color)))
+            for x in range(-1, 20):
+                for y in range(-1, 20):
+                    self.assertEqual(reference.is_valid_move(piece, x, y, color),
+                                     bitboard.is_valid_move(piece, x, y, color))
+            moves = reference.find_valid_moves(piece, color)
+            if moves:
+                reference.place_piece(piece, *moves[0], color)
+                bitboard.place_piece(piece, *moves[0], color)
+        self.assertEqual(reference.grid, bitboard.grid)
+
+    def test_find_all_moves(self):
+        """Test that the corner-anchored generator finds every legal placement."""
+        reference, bitboard = Board(), BitBoard()
+        for turn in range(6):
+            color = turn % 4 + 1
+            expected = {
+                (piece_id, orientation.orientation_id, x, y)
+                for piece_id in range(21)
+                for orientation in ORIENTATIONS[piece_id]
+                for x in range(-1, 20) for y in range(-1, 20)
+                if bitboard.is_valid_move(orientation, x, y, color)
+            }
+            for board in (reference, bitboard):
+                moves = board.find_all_moves(color, range(21))
+                self.assertEqual(len(moves), len(set(moves)))
+                self.assertEqual(set(moves), expected)
+            piece_id, orientation_id, x, y = sorted(expected)[-1]
+            reference.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+            bitboard.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+
+    def test_legal_moves_cache(self):
+        """Test that cached move lists stay exact across placements and undo."""
+        board = BitBoard()
+        for turn in range(10):
+            for color in range(1, 5):
+                self.assertEqual(sorted(board.legal_moves(color, range(21))),
+                                 sorted(board.find_all_moves(color, range(21))))
+            if turn == 7:
+                board.undo()
+                continue
+            color = turn % 4 + 1
+            piece_id, orientation_id, x, y = board.legal_moves(color, range(21))[-1]
+            board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+        self.assertEqual(sorted(board.find_valid_moves(ORIENTATIONS[0][0], 1)),
+                         sorted((x, y) for _, _, x, y in board.find_all_moves(1, [0])))
+        self.assertTrue(board.can_place_piece(Piece([[1, 1, 1, 1, 1, 1]], 99), 1))
+
+    def test_has_any_move(self):
+        """Test the short-circuit move query and the blocked-player memo."""
+        board = BitBoard()
+        self.assertTrue(board.has_any_move(1, range(21)))
+        self.assertFalse(board.has_any_move(1, []))
+        for x in range(20):
+            for y in range(20):
+                if (x, y) != (19, 19):
+                    list.__setitem__(board.grid[x], y, 2)
+        board.grid = [list(row) for row in board.grid]
+        self.assertFalse(board.has_any_move(1, [5, 6]))
+        self.assertFalse(board.has_any_move(1, [5]))
+        self.assertTrue(board.has_any_move(1, [0]))
+        self.assertEqual(board._blocked[1][1], frozenset({5, 6}))
+
+        board = BitBoard()
+        board.place_piece(ORIENTATIONS[0][0], 19, 19, 1)
+        board._blocked[1] = (1, frozenset(range(21)))
+        self.assertFalse(board.has_any_move(1, range(21)))
+        board.undo()
+        self.assertNotIn(1, board._blocked)
+        self.assertTrue(board.has_any_move(1, range(21)))
+
+    def test_board_backend(self):
+        """Test that the board backend is chosen at construction."""
+        self.assertIs(type(Board()), Board)
+        self.assertIs(type(Board(backend="bitboard")), BitBoard)
+        with self.assertRaises(ValueError):
+            Board(backend="cuda")
+
+    @unittest.skipIf(importlib.util.find_spec("numpy") is None, "NumPy is not installed")
+    def test_numpy_legal_anchor_mask(self):
+        """Test the vectorized anchor mask against is_valid_move."""
+        board = Board(backend="numpy")
+        self.assertIsInstance(board, NumpyBoard)
+        for turn in range(8):
+            color = turn % 4 + 1
+            for piece_id in (0, 4, 10, 20):
+                for orientation in ORIENTATIONS[piece_id]:
+                    for check_color in range(1, 5):
+                        mask = board.legal_anchor_mask(orientation, check_color)
+                        self.assertEqual(mask.shape, (20, 20))
+                        for x in range(20):
+                            for y in range(20):
+                                self.assertEqual(bool(mask[x, y]),
+                                                 board.is_valid_move(orientation, x, y, check_color))
+            piece_id, orientation_id, x, y = board.find_all_moves(color, range(21))[-1]
+            board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+        board.undo()
+        self.assertEqual(board.cells.tolist(), [list(row) for row in board.grid])
+
+    def test_undo_restores_board(self):
+        """Test that undo restores grid, corners and legality exactly."""
+        for board in (Board(), BitBoard()):
+            snapshots = []
+            for turn in range(8):
+                color = turn % 4 + 1
+                snapshots.append(([row[:] for row in board.grid],
+                                  {c: set(corners) for c, corners in board.corners.items()},
+                                  set(board.board_corners),
+                                  sorted(board.find_all_moves(color, range(21)))))
+                piece_id, orientation_id, x, y = board.find_all_moves(color, range(21))[0]
+                board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+            for turn in reversed(range(8)):
+                board.undo()
+                grid, corners, board_corners, moves = snapshots[turn]
+                self.assertEqual(board.grid, grid)
+                self.assertEqual(board.corners, corners)
+                self.assertEqual(board.board_corners, board_corners)
+                self.assertEqual(sorted(board.find_all_moves(turn % 4 + 1, range(21))), moves)
+            self.assertEqual(board.history, [])
+
+    def test_undo_only_last_record(self):
+        """Test that only the most recent placement can be undone."""
+        first = self.board.place_piece(Piece([[1]], 0), 0, 0, 1)
+        self.board.place_piece(Piece([[1]], 0), 19, 19, 2)
+        with self.assertRaises(ValueError):
+            self.board.undo(first)
+
+    def test_zobrist_key(self):
+        """Test that the Zobrist key is maintained on place, undo and grid writes."""
+        for board in (Board(), BitBoard()):
+            self.assertEqual(board.zobrist, 0)
+            first = board.place_piece(ORIENTATIONS[0][0], 0, 0, 1)
+            board.place_piece(ORIENTATIONS[1][0], 19, 18, 2)
+            key = board.zobrist
+            self.assertNotEqual(key, 0)
+
+            # Same position reached in another order
+            other = BitBoard()
+            other.place_piece(ORIENTATIONS[1][0], 19, 18, 2)
+            other.place_piece(ORIENTATIONS[0][0], 0, 0, 1)
+            self.assertEqual(other.zobrist, key)
+
+            # Recomputed from scratch after a grid assignment
+            other.grid = [row[:] for row in board.grid]
+            self.assertEqual(other.zobrist, key)
+
+            board.undo()
+            board.undo(first)
+            self.assertEqual(board.zobrist, 0)
+
+    def test_position_key(self):
+        """Test that the game position key covers hands and side to move."""
+        key = self.game.position_key()
+        self.game.current_player = 1
+        self.assertNotEqual(self.game.position_key(), key)
+        self.assertEqual(self.game.position_key(include_turn=False),
+                         self.game.position_key(include_turn=False))
+        hands_key = self.game.position_key(include_turn=False)
+        self.player1.remaining_pieces.discard(0)
+        self.assertNotEqual(self.game.position_key(include_turn=False), hands_key)
+
+    def test_bitboard_grid_writes(self):
+        """Test that direct writes to the grid view update the bitboard."""
+        bitboard = BitBoard()
+        piece = Piece([[1]], 0)
+        bitboard.grid[0][0] = 2
+        self.assertFalse(bitboard.is_valid_move(piece, 0, 0, 1))
+        self.assertFalse(bitboard.is_valid_move(piece, 0, 1, 2))
+        bitboard.grid = [[0] * 20 for _ in range(20)]
+        self.assertTrue(bitboard.is_valid_move(piece, 0, 0, 1))
+
+    def test_grid_cell_writes_sync_once(self):
+        """Test that filling the grid cell by cell resynchronizes the board only once, on the next read."""
+        for backend in ("python", "bitboard"):
+            board = Board(backend=backend)
+            board.place_piece(get_orientation(0), 0, 0, 1)
+            rows = [[(i + j) % 5 if j < 10 else 0 for j in range(20)] for i in range(20)]
+            with patch.object(type(board), '_sync_from_grid', autospec=True,
+                              side_effect=type(board)._sync_from_grid) as sync:
+                for i, row in enumerate(rows):
+                    for j, cell in enumerate(row):
+                        board.grid[i][j] = cell
+                self.assertEqual(sync.call_count, 0)
+                self.assertEqual(board.history, [])
+                board.corner_count(2)
+                self.assertEqual(sync.call_count, 1)
+            expected = Board(backend=backend)
+            expected.grid = rows
+            self.assertEqual((board.zobrist, board.squares_placed, board.corners),
+                             (expected.zobrist, expected.squares_placed, expected.corners))
+
     def test_display(self):
         """Test displaying the board."""
         piece = Piece([[1, 1], [1, 0]], 0)
@@ -305,10 +589,38 @@ class TestBlokusGame(unittest.TestCase ):
         self.assertEqual(self.board.grid[0][0], 1)
         self.assertNotIn(piece.piece_id, self.bot_easy.remaining_pieces)
     def test_get_all_variations(self):
-        """Test if all variations of a piece are generated."""
-        piece = self.bot_easy.get_remaining_pieces()[0]
-        variations = self.bot_easy._get_all_variations(piece)
-        self.assertGreaterEqual(len(variations), 8)  # At least 4 rotations and 4 flips
+        """Test if all distinct variations of a piece are generated."""
+        monomino = self.bot_easy.get_pieces()[0]
+        self.assertEqual(len(self.bot_easy._get_all_variations(monomino)), 1)
+        l_pentomino = self.bot_easy.get_pieces()[10]
+        variations = self.bot_easy._get_all_variations(l_pentomino)
+        self.assertEqual(len(variations), 8)  # 4 rotations and 4 flips, all distinct
+        self.assertEqual(len({v.shape for v in variations}), 8)
+
+    def test_orientation_table(self):
+        """Test the precomputed table of distinct orientations."""
+        self.assertEqual(sum(len(o) for o in ORIENTATIONS.values()), 91)
+        for piece_id, orientations in ORIENTATIONS.items():
+            for orientation_id, orientation in enumerate(orientations):
+                self.assertEqual(orientation.piece_id, piece_id)
+                self.assertEqual(orientation.orientation_id, orientation_id)
+                self.assertEqual(orientation.size, len(orientation.cells))
+        cross = ORIENTATIONS[19][0]
+        self.assertEqual(len(cross.corner_offsets), 8)
+        self.assertEqual(len(cross.edge_offsets), 8)
+        self.assertEqual(hash(cross), hash(ORIENTATIONS[19][0]))
+        with self.assertRaises(AttributeError):
+            cross.piece_id = 3
+
+    def test_get_orientation(self):
+        """Test that (rotation, flip) map to the same shape as flip then rotate."""
+        piece = self.player1.pieces[20]
+        for flip in (False, True):
+            current = piece.flip() if flip else piece
+            for rotation in range(4):
+                expected = tuple(tuple(row) for row in current.shape)
+                self.assertEqual(get_orientation(20, rotation, flip).shape, expected)
+                current = current.rotate()
 
     def test_evaluate_move(self):
         """Test if a move is correctly evaluated."""
@@ -316,6 +628,27 @@ class TestBlokusGame(unittest.TestCase ):
         score = self.bot_easy._evaluate_move(self.board, piece, 0, 0, 10, 10)
         self.assertIsInstance(score, float)
 
+    def test_evaluate_moves_matches_evaluate_move(self):
+        """Test that the batched evaluator gives the same scores as _evaluate_move."""
+        for turn in range(8):
+            color = turn % 4 + 1
+            moves = self.board.legal_moves(color, range(21))
+            bot = BotPlayer(level="hard", color=color)
+            scores = bot._evaluate_moves(self.board, moves, 10, 10,
+                                         CENTER_WEIGHT=2.0, SIZE_WEIGHT=1.5, TERRITORY_WEIGHT=2.0)
+            self.assertEqual(len(scores), len(moves))
+            # The masks copied from the BitBoard match a scan of the grid
+            plain = Board()
+            plain.grid = [row[:] for row in self.board.grid]
+            self.assertEqual(bot._evaluate_moves(plain, moves, 10, 10, CENTER_WEIGHT=2.0, SIZE_WEIGHT=1.5,
+                                                 TERRITORY_WEIGHT=2.0), scores)
+            for (piece_id, orientation_id, x, y), score in zip(moves, scores):
+                self.assertEqual(score, bot._evaluate_move(self.board, ORIENTATIONS[piece_id][orientation_id],
+                                                           x, y, 10, 10, CENTER_WEIGHT=2.0,
+                                                           SIZE_WEIGHT=1.5, TERRITORY_WEIGHT=2.0))
+            piece_id, orientation_id, x, y = moves[scores.index(max(scores))]
+            self.board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+
     def test_play_easy_level(self):
         """Test if the bot can play at easy level."""
         self.board.grid[0][0] = 1  # Simulate a starting move
@@ -334,6 +667,214 @@ class TestBlokusGame(unittest.TestCase ):
         self.bot_hard.play(self.board)
         self.assertNotEqual(self.board.grid[0][0], 0)  # Ensure a move was made
 
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_play_expert_level(self, mock_stdout):
+        """Test that the expert bot searches within its budget and leaves the board consistent."""
+        bot = BotPlayer(level="expert", color=1, turn_order=[1, 2], time_budget=0.2)
+        self.board.place_piece(ORIENTATIONS[0][0], 0, 0, 1)
+        self.board.place_piece(ORIENTATIONS[0][0], 19, 19, 2)
+        bot.remaining_pieces.discard(0)
+        grid = [row[:] for row in self.board.grid]
+        bot.play(self.board)
+        self.assertGreaterEqual(bot.search_depth, 1)
+        self.assertEqual(len(self.board.history), 3)
+        self.assertEqual(len(bot.remaining_pieces), 19)
+        self.board.undo()
+        self.assertEqual(self.board.grid, grid)
+
+        bot.time_budget = 0  # Out of time: still plays the best-ordered move
+        self.assertTrue(bot._play_expert_move(self.board))
+        self.assertEqual(bot.search_depth, 0)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_play_mcts_level(self, mock_stdout):
+        """Test the MCTS bot: fixed playouts, stats, board restored and subtree reuse."""
+        bot = BotPlayer(level="mcts", color=1, turn_order=[1, 2], playouts=60)
+        bot.play(self.board)
+        self.assertEqual(bot.search_stats["playouts"], 60)
+        self.assertGreater(bot.search_stats["playouts_per_second"], 0)
+        self.assertEqual(len(self.board.history), 1)
+        self.assertEqual(sum(row.count(1) for row in self.board.grid), self.board.squares_placed[1])
+        self.assertIn("playouts/s", mock_stdout.getvalue())
+
+        subtree = bot._mcts_root
+        reply = max(subtree.children, key=lambda child: child.visits)
+        piece_id, orientation_id, x, y = reply.move
+        self.board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, 2)
+        self.assertIs(bot._reuse_mcts_root(self.board), reply)
+
+        bot = BotPlayer(level="mcts", color=2, turn_order=[1, 2], time_budget=0)
+        self.assertTrue(bot._play_mcts_move(self.board))  # Out of time: still one iteration
+        self.assertEqual(bot.search_stats["playouts"], 1)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_endgame_solver(self, mock_stdout):
+        """Test the endgame solver against a plain minimax and its use by the bots."""
+        game = BlokusGame(num_players=4, ai_levels=["easy"] * 4, seed=0)
+        board, turn_order = game.board, [1, 2, 3, 4]
+        hands = {bot.color: bot.remaining_pieces for bot in game.players}
+        turn = 0
+        while True:
+            bot = game.players[turn % 4]
+            solver = EndgameSolver(bot.color, turn_order)
+            if board.legal_moves(bot.color, hands[bot.color]) and solver.count_moves(board, hands, 8) <= 8:
+                break
+            bot.play(board)
+            turn += 1
+
+        def minimax(index, passes):
+            if passes == 4:
+                return solver._final_value(board, hands)
+            color = turn_order[index]
+            moves = board.legal_moves(color, hands[color])
+            if not moves:
+                return minimax((index + 1) % 4, passes + 1)
+            values = []
+            for piece_id, orientation_id, x, y in moves:
+                board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+                hands[color].remove(piece_id)
+                values.append(minimax((index + 1) % 4, 0))
+                hands[color].add(piece_id)
+                board.undo()
+            return max(values) if color == bot.color else min(values)
+
+        history = list(board.history)
+        move, value = solver.solve(board, hands)
+        self.assertEqual(value, minimax(turn_order.index(bot.color), 0))
+        self.assertEqual(board.history, history)
+        self.assertIsNone(EndgameSolver(bot.color, turn_order, max_nodes=1).solve(board, hands))
+        small = EndgameSolver(bot.color, turn_order, max_entries=4)
+        self.assertEqual(small.solve(board, hands)[1], value)
+        self.assertLessEqual(len(small.table), 4)
+
+        # Same cells, other hands: the stored values must not be reused
+        key = board.zobrist
+        piece_id = next(iter(hands[bot.color]))
+        hands[bot.color].remove(piece_id)
+        other = solver.solve(board, hands)
+        self.assertEqual(board.zobrist, key)
+        self.assertEqual(other[1], minimax(turn_order.index(bot.color), 0))
+        hands[bot.color].add(piece_id)
+
+        hard = BotPlayer(level="hard", color=bot.color)
+        hard.remaining_pieces = set(hands[bot.color])
+        hard.play(board)
+        record = board.history[-1]
+        self.assertEqual((record.piece.piece_id, record.piece.orientation_id, record.x, record.y), move)
+        self.assertIn("endgame", mock_stdout.getvalue())
+        board.undo()
+        hard = BotPlayer(level="hard", color=bot.color, endgame_threshold=0)
+        hard.remaining_pieces = set(hands[bot.color])
+        self.assertFalse(hard._play_endgame_move(board))
+
+    def test_infer_hands_without_history(self):
+        """Test that bots read the pieces off the grid when the history does not cover the board."""
+        board = BitBoard()
+        hands = {color: set(range(21)) for color in range(1, 5)}
+        rng = random.Random(11)
+        for turn in range(24):
+            color = turn % 4 + 1
+            piece_id, orientation_id, x, y = rng.choice(board.legal_moves(color, hands[color]))
+            board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+            hands[color].remove(piece_id)
+
+        loaded = BitBoard()
+        loaded.grid = [row[:] for row in board.grid]
+        self.assertEqual(loaded.history, [])
+        bot = BotPlayer("expert", 1, turn_order=range(1, 5))
+        bot.remaining_pieces = set(hands[1])
+        self.assertEqual(bot._infer_hands(loaded), hands)
+
+        # Moves played after the load are only partly in the history
+        piece_id, orientation_id, x, y = loaded.legal_moves(2, hands[2])[0]
+        loaded.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, 2)
+        hands[2].remove(piece_id)
+        self.assertEqual(bot._infer_hands(loaded), hands)
+
+    def test_region_analysis(self):
+        """Test incremental reachable regions against a fresh analysis, through placements and undos."""
+        board = BitBoard()
+        analysis = RegionAnalysis(board)
+        self.assertEqual(analysis.reachable_count(1), 400)
+        self.assertEqual(analysis.exclusive_counts(), {1: 0, 2: 0, 3: 0, 4: 0})
+
+        rng = random.Random(7)
+        hands = {color: set(range(21)) for color in range(1, 5)}
+        for turn in range(24):
+            color = turn % 4 + 1
+            moves = board.legal_moves(color, hands[color])
+            piece_id, orientation_id, x, y = move = rng.choice(moves)
+            self.assertEqual(analysis.denied_count(color, move),
+                             sum(1 for i, j in ORIENTATIONS[piece_id][orientation_id].cells
+                                 if any(analysis.reachable(other) >> ((x + i) * 21 + y + j) & 1
+                                        for other in range(1, 5) if other != color)))
+            board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+            hands[color].remove(piece_id)
+            if turn % 5 == 4:
+                analysis.sync()
+                hands[board.undo().color].add(piece_id)
+                board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, color)
+                hands[color].remove(piece_id)
+            fresh = RegionAnalysis(board)
+            for other in range(1, 5):
+                self.assertEqual(analysis.reachable(other), fresh.reachable(other))
+            self.assertEqual(analysis.exclusive_counts(), fresh.exclusive_counts())
+
+        # Every live corner is reachable, no occupied cell is
+        for color in range(1, 5):
+            cells = set(analysis.cells(analysis.reachable(color)))
+            self.assertTrue(board.corners[color] <= cells)
+            self.assertFalse(any(board.grid[x][y] for x, y in cells))
+
+        # A search pattern (place, evaluate, undo, place another) never reads the grid again
+        moves = board.legal_moves(1, hands[1])[:2]
+        last = board.history[-1]
+        with patch.object(RegionAnalysis, '_rebuild', autospec=True,
+                          side_effect=RegionAnalysis._rebuild) as rebuild:
+            searched = RegionAnalysis(board)
+            for piece_id, orientation_id, x, y in moves:
+                board.place_piece(ORIENTATIONS[piece_id][orientation_id], x, y, 1)
+                searched.exclusive_counts()
+                board.undo()
+            board.undo()  # Below the position the analysis started from
+            searched.exclusive_counts()
+            board.place_piece(last.piece, last.x, last.y, last.color)
+            searched.exclusive_counts()
+            self.assertEqual(rebuild.call_count, 1)
+        self.assertEqual(searched.exclusive_counts(), RegionAnalysis(board).exclusive_counts())
+
+        # A replaced grid is picked up
+        board.grid = [[0] * 20 for _ in range(20)]
+        self.assertEqual(analysis.reachable_count(2), 400)
+
+    def test_board_snapshot(self):
+        """Test that a compact snapshot rebuilds the same board."""
+        self.board.place_piece(ORIENTATIONS[10][0], 0, 0, 1)
+        self.board.place_piece(ORIENTATIONS[0][0], 19, 19, 2)
+        snapshot = self.board.snapshot()
+        self.assertEqual(len(snapshot), 1 + 20 * 20)
+        copy = BitBoard.from_snapshot(snapshot)
+        self.assertEqual(copy.grid, self.board.grid)
+        self.assertEqual(copy.corners, self.board.corners)
+        self.assertEqual(copy.zobrist, self.board.zobrist)
+        self.assertEqual(sorted(copy.legal_moves(3, range(21))), sorted(self.board.legal_moves(3, range(21))))
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_parallel_search(self, mock_stdout):
+        """Test that search levels fan out across worker processes."""
+        bot = BotPlayer(level="mcts", color=1, turn_order=[1, 2], playouts=20, workers=2)
+        try:
+            bot.play(self.board)
+            self.assertEqual(bot.search_stats["playouts"], 20)
+            bot.level, bot.time_budget = "expert", 0.3
+            self.board.place_piece(ORIENTATIONS[0][0], 19, 19, 2)
+            bot.play(self.board)
+            self.assertGreaterEqual(bot.search_depth, 1)
+        finally:
+            bot.close()
+        self.assertEqual(len(self.board.history), 3)
+        self.assertEqual(len(bot.remaining_pieces), 19)
+
     @patch('sys.stdout', new_callable=StringIO)
     def test_display_final_score(self, mock_stdout):
         """Test the display_final_score function."""
@@ -365,6 +906,17 @@ class TestBlokusGame(unittest.TestCase ):
         self.assertIn("Player 3:", output)
         self.assertIn("Player 4:", output)
 
+    def test_compute_scores(self):
+        """Test that final scores are computed and sorted without printing."""
+        piece = self.player2.pieces[10]
+        self.game.board.place_piece(piece, 0, 0, self.player2.color)
+        self.player2.remaining_pieces.remove(10)
+        scores = compute_scores(self.game)
+        self.assertEqual(scores[0]['color'], 2)
+        self.assertEqual(scores[0]['placed'], piece.size)
+        self.assertEqual(scores[0]['score'], piece.size - (89 - piece.size))
+        self.assertEqual([score['score'] for score in scores[1:]], [-89, -89, -89])
+
     @patch('sys.stdout', new_callable=StringIO)
     def test_display_final_score_sorted(self, mock_stdout):
         """Test the display_final_score function with sorted scores."""
@@ -405,6 +957,91 @@ class TestBlokusGame(unittest.TestCase ):
         self.assertIn("🥈", output)
         self.assertIn("🥉", output)
 
+    def test_tournament(self):
+        """Test headless games, result files and the per-level summary."""
+        results = run_tournament(["easy", "medium"], 2, seed=3)
+        self.assertEqual(results[0]['seats'], {1: "easy", 2: "medium"})
+        self.assertEqual(results[1]['seats'], {1: "medium", 2: "easy"})
+        self.assertEqual([result['scores'] for result in results],
+                         [result['scores'] for result in run_tournament(["easy", "medium"], 2, seed=3)])
+        for result in results:
+            self.assertEqual(len(result['scores']), 2)
+            for color, moves in result['moves'].items():
+                self.assertEqual(moves, len(result['think_times'][color]))
+
+        summary = summarize(results)
+        self.assertEqual(set(summary), {"easy", "medium"})
+        self.assertAlmostEqual(sum(stats['wins'] for stats in summary.values()), 2)
+        self.assertAlmostEqual(sum(stats['elo'] for stats in summary.values()), 3000)
+
+        for filename in ("test_tournament.csv", "test_tournament.jsonl"):
+            try:
+                write_results(results, filename)
+                with open(filename) as f:
+                    self.assertEqual(len(f.readlines()), 5 if filename.endswith(".csv") else 2)
+            finally:
+                os.remove(filename)
+
+    def test_perft(self):
+        """Test perft against the empty board reference counts, on every generator and backend."""
+        turn_order = [1, 2, 3, 4]
+        for backend in ("python", "bitboard"):
+            for generator in ("legal_moves", "find_all_moves"):
+                board = Board(backend=backend)
+                hands = initial_hands(turn_order)
+                for depth in (1, 2):
+                    self.assertEqual(perft(board, hands, turn_order, 0, depth, generator=generator),
+                                     REFERENCE_COUNTS[depth])
+                self.assertEqual(board.history, [])
+                self.assertEqual(hands, initial_hands(turn_order))
+
+        board = Board(backend="bitboard")
+        counts = divide(board, initial_hands(turn_order), turn_order, 0, 2)
+        self.assertEqual(len(counts), REFERENCE_COUNTS[1])
+        self.assertEqual(sum(counts.values()), REFERENCE_COUNTS[2])
+
+        # A stuck player passes: one node per pass, none once everyone has passed
+        board = Board(backend="bitboard")
+        hands = {color: set() for color in turn_order}
+        self.assertEqual(perft(board, hands, turn_order, 0, 4), 1)
+        self.assertEqual(perft(board, hands, turn_order, 0, 5), 0)
+        self.assertEqual(divide(board, hands, turn_order, 0, 2), {None: 1})
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_opening_book(self, mock_stdout):
+        """Test symmetry-normalized book keys, lookups, persistence and bot use."""
+        turn_order = [1, 2, 3, 4]
+        board, mirrored = Board(), Board()
+        board.place_piece(ORIENTATIONS[10][0], 0, 0, 1)
+        # Same opening by color 2, mirrored left-right: same key for the next color
+        original = ORIENTATIONS[10][0]
+        flipped = {(i, original.width - 1 - j) for i, j in original.cells}
+        orientation = next(o for o in ORIENTATIONS[10] if set(o.cells) == flipped)
+        mirrored.place_piece(orientation, 0, mirrored.size - orientation.width, 2)
+        self.assertEqual(canonical_key(board, 2, turn_order)[0], canonical_key(mirrored, 3, turn_order)[0])
+        self.assertNotEqual(canonical_key(board, 2, turn_order)[0], canonical_key(board, 2, [1, 2])[0])
+
+        book = OpeningBook()
+        move = board.legal_moves(2, range(21))[0]
+        book.add(board, 2, turn_order, move)
+        self.assertEqual(book.lookup(board, 2, turn_order), move)
+        piece_id, orientation_id, x, y = book.lookup(mirrored, 3, turn_order)
+        self.assertTrue(mirrored.is_valid_move(ORIENTATIONS[piece_id][orientation_id], x, y, 3))
+        self.assertIsNone(book.lookup(Board(), 1, turn_order))
+
+        try:
+            book.save("test_opening_book.json")
+            self.assertEqual(OpeningBook.load("test_opening_book.json").entries, book.entries)
+        finally:
+            os.remove("test_opening_book.json")
+
+        bot = BotPlayer(level="expert", color=3, turn_order=turn_order, time_budget=0.1, opening_book=book)
+        bot.play(mirrored)
+        self.assertEqual(mirrored.history[-1].piece.piece_id, piece_id)
+        self.assertEqual(bot.search_depth, 0)
+        self.assertIsNone(BotPlayer(level="expert", color=1, opening_book=False).opening_book)
+        self.assertIs(BotPlayer(level="mcts", color=1).opening_book, get_default_book())
+
     @patch('sys.stdout', new_callable=StringIO)
     def test_display_final_score_no_moves(self, mock_stdout):
         """Test the display_final_score function with no moves made."""
@@ -490,6 +1127,27 @@ class TestBlokusGame(unittest.TestCase ):
         self.assertTrue(result)
 
     
+    @patch('builtins.input', side_effect=[''] * 3)
+    def test_handle_game_commands_undo_redo(self, mock_input):
+        """Test the undo and redo commands of a local game."""
+        player = self.game.players[0]
+        self.game._place_piece(player, player.pieces[0], 0, 0, 0, 0, False)
+        self.assertEqual(self.game.current_player, 1)
+
+        self.assertTrue(self.game._handle_game_commands('u'))
+        self.assertEqual(self.game.board.grid[0][0], 0)
+        self.assertIn(0, player.remaining_pieces)
+        self.assertEqual(self.game.current_player, 0)
+
+        self.assertTrue(self.game._handle_game_commands('r'))
+        self.assertEqual(self.game.board.grid[0][0], 1)
+        self.assertNotIn(0, player.remaining_pieces)
+        self.assertEqual(self.game.current_player, 1)
+
+        self.game.move_history.clear()
+        self.assertTrue(self.game._handle_game_commands('u'))
+        self.assertEqual(self.game.board.grid[0][0], 1)
+
     def test_handle_special_player_states_bot(self):
         """Test handling special player states for bot players."""
         self.game.players[0] = BotPlayer(level="easy", color=1)
@@ -606,6 +1264,495 @@ class TestBlokusGame(unittest.TestCase ):
         self.assertNotIn(0, self.game.players[0].remaining_pieces)
 
 
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_async_server(self, mock_stdout):
+        """Test the asyncio server: handshake, game start, moves, turn errors and disconnection."""
+        async def scenario():
+            server = BlokusServer(host='127.0.0.1', port=0, backlog=16)
+            listener = await server.start_server()
+
+            async def connect():
+                reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+                return reader, writer
+
+            async def receive(reader):
+                return decode_message(await asyncio.wait_for(read_frame(reader), 5))
+
+            def send(writer, message):
+                writer.write(encode_frame(encode_message(message)))
+
+            try:
+                reader_old, writer_old = await connect()
+                send(writer_old, {'type': 'init', 'player_id': 'old', 'game_id': 'g', 'num_players': 2})
+                self.assertEqual((await receive(reader_old))['type'], 'error')
+                self.assertIsNone(await asyncio.wait_for(read_frame(reader_old), 5))
+                writer_old.close()
+
+                reader_a, writer_a = await connect()
+                send(writer_a, {'type': 'init', 'player_id': 'a', 'game_id': 'g', 'num_players': 2,
+                                'protocol': PROTOCOL_VERSION, 'codecs': ['json']})
+                welcome = await receive(reader_a)
+                self.assertEqual(welcome, {'type': 'welcome', 'protocol': PROTOCOL_VERSION, 'codec': 'json',
+                                           'resume_token': welcome['resume_token']})
+                self.assertEqual((await receive(reader_a))['type'], 'waiting')
+                reader_b, writer_b = await connect()
+                send(writer_b, {'type': 'init', 'player_id': 'b', 'game_id': 'g', 'protocol': PROTOCOL_VERSION})
+                self.assertEqual((await receive(reader_b))['type'], 'welcome')
+                for reader, number in ((reader_a, 0), (reader_b, 1)):
+                    message = await receive(reader)
+                    self.assertEqual((message['type'], message['player_number']), ('game_start', number))
+
+                send(writer_a, {'type': 'move', 'piece_id': 0, 'x': 0, 'y': 0, 'rotation': 0, 'flip': False, 'color': 1})
+                for reader in (reader_a, reader_b):
+                    message = await receive(reader)
+                    self.assertEqual((message['type'], message['current_player']), ('move', 1))
+                send(writer_a, {'type': 'move', 'piece_id': 1, 'x': 5, 'y': 5, 'rotation': 0, 'flip': False, 'color': 1})
+                self.assertEqual(await receive(reader_a), {'type': 'error', 'message': 'Not your turn'})
+                for move, reason in [({'piece_id': 1, 'x': 5, 'y': 5, 'color': 2}, 'Illegal move'),
+                                     ({'piece_id': 1, 'x': 19, 'y': 0, 'color': 1}, 'Not your color'),
+                                     ({'piece_id': 99, 'x': 19, 'y': 0, 'color': 2}, 'Unknown piece')]:
+                    send(writer_b, dict(move, type='move', rotation=0, flip=False))
+                    self.assertEqual(await receive(reader_b), {'type': 'error', 'message': reason})
+                send(writer_b, {'type': 'move', 'piece_id': 0, 'x': 19, 'y': 0, 'rotation': 0, 'flip': False, 'color': 2})
+                for reader in (reader_a, reader_b):
+                    message = await receive(reader)
+                    self.assertEqual((message['type'], message['color'], message['current_player']), ('move', 2, 0))
+                send(writer_a, {'type': 'move', 'piece_id': 0, 'x': 1, 'y': 1, 'rotation': 0, 'flip': False, 'color': 1})
+                self.assertEqual(await receive(reader_a), {'type': 'error', 'message': 'Piece already played'})
+                self.assertEqual(server.games['g']['board_state'].grid[19][0], 2)
+
+                writer_b.close()
+                message = await receive(reader_a)
+                self.assertEqual(message, {'type': 'player_disconnected', 'player_number': 1})
+                self.assertEqual(len(server.games['g']['players']), 1)
+                writer_a.close()
+                await asyncio.sleep(0.05)
+                self.assertEqual(server.games, {})
+                self.assertEqual(server.clients, {})
+            finally:
+                listener.close()
+                await listener.wait_closed()
+
+        asyncio.run(scenario())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_server_rejects_invalid_player_count(self, mock_stdout):
+        """Test that a game is only created for 2 to 4 players, each with a color of the rules engine."""
+        server = BlokusServer()
+        for num_players in (5, 1, 0, -3, '4', 2.0, True, None, [4]):
+            writer = MagicMock()
+            self.assertFalse(server._handle_client_initialization(writer, {
+                'type': 'init', 'player_id': 'p', 'game_id': 'g', 'num_players': num_players}))
+            payload = writer.write.call_args_list[-1][0][0]
+            self.assertEqual(decode_message(FrameReader().feed(payload)[0])['type'], 'error')
+            server.handle_client_disconnect(writer)
+            self.assertEqual((server.games, server.clients), ({}, {}))
+
+        writer = MagicMock()
+        self.assertTrue(server._handle_client_initialization(writer, {
+            'type': 'init', 'player_id': 'p', 'game_id': 'g', 'num_players': 4}))
+        self.assertEqual(server.games['g']['num_players'], 4)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_server_rules(self, mock_stdout):
+        """Test the server's rules engine: blocked players are skipped and the game over is detected."""
+        server = BlokusServer()
+        writers = [MagicMock(), MagicMock(), MagicMock()]
+        for number, writer in enumerate(writers):
+            server._register_client(writer, f'p{number}', 'g')
+            server._setup_or_join_game(writer, 'g', 3)
+        server._start_game('g')
+        game = server.games['g']
+        self.assertEqual(game['board_state'].squares_placed[1], 0)
+
+        def sent(writer):
+            frames = FrameReader()
+            messages = []
+            for args in writer.write.call_args_list:
+                messages.extend(decode_message(payload) for payload in frames.feed(args[0][0]))
+            writer.write.reset_mock()
+            return messages
+
+        for writer in writers:
+            sent(writer)
+        # Player 2 has nothing left to play: the turn goes from player 1 to player 3
+        game['hands'][2] = set()
+        server._handle_move(writers[0], 'g', {'type': 'move', 'piece_id': 0, 'x': 0, 'y': 0,
+                                              'rotation': 0, 'flip': False, 'color': 1, 'player_id': 'p0'})
+        message = sent(writers[1])[0]
+        self.assertEqual(sent(writers[2]), [message])
+        self.assertEqual((message['type'], message['current_player']), ('move', 2))
+        self.assertNotIn('player_id', message)
+        self.assertEqual(game['hands'][1], set(range(1, 21)))
+
+        # Once nobody can move, the last move is followed by the final scores
+        game['hands'][1] = set()
+        game['hands'][3] = {0}
+        server._handle_move(writers[2], 'g', {'type': 'move', 'piece_id': 0, 'orientation_id': 0,
+                                              'x': 19, 'y': 19, 'color': 3})
+        self.assertEqual(server._handle_move(writers[2], 'g', {'type': 'move'}), None)
+        messages = sent(writers[2])
+        self.assertEqual([message['type'] for message in messages], ['move', 'game_over', 'error'])
+        self.assertTrue(game['finished'])
+        self.assertEqual([(score['color'], score['score']) for score in messages[1]['scores']], [(1, 1), (3, 1), (2, 0)])
+        self.assertEqual(messages[2]['message'], 'The game is over')
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_rejoin_and_state_sync(self, mock_stdout):
+        """Test rejoining a started game: missed moves are replayed, or a snapshot is sent if too many."""
+        server = BlokusServer()
+        writers = [MagicMock() for _ in range(4)]
+        for number, writer in enumerate(writers):
+            self.assertTrue(server._handle_client_initialization(writer, {
+                'type': 'init', 'player_id': f'p{number}', 'game_id': 'g', 'num_players': 4}))
+        game = server.games['g']
+        rng = random.Random(3)
+
+        def play(count):
+            for _ in range(count):
+                color = game['current_player'] + 1
+                piece_id, orientation_id, x, y = rng.choice(game['board_state'].legal_moves(color, game['hands'][color]))
+                server._handle_move(writers[color - 1], 'g', {'type': 'move', 'piece_id': piece_id,
+                                                              'orientation_id': orientation_id,
+                                                              'x': x, 'y': y, 'color': color})
+
+        def sent(writer):
+            frames = FrameReader()
+            return [decode_message(payload) for args in writer.write.call_args_list
+                    for payload in frames.feed(args[0][0])]
+
+        def token(writer):
+            return sent(writer)[0]['resume_token']
+
+        tokens = [token(writer) for writer in writers]
+        self.assertEqual(len(set(tokens)), 4)
+        play(6)
+        self.assertEqual([move['seq'] for move in game['log']], list(range(1, 7)))
+        server.handle_client_disconnect(writers[1])
+        self.assertEqual(game['seats'][1], 'p1')
+        self.assertEqual(sent(writers[0])[-1], {'type': 'player_disconnected', 'player_number': 1})
+        play(2)
+
+        # Opponents know the player number, never the player ID or the token: neither
+        # is enough to take the seat
+        self.assertFalse(any('p1' in str(message) or tokens[1] in str(message) for message in sent(writers[0])))
+        for resume_token in (None, tokens[0], 42):
+            thief = MagicMock()
+            self.assertFalse(server._handle_client_initialization(thief, {
+                'type': 'init', 'player_id': 'p1', 'game_id': 'g', 'last_seq': 0, 'resume_token': resume_token}))
+            self.assertEqual(sent(thief)[-1], {'type': 'error', 'message': 'Invalid resume token'})
+            server.handle_client_disconnect(thief)
+        self.assertEqual(len(game['players']), 3)
+
+        # Back after missing a few moves: only those are sent, in one write
+        writers[1] = MagicMock()
+        self.assertTrue(server._handle_client_initialization(writers[1], {
+            'type': 'init', 'player_id': 'p1', 'game_id': 'g', 'last_seq': 5, 'resume_token': tokens[1]}))
+        messages = sent(writers[1])
+        self.assertEqual([message['type'] for message in messages], ['welcome', 'resume', 'move', 'move', 'move'])
+        self.assertEqual(writers[1].write.call_count, 2)
+        self.assertEqual(messages[1]['player_number'], 1)
+        self.assertEqual([message['seq'] for message in messages[2:]], [6, 7, 8])
+        self.assertEqual(sent(writers[0])[-1], {'type': 'player_reconnected', 'player_number': 1})
+
+        # Strangers cannot join a started game
+        intruder = MagicMock()
+        self.assertFalse(server._handle_client_initialization(intruder, {
+            'type': 'init', 'player_id': 'stranger', 'game_id': 'g'}))
+        self.assertEqual(sent(intruder)[-1], {'type': 'error', 'message': 'Game already started'})
+        server.handle_client_disconnect(intruder)
+        self.assertEqual(len(game['players']), 4)
+
+        # The seat now takes the token of the new connection only
+        stale = writers[1]
+        thief = MagicMock()
+        self.assertFalse(server._handle_client_initialization(thief, {
+            'type': 'init', 'player_id': 'p1', 'game_id': 'g', 'last_seq': 8, 'resume_token': tokens[1]}))
+        server.handle_client_disconnect(thief)
+        stale.close.assert_not_called()
+
+        # A rejoin before the server saw the old connection drop replaces it
+        writers[1] = MagicMock()
+        self.assertTrue(server._handle_client_initialization(writers[1], {
+            'type': 'init', 'player_id': 'p1', 'game_id': 'g', 'last_seq': 8, 'resume_token': token(stale)}))
+        stale.close.assert_called_once()
+        self.assertNotIn(stale, server.clients)
+        self.assertEqual(len(game['players']), 4)
+        self.assertEqual([message['type'] for message in sent(writers[1])], ['welcome', 'resume'])
+        server.handle_client_disconnect(stale)
+        self.assertIn(writers[1], game['players'])
+
+        # Too far behind: a snapshot replaces the moves
+        play(SNAPSHOT_THRESHOLD)
+        server.handle_client_disconnect(writers[2])
+        writers[2] = MagicMock()
+        server._handle_client_initialization(writers[2], {'type': 'init', 'player_id': 'p2', 'game_id': 'g',
+                                                          'last_seq': 1, 'resume_token': tokens[2]})
+        messages = sent(writers[2])
+        self.assertEqual([message['type'] for message in messages], ['welcome', 'resume', 'snapshot'])
+        self.assertEqual(messages[2]['seq'], len(game['log']))
+        self.assertEqual(messages[2]['board'], game['board_state'].snapshot())
+        self.assertEqual({color: set(hand) for color, hand in messages[2]['hands'].items()}, game['hands'])
+
+        # The client rebuilds the same state from the snapshot
+        client_game = BlokusGame(num_players=4)
+        for message in messages[1:]:
+            client_game.handle_network_message(message)
+        self.assertEqual(client_game.board.grid, game['board_state'].grid)
+        self.assertEqual(client_game.players[0].remaining_pieces, game['hands'][1])
+        self.assertEqual((client_game.player_number, client_game.current_player), (2, game['current_player']))
+
+        # ...or from the replayed moves
+        client_game = BlokusGame(num_players=4)
+        for message in [{'type': 'resume', 'player_number': 2, 'current_player': 0, 'total_players': 4}] + game['log']:
+            client_game.handle_network_message(decode_message(encode_message(message)))
+        self.assertEqual(client_game.board.grid, game['board_state'].grid)
+        self.assertEqual(client_game.players[3].remaining_pieces, game['hands'][4])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_server_drops_stalled_client(self, mock_stdout):
+        """Test that a client whose buffer never drains is dropped, and a reading one is kept."""
+        async def scenario():
+            server = BlokusServer()
+            stalled, reading = MagicMock(), MagicMock()
+            # The stalled client never drains, the reading one at once
+            for writer, drain in ((stalled, asyncio.Event().wait), (reading, lambda: asyncio.sleep(0))):
+                writer.transport.get_write_buffer_size.return_value = 1 << 20
+                writer.transport.get_write_buffer_limits.return_value = (16 * 1024, 64 * 1024)
+                writer.drain.side_effect = drain
+                server._register_client(writer, str(id(writer)), 'g')
+                server._setup_or_join_game(writer, 'g', 3)
+            with patch('game_blokus.server.DRAIN_TIMEOUT', 0.05):
+                server.broadcast_to_game('g', {'type': 'waiting', 'message': 'Waiting...'})
+                server.send_message(stalled, {'type': 'waiting', 'message': 'Waiting...'})
+                self.assertEqual(len(server._drains), 2)  # One pending drain per client
+                await asyncio.sleep(0.2)
+            self.assertNotIn(stalled, server.clients)
+            stalled.transport.abort.assert_called_once()
+            self.assertIn(reading, server.clients)
+            self.assertEqual(server._drains, {})
+            self.assertIn("stalled", mock_stdout.getvalue())
+
+        asyncio.run(scenario())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_online_game_reconnects(self, mock_stdout):
+        """Test end to end that a game whose connection drops rejoins and gets only the moves it missed."""
+        loop = asyncio.new_event_loop()
+        server = BlokusServer(host='127.0.0.1', port=0)
+        loop.run_until_complete(server.start_server())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+
+        def wait_for(condition):
+            deadline = time.monotonic() + 5
+            while not condition():
+                self.assertLess(time.monotonic(), deadline, "timed out")
+                time.sleep(0.01)
+
+        # The reconnection waits until the other player has moved
+        moved = threading.Event()
+        reconnect = BlokusClient.reconnect
+        games = [BlokusGame(num_players=2), BlokusGame(num_players=2)]
+        try:
+            with patch('game_blokus.game.BlokusClient', lambda: BlokusClient('127.0.0.1', server.port)), \
+                 patch.object(BlokusClient, 'reconnect', lambda client: moved.wait(5) and reconnect(client)):
+                games[0].setup_online_game(2)
+                games[1].setup_online_game(None, games[0].network_client.game_id)
+                wait_for(lambda: games[0].player_number == 0 and games[1].player_number == 1)
+                first, second = (game.network_client for game in games)
+
+                first.send_move({'piece_id': 0, 'x': 0, 'y': 0, 'rotation': 0, 'flip': False, 'color': 1})
+                wait_for(lambda: second.last_seq == 1 and first.last_seq == 1)
+                first.client_socket.shutdown(socket.SHUT_RDWR)  # The connection drops
+                wait_for(lambda: len(server.games[first.game_id]['players']) == 1)
+
+                second.send_move({'piece_id': 0, 'x': 19, 'y': 0, 'rotation': 0, 'flip': False, 'color': 2})
+                wait_for(lambda: second.last_seq == 2)
+                moved.set()
+                wait_for(lambda: first.connected and first.last_seq == 2)
+            self.assertIn("Reconnected to the game!", mock_stdout.getvalue())
+            board = server.games[first.game_id]['board_state']
+            for game in games:
+                self.assertEqual(game.board.grid, board.grid)
+                self.assertEqual([len(player.remaining_pieces) for player in game.players], [20, 20])
+                self.assertEqual(game.current_player, 0)
+
+            games[0].handle_network_message({'type': 'welcome', 'protocol': PROTOCOL_VERSION, 'codec': 'json'})
+            games[0].handle_network_message({'type': 'game_over', 'scores': [
+                {'color': 2, 'remaining': 88, 'placed': 1, 'score': -87},
+                {'color': 1, 'remaining': 88, 'placed': 1, 'score': -87}]})
+            self.assertTrue(games[0].game_over)
+            self.assertIn("1 squares placed, 88 remaining", mock_stdout.getvalue())
+        finally:
+            for game in games:
+                if game.network_client:
+                    game.network_client.close()
+            wait_for(lambda: not server.clients)  # Every connection handler is done
+
+            async def shutdown():
+                server.server.close()
+                await server.server.wait_closed()
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def test_framing(self):
+        """Test frames split across reads, pipelined in one read, and oversized headers."""
+        messages = [{'type': 'move', 'piece_id': piece_id, 'x': piece_id, 'y': 0} for piece_id in range(5)]
+        messages.append({'type': 'board_update', 'board_state': [[(x * y) % 5 for y in range(20)] for x in range(20)], 'history': list(range(2000))})
+        stream = encode_frames(pickle.dumps(message) for message in messages)
+        self.assertGreater(len(stream), 4096)
+
+        for chunk_size in (1, 3, 7, 4096, len(stream)):
+            frames = FrameReader()
+            received = []
+            for start in range(0, len(stream), chunk_size):
+                received.extend(pickle.loads(payload) for payload in frames.feed(stream[start:start + chunk_size]))
+            self.assertEqual(received, messages)
+            self.assertEqual(frames.pending, 0)
+
+        frames = FrameReader()
+        self.assertEqual(frames.feed(encode_frame(b'ab')[:5]), [])
+        self.assertEqual(frames.feed(b'b' + encode_frame(b'')), [b'ab', b''])
+        with self.assertRaises(FrameError):
+            frames.feed(b'\xff\xff\xff\xff')
+
+        async def read_all():
+            reader = asyncio.StreamReader()
+            reader.feed_data(stream[:10])
+            reader.feed_data(stream[10:] + encode_frame(b'x')[:2])
+            reader.feed_eof()
+            payloads = []
+            while True:
+                payload = await read_frame(reader)
+                if payload is None:
+                    return payloads
+                payloads.append(pickle.loads(payload) if payload != b'x' else payload)
+        self.assertEqual(asyncio.run(read_all()), messages)
+
+    @patch('socket.socket.sendall')
+    def test_send_messages_batch(self, mock_socket_sendall):
+        """Test that a batch of messages is framed and sent in a single write."""
+        self.client.connected = True
+        self.client.send_messages([{'type': 'move', 'piece_id': 1}, {'type': 'move', 'piece_id': 2}])
+        mock_socket_sendall.assert_called_once()
+        payloads = FrameReader().feed(mock_socket_sendall.call_args[0][0])
+        self.assertEqual([decode_message(payload)['piece_id'] for payload in payloads], [1, 2])
+
+    def test_protocol(self):
+        """Test the binary wire protocol: compact moves, varints, control messages and bad payloads."""
+        for value in (0, 1, 127, 128, 300, 2 ** 40):
+            self.assertEqual(decode_varint(encode_varint(value) + b'rest'), (value, len(encode_varint(value))))
+        self.assertEqual(len(encode_varint(127)), 1)
+        self.assertEqual(len(encode_varint(128)), 2)
+        self.assertEqual(decode_varint(encode_varint(2 ** 64 - 1)), (2 ** 64 - 1, 10))
+        # Oversized varints are refused after MAX_VARINT_BYTES, however long the run
+        for data in [b'\x80' * 10 + b'\x00', b'\xff' * 100000, b'\xff' * 9 + b'\x02', b'\x80\x80']:
+            with self.assertRaises(ProtocolError):
+                decode_varint(data)
+        with self.assertRaises(ValueError):
+            encode_varint(2 ** 64)
+
+        for piece_id, rotation, flip in [(0, 0, False), (18, 3, True), (20, 1, True), (11, 2, False)]:
+            move = {'type': 'move', 'piece_id': piece_id, 'x': 7, 'y': 19, 'rotation': rotation,
+                    'flip': flip, 'color': 3, 'player_id': 'someone'}
+            payload = encode_message(move)
+            self.assertEqual(len(payload), 7)
+            decoded = decode_message(payload)
+            self.assertNotIn('current_player', decoded)
+            self.assertIs(get_orientation(piece_id, decoded['rotation'], decoded['flip']),
+                          get_orientation(piece_id, rotation, flip))
+            self.assertEqual(decoded['orientation_id'], get_orientation(piece_id, rotation, flip).orientation_id)
+            self.assertEqual((decoded['x'], decoded['y'], decoded['color']), (7, 19, 3))
+            self.assertEqual(decode_message(encode_message(dict(decoded, current_player=0)))['current_player'], 0)
+
+        logged = decode_message(encode_message(dict(decoded, current_player=1, seq=300)))
+        self.assertEqual((logged['current_player'], logged['seq']), (1, 300))
+        self.assertEqual(len(encode_message(dict(decoded, seq=5))), 8)
+
+        board = Board()
+        board.place_piece(get_orientation(2), 0, 0, 1)
+        snapshot = {'type': 'snapshot', 'seq': 42, 'board': board.snapshot(), 'hands': {1: [0, 1, 20], 2: []}}
+        payload = encode_message(snapshot)
+        self.assertLess(len(payload), 420)
+        self.assertEqual(decode_message(payload), snapshot)
+
+        game_start = {'type': 'game_start', 'player_number': 2, 'current_player': 0, 'total_players': 4}
+        self.assertEqual(len(encode_message(game_start)), 4)
+        self.assertEqual(decode_message(encode_message(game_start)), game_start)
+
+        # Messages that do not fit a fixed layout are sent whole as control messages
+        for message in [{'type': 'waiting', 'message': 'Waiting... (1/4)'},
+                        {'type': 'move', 'piece_id': 1, 'x': 300, 'y': 0, 'rotation': 0, 'flip': False, 'color': 1},
+                        {'type': 'move', 'move': 'test_move', 'player_id': 'p'}]:
+            self.assertEqual(decode_message(encode_message(message, 'json')), message)
+
+        for payload in [b'', pickle.dumps({'type': 'move'}), b'\x01\x00', b'\x01\x00\x09\x00\x00\x01\xff',
+                        b'\x03[1, 2]', b'\x03{bad', b'\x02\x80',
+                        b'\x01\x00\x00\x00\x00\x01\xff\x05\x00', payload[:-1],
+                        b'\x01\x00\x00\x00\x00\x01\xff' + b'\x80' * 10000 + b'\x01',  # Oversized seq
+                        b'\x02\x04\x00\x04', b'\x02\x00\x00\x05',  # Players out of range
+                        b'\x05\x00\x00\x01\x05\x00',  # Unknown color
+                        b'\x05\x00\x00\x02\x01\x00\x01\x00',  # Same color twice
+                        b'\x05\x00\x00\x01\x01\x80\x80\x80\x01']:  # Piece 21 in a hand
+            with self.assertRaises(ProtocolError):
+                decode_message(payload)
+
+        self.assertEqual(negotiate_codec(['json']), 'json')
+        self.assertEqual(negotiate_codec(['cbor']), 'json')
+        self.assertEqual(negotiate_codec(None), 'json')
+
+    def test_receive_messages_partial_and_pipelined(self):
+        """Test that the client loop reassembles frames however the socket splits them."""
+        first = encode_frame(encode_message({'type': 'welcome', 'protocol': PROTOCOL_VERSION, 'codec': 'json',
+                                             'resume_token': 'secret'}))
+        second = encode_frame(encode_message({'type': 'game_start', 'player_number': 0,
+                                              'current_player': 0, 'total_players': 2}))
+        second += encode_frame(encode_message({'type': 'move', 'piece_id': 0, 'orientation_id': 0, 'x': 0,
+                                               'y': 0, 'color': 1, 'current_player': 1, 'seq': 4}))
+        self.client.client_socket = MagicMock()
+        self.client.client_socket.recv.side_effect = [first[:3], first[3:] + second[:5], second[5:], b'']
+        callback = MagicMock()
+        self.client.set_callback(callback)
+        self.client.connected = True
+        self.client.receive_messages()
+        self.assertEqual([args[0][0]['type'] for args in callback.call_args_list], ['welcome', 'game_start', 'move'])
+        self.assertEqual((self.client.codec, self.client.resume_token), ('json', 'secret'))
+        self.assertEqual(self.client.last_seq, 4)
+        self.assertFalse(self.client.connected)
+
+    @patch('sys.stderr', new_callable=StringIO)
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_receive_messages_errors(self, mock_stdout, mock_stderr):
+        """Test that only a dropped connection leads to a reconnection, not a bad message or a callback bug."""
+        waiting = encode_frame(encode_message({'type': 'waiting', 'message': 'Waiting...'}))
+        self.client.client_socket = MagicMock()
+        self.client.client_socket.recv.side_effect = [waiting + encode_frame(b'\x03{bad') + waiting,
+                                                      waiting, ConnectionResetError("reset")]
+        callback = MagicMock(side_effect=[RuntimeError("UI bug"), None, None])
+        lost = MagicMock()
+        self.client.set_callback(callback)
+        self.client.set_disconnect_callback(lost)
+        self.client.connected = True
+        self.client.receive_messages()
+        self.assertEqual(callback.call_count, 3)  # The invalid message is skipped
+        self.assertIn("Ignoring invalid message", mock_stdout.getvalue())
+        self.assertIn("RuntimeError: UI bug", mock_stderr.getvalue())
+        lost.assert_called_once_with()
+        self.assertFalse(self.client.connected)
+
+        # A corrupt stream is closed, without reconnecting
+        lost.reset_mock()
+        self.client.client_socket = MagicMock()
+        self.client.client_socket.recv.side_effect = [b'\xff\xff\xff\xff']
+        self.client.connected = True
+        self.client.receive_messages()
+        self.client.client_socket.close.assert_called_once()
+        lost.assert_not_called()
+        self.assertFalse(self.client.connected)
+
     @patch('socket.socket.connect')
     def test_connect_failure(self, mock_socket_connect):
         """Test failed connection to the server."""
@@ -615,7 +1762,7 @@ class TestBlokusGame(unittest.TestCase ):
         self.assertFalse(self.client.connected)
         mock_socket_connect.assert_called_once_with(('localhost', 6000))
 
-    @patch('socket.socket.send')
+    @patch('socket.socket.sendall')
     def test_send_message(self, mock_socket_send):
         """Test sending a message to the server."""
         self.client.connected = True
@@ -623,7 +1770,7 @@ class TestBlokusGame(unittest.TestCase ):
         self.client.send_message(message)
         mock_socket_send.assert_called_once()
         self.assertTrue(mock_socket_send.call_args[0][0])
-    @patch('socket.socket.send')
+    @patch('socket.socket.sendall')
     def test_send_message_failure(self, mock_socket_send):
         """Test sending a message to the server with failure."""
         self.client.connected = True
@@ -634,7 +1781,7 @@ class TestBlokusGame(unittest.TestCase ):
 
     
     
-    @patch('socket.socket.send')
+    @patch('socket.socket.sendall')
     def test_send_move(self, mock_socket_send):
         """Test sending a move to the server."""
         self.client.connected = True
@@ -646,7 +1793,7 @@ class TestBlokusGame(unittest.TestCase ):
         self.assertIn(b'test_player_id', sent_data)
         self.assertIn(b'test_move', sent_data)
 
-    @patch('socket.socket.send')
+    @patch('socket.socket.sendall')
     def test_update_board(self, mock_socket_send):
         """Test sending board update to the server."""
         self.client.connected = True